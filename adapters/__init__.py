@@ -1,7 +1,7 @@
 from importlib import import_module
 from typing import Any, Dict
 from django.conf import settings
-from .registry import get as _get_cls, all_names as _all_names
+from .registry import get_instance as _get_instance, all_names as _all_names
 from .base import (
     PaymentAdapter, SmsAdapter, EmailAdapter, PushAdapter, FlightsAdapter, MapsAdapter
 )
@@ -9,19 +9,19 @@ from .base import (
 
 _MODULES = (
     # Payments
-    "globetrotter.adapters.payments.stripe",
-    "globetrotter.adapters.payments.mpesa",
-    "globetrotter.adapters.payments.flutterwave",
+    "adapters.payments.stripe",
+    "adapters.payments.mpesa",
+    "adapters.payments.flutterwave",
     # Notifications
-    "globetrotter.adapters.notifications.sms_twilio",
-    "globetrotter.adapters.notifications.email_sendgrid",
-    "globetrotter.adapters.notifications.push_fcm",
+    "adapters.notifications.sms_twilio",
+    "adapters.notifications.email_sendgrid",
+    "adapters.notifications.push_fcm",
     # Flights
-    "globetrotter.adapters.flights.amadeus",
-    "globetrotter.adapters.flights.duffel",
+    "adapters.flights.amadeus",
+    "adapters.flights.duffel",
     # Maps
-    "globetrotter.adapters.maps.google_maps",
-    "globetrotter.adapters.maps.mapbox",
+    "adapters.maps.google_maps",
+    "adapters.maps.mapbox",
 )
 
 for _m in _MODULES:
@@ -32,35 +32,41 @@ for _m in _MODULES:
 
 
 def _cfg(name: str) -> Dict[str, Any]:
-    return getattr(settings, "ADAPTERS_CONFIG", {}).get(name.lower(), {})
+    configs = getattr(settings, "ADAPTERS_CONFIG", None) or getattr(settings, "ADAPTERS", {})
+    return configs.get(name.lower(), {})
+
+
+def _instance(name: str):
+    return _get_instance(name, _cfg(name))
 
 
 # --- Payment ---
 def get_payment_adapter(name: str) -> PaymentAdapter:
-    return _get_cls(f"payments.{name}")(_cfg(f"payments.{name}"))
+    return _instance(f"payments.{name}")
 
 
 # --- Notifications ---
 def get_sms_adapter(name: str) -> SmsAdapter:
-    return _get_cls(f"notifications.{name}")(_cfg(f"notifications.{name}"))
+    return _instance(f"notifications.{name}")
 
 
 def get_email_adapter(name: str) -> EmailAdapter:
-    return _get_cls(f"notifications.{name}")(_cfg(f"notifications.{name}"))
+    return _instance(f"notifications.{name}")
 
 
 def get_push_adapter(name: str) -> PushAdapter:
-    return _get_cls(f"notifications.{name}")(_cfg(f"notifications.{name}"))
+    return _instance(f"notifications.{name}")
 
 
 # --- Flights ---
 def get_flights_adapter(name: str) -> FlightsAdapter:
-    return _get_cls(f"flights.{name}")(_cfg(f"flights.{name}"))
+    return _instance(f"flights.{name}")
 
 
 # --- Maps ---
 def get_maps_adapter(name: str) -> MapsAdapter:
-    return _get_cls(f"maps.{name}")(_cfg(f"maps.{name}"))
+    from .maps.cache import cached
+    return cached(_instance(f"maps.{name}"))
 
 
 def available_adapters() -> list[str]:
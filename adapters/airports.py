@@ -0,0 +1,168 @@
+"""
+Airport reference data for IATA, city and country resolution.
+
+The bundled data/airports.csv (major commercial airports) is loaded once
+per process into an AirportIndex:
+
+- IATA code, country (name or ISO code) and city lookups are dict hits;
+- autocomplete maps every prefix of every word in the code, city, name
+  and country to its airports, so a keystroke is one dict hit too;
+- nearest() walks a latitude-sorted list outwards from the point and
+  stops once the latitude gap alone exceeds the best distances found.
+
+Flight search forms and package-to-flight matching use this instead of
+geocoding place names.
+"""
+import bisect
+import csv
+import math
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "airports.csv")
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+@dataclass(frozen=True)
+class Airport:
+    iata: str
+    name: str
+    city: str
+    country: str
+    country_code: str
+    lat: float
+    lng: float
+
+    def as_dict(self) -> Dict:
+        return {
+            "iata": self.iata,
+            "name": self.name,
+            "city": self.city,
+            "country": self.country,
+            "country_code": self.country_code,
+            "lat": self.lat,
+            "lng": self.lng,
+        }
+
+
+def _norm(text: Optional[str]) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class AirportIndex:
+    def __init__(self, airports: Iterable[Airport]):
+        self._by_iata: Dict[str, Airport] = {}
+        self._by_country: Dict[str, List[Airport]] = defaultdict(list)
+        self._by_city: Dict[str, List[Airport]] = defaultdict(list)
+        self._by_prefix: Dict[str, List[Airport]] = defaultdict(list)
+
+        for airport in airports:
+            self._by_iata[airport.iata] = airport
+            self._by_country[_norm(airport.country)].append(airport)
+            self._by_country[_norm(airport.country_code)].append(airport)
+            self._by_city[_norm(airport.city)].append(airport)
+
+            prefixes = set()
+            for text in (airport.iata, airport.city, airport.name, airport.country):
+                words = _norm(text).split()
+                # Whole phrase too, so "cape t" and "new y" complete.
+                for word in words + [" ".join(words)]:
+                    prefixes.update(word[:end] for end in range(1, len(word) + 1))
+            for prefix in prefixes:
+                self._by_prefix[prefix].append(airport)
+
+        # Exact code matches first, then city, then alphabetical.
+        for prefix, matches in self._by_prefix.items():
+            matches.sort(key=lambda a: (a.iata.casefold() != prefix, not _norm(a.city).startswith(prefix), a.city, a.iata))
+
+        self._sorted = sorted(self._by_iata.values(), key=lambda a: a.lat)
+        self._lats = [a.lat for a in self._sorted]
+
+    def __len__(self) -> int:
+        return len(self._by_iata)
+
+    def codes(self) -> Tuple[str, ...]:
+        return tuple(self._by_iata)
+
+    def get(self, iata: Optional[str]) -> Optional[Airport]:
+        return self._by_iata.get((iata or "").strip().upper())
+
+    def by_country(self, country: Optional[str]) -> List[Airport]:
+        """Airports in a country, by name ("Kenya") or ISO code ("KE")."""
+        return list(self._by_country.get(_norm(country), ()))
+
+    def by_city(self, city: Optional[str]) -> List[Airport]:
+        return list(self._by_city.get(_norm(city), ()))
+
+    def resolve(self, query: Optional[str]) -> List[str]:
+        """IATA codes for free text that is a code, a city or a country."""
+        airport = self.get(query)
+        if airport:
+            return [airport.iata]
+        return [a.iata for a in self.by_city(query) or self.by_country(query)]
+
+    def autocomplete(self, prefix: Optional[str], limit: int = 10) -> List[Airport]:
+        return self._by_prefix.get(_norm(prefix), [])[:limit]
+
+    def nearest(self, lat: float, lng: float, limit: int = 1, max_km: Optional[float] = None) -> List[Tuple[Airport, float]]:
+        """The `limit` closest airports as (airport, distance_km), closest first; [] for limit < 1."""
+        if limit < 1:
+            return []
+        best: List[Tuple[float, str, Airport]] = []
+        bound = max_km if max_km is not None else math.inf
+        below = bisect.bisect_left(self._lats, lat) - 1
+        above = below + 1
+
+        while below >= 0 or above < len(self._sorted):
+            gap_below = (lat - self._lats[below]) if below >= 0 else math.inf
+            gap_above = (self._lats[above] - lat) if above < len(self._sorted) else math.inf
+            if gap_below <= gap_above:
+                airport, gap = self._sorted[below], gap_below
+                below -= 1
+            else:
+                airport, gap = self._sorted[above], gap_above
+                above += 1
+            # Distance is at least the latitude gap, and gaps only grow from here.
+            cutoff = best[-1][0] if len(best) >= limit else bound
+            if gap * KM_PER_DEGREE_LAT > cutoff:
+                break
+            distance = _haversine_km(lat, lng, airport.lat, airport.lng)
+            if distance <= bound:
+                bisect.insort(best, (distance, airport.iata, airport))
+                del best[limit:]
+        return [(airport, round(distance, 1)) for distance, _, airport in best]
+
+
+def load(path: str = DATA_FILE) -> AirportIndex:
+    with open(path, newline="", encoding="utf-8") as fh:
+        return AirportIndex(
+            Airport(
+                iata=row["iata"].strip().upper(),
+                name=row["name"].strip(),
+                city=row["city"].strip(),
+                country=row["country"].strip(),
+                country_code=row["country_code"].strip().upper(),
+                lat=float(row["lat"]),
+                lng=float(row["lng"]),
+            )
+            for row in csv.DictReader(fh)
+        )
+
+
+@lru_cache(maxsize=1)
+def get_airport_index() -> AirportIndex:
+    """The process-wide index, loaded from the bundled dataset on first use."""
+    return load()
@@ -1,10 +1,37 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, List
 
+import requests
+
+from . import http
+
 class AdapterBase(ABC):
     def __init__(self, config: Dict[str, Any] | None = None):
         self.config = config or {}
 
+    # ---------- Transport ----------
+    def http_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send through the pooled session for the URL's host. Honors the
+        adapter config keys http_timeout, http_pool_size, http_retries
+        and http_backoff.
+        """
+        kwargs.setdefault("timeout", self.config.get("http_timeout", http.DEFAULT_TIMEOUT))
+        session = http.get_session(
+            url,
+            pool_size=int(self.config.get("http_pool_size", http.DEFAULT_POOL_SIZE)),
+            retries=int(self.config.get("http_retries", http.DEFAULT_RETRIES)),
+            backoff=float(self.config.get("http_backoff", http.DEFAULT_BACKOFF)),
+        )
+        return session.request(method, url, **kwargs)
+
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        return self.http_request("GET", url, **kwargs)
+
+    def http_post(self, url: str, **kwargs) -> requests.Response:
+        return self.http_request("POST", url, **kwargs)
+
 # ---------- Payments ----------
 class PaymentAdapter(AdapterBase):
     def create_checkout(self, *, amount: str, currency: str, customer: Dict[str, str],
@@ -14,19 +41,54 @@ class PaymentAdapter(AdapterBase):
     def parse_webhook(self, *, payload: bytes, headers: Dict[str, str]) -> Dict[str, Any]: ...
 
 # ---------- Notifications ----------
+DEFAULT_BATCH_CONCURRENCY = 8
+
+def _send_concurrently(send, items: List[Any], max_workers: int) -> List[Dict[str, Any]]:
+    """Fallback batching: call `send(item)` on a small pool, results in input order."""
+    def safe(item):
+        try:
+            return send(item)
+        except Exception as exc:
+            return {"status": "FAILED", "error": str(exc)}
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        return list(pool.map(safe, items))
+
 class SmsAdapter(AdapterBase):
     @abstractmethod
     def send_sms(self, *, to: str, message: str, sender_id: Optional[str] = None) -> Dict[str, Any]: ...
 
+    def send_sms_batch(self, *, to: List[str], message: str, sender_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Same text to many numbers; one result per number, in order."""
+        workers = int(self.config.get("batch_concurrency", DEFAULT_BATCH_CONCURRENCY))
+        return _send_concurrently(lambda number: self.send_sms(to=number, message=message, sender_id=sender_id), to, workers)
+
 class EmailAdapter(AdapterBase):
     @abstractmethod
     def send_email(self, *, to: List[str], subject: str, html: str, text: Optional[str] = None,
                    from_email: Optional[str] = None, headers: Optional[Dict[str,str]] = None) -> Dict[str, Any]: ...
 
+    def send_email_batch(self, *, to: List[str], subject: str, html: str, text: Optional[str] = None,
+                         from_email: Optional[str] = None, headers: Optional[Dict[str,str]] = None) -> List[Dict[str, Any]]:
+        """A separate copy of the same email to each address; one result per address, in order."""
+        workers = int(self.config.get("batch_concurrency", DEFAULT_BATCH_CONCURRENCY))
+        return _send_concurrently(
+            lambda address: self.send_email(to=[address], subject=subject, html=html, text=text,
+                                            from_email=from_email, headers=headers),
+            to, workers,
+        )
+
 class PushAdapter(AdapterBase):
     @abstractmethod
     def send_push(self, *, token: str, title: str, body: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]: ...
 
+    def send_push_batch(self, *, tokens: List[str], title: str, body: str, data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Same notification to many devices; one result per token, in order."""
+        workers = int(self.config.get("batch_concurrency", DEFAULT_BATCH_CONCURRENCY))
+        return _send_concurrently(lambda token: self.send_push(token=token, title=title, body=body, data=data), tokens, workers)
+
 # ---------- Flights ----------
 class FlightsAdapter(AdapterBase):
    
@@ -4,7 +4,6 @@ from typing import List
 from .amadeus import AmadeusAdapter
 from .duffel import DuffelAdapter
 from .fake import FakeFlightsAdapter
-from ..registry import get as get_adapter_registry
 logger = logging.getLogger(__name__)
 
 _MODULES = (
@@ -53,10 +52,12 @@ ADAPTERS = {
     "fake": FakeFlightsAdapter,  
 }
 def get_flight_adapter(name: str):
+    from .. import _cfg
+    from ..registry import get_instance
+
     if "." not in name:
         name = f"flights.{name.lower()}"
     try:
-        AdapterClass = get_adapter_registry(name)
-        return AdapterClass()
+        return get_instance(name, _cfg(name))
     except KeyError:
         raise ImportError(f"Flight provider '{name}' is not supported")
\ No newline at end of file
@@ -2,10 +2,10 @@ import time
 import logging
 import token
 from typing import Any, Dict, List, Optional
-import requests
 
 from ..registry import register
 from ..base import FlightsAdapter
+from ..tokens import get_token
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +31,6 @@ def get_airline_info(code: str) -> Dict[str, str]:
 
 @register("flights.amadeus")
 class AmadeusAdapter(FlightsAdapter):
-    _TOKEN_CACHE: Dict[str, Any] = {}
-
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         super().__init__(config or {})
         self.client_id = self.config.get("client_id")
@@ -50,14 +48,10 @@ class AmadeusAdapter(FlightsAdapter):
             raise ValueError("[AmadeusAdapter] Missing client_id or client_secret")
         logger.info(f"[AmadeusAdapter] Using env='{self.env}', base='{self.base}'")
 
-    def _get_token(self) -> str:
-        cache = self._TOKEN_CACHE.get("amadeus_token")
-        if cache and cache.get("expires_at", 0) > time.time():
-            return cache["access_token"]
-
-        if not self.client_id or not self.client_secret:
-            raise RuntimeError("Amadeus credentials not configured")
+    def _token_key(self) -> str:
+        return f"amadeus:{self.env}:{self.client_id}"
 
+    def _fetch_token(self):
         url = f"{self.base}/v1/security/oauth2/token"
         payload = {
         "grant_type": "client_credentials",
@@ -65,7 +59,7 @@ class AmadeusAdapter(FlightsAdapter):
         "client_secret": self.client_secret,
         }
 
-        r = requests.post(url, data=payload, timeout=10)
+        r = self.http_post(url, data=payload, timeout=10)
         if r.status_code != 200:
             logger.error(
             "[AmadeusAdapter] Failed to fetch token (%s): %s",
@@ -80,13 +74,12 @@ class AmadeusAdapter(FlightsAdapter):
         if not token:
             raise RuntimeError(f"[AmadeusAdapter] No access_token in response: {data}")
 
-        expires_in = int(data.get("expires_in", self.token_ttl))
-        self._TOKEN_CACHE["amadeus_token"] = {
-        "access_token": token,
-        "expires_at": time.time() + expires_in - 10, 
-        }
+        return token, int(data.get("expires_in", self.token_ttl))
 
-        return token
+    def _get_token(self) -> str:
+        if not self.client_id or not self.client_secret:
+            raise RuntimeError("Amadeus credentials not configured")
+        return get_token(self._token_key(), self._fetch_token)
 
     def _auth_headers(self) -> Dict[str, str]:
         return {
@@ -120,7 +113,7 @@ class AmadeusAdapter(FlightsAdapter):
             "Content-Type": "application/json"
         }
 
-        r = requests.get(url, params=params, headers=headers, timeout=15)
+        r = self.http_get(url, params=params, headers=headers, timeout=15)
         logger.debug("[Amadeus] URL: %s", r.url)
         logger.debug("[Amadeus] Headers: %s", headers)
         logger.debug("[Amadeus] Status: %s", r.status_code)
@@ -169,7 +162,7 @@ class AmadeusAdapter(FlightsAdapter):
         url = f"{self.base}/v1/booking/flight-offers/pricing"
         headers = self._auth_headers()
         payload = {"data": [offer]}
-        r = requests.post(url, json=payload, headers=headers, timeout=15)
+        r = self.http_post(url, json=payload, headers=headers, timeout=15)
         r.raise_for_status()
         data = r.json()
 
@@ -224,7 +217,7 @@ class AmadeusAdapter(FlightsAdapter):
                 "contact": contact,
             }
         }
-        r = requests.post(url, json=payload, headers=headers, timeout=20)
+        r = self.http_post(url, json=payload, headers=headers, timeout=20)
         r.raise_for_status()
         data = r.json()
 
@@ -273,7 +266,7 @@ class AmadeusAdapter(FlightsAdapter):
     def get_pnr(self, *, locator: str, last_name: str) -> Dict[str, Any]:
         url = f"{self.base}/v1/booking/flight-orders/{locator}"
         headers = self._auth_headers()
-        r = requests.get(url, headers=headers, timeout=10)
+        r = self.http_get(url, headers=headers, timeout=10)
 
         if r.status_code == 404:
             return {"locator": locator, "status": "NOT_FOUND", "raw": r.text}
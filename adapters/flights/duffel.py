@@ -1,7 +1,6 @@
 import time
 import logging
 from typing import Any, Dict, List, Optional
-import requests
 
 from ..registry import register
 from ..base import FlightsAdapter
@@ -35,7 +34,7 @@ class DuffelAdapter(FlightsAdapter):
         if return_date:
             payload["slices"].append({"origin": destination, "destination": origin, "departure_date": return_date})
 
-        r = requests.post(url, json=payload, headers=headers, timeout=15)
+        r = self.http_post(url, json=payload, headers=headers, timeout=15)
         r.raise_for_status()
         data = r.json()
         offers = []
@@ -50,7 +49,7 @@ class DuffelAdapter(FlightsAdapter):
     def price(self, *, offer_id: str) -> Dict[str, Any]:
         url = f"{self.base}/air/offers/{offer_id}"
         headers = self._headers()
-        r = requests.get(url, headers=headers, timeout=10)
+        r = self.http_get(url, headers=headers, timeout=10)
         r.raise_for_status()
         data = r.json()
         price = {
@@ -69,7 +68,7 @@ class DuffelAdapter(FlightsAdapter):
                 "contact": contact
             }
         }
-        r = requests.post(url, json=payload, headers=headers, timeout=20)
+        r = self.http_post(url, json=payload, headers=headers, timeout=20)
         r.raise_for_status()
         data = r.json()
         locator = data.get("data", {}).get("id") or f"DUF-{int(time.time())}"
@@ -94,7 +93,7 @@ class DuffelAdapter(FlightsAdapter):
     def get_pnr(self, *, locator: str, last_name: str) -> Dict[str, Any]:
         url = f"{self.base}/air/bookings/{locator}"
         headers = self._headers()
-        r = requests.get(url, headers=headers, timeout=10)
+        r = self.http_get(url, headers=headers, timeout=10)
         if r.status_code == 404:
             return {"locator": locator, "status": "NOT_FOUND", "raw": r.text}
         r.raise_for_status()
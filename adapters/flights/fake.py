@@ -1,6 +1,7 @@
 from typing import Any, Dict, List, Optional
 from ..registry import register
 from ..base import FlightsAdapter
+from ..airports import get_airport_index
 import random
 from datetime import datetime, timedelta
 
@@ -8,7 +9,6 @@ from datetime import datetime, timedelta
 class FakeFlightsAdapter(FlightsAdapter):
     AIRLINES = ["AirFake", "TestAir", "DemoFlights", "SampleAir"]
     CABINS = ["ECONOMY", "PREMIUM_ECONOMY", "BUSINESS", "FIRST"]
-    AIRPORTS = ["JFK", "LHR", "CDG", "DXB", "HND", "SIN", "FRA", "AMS", "ORD", "SFO"]
 
     _bookings: Dict[str, Dict] = {}
     _offers_seats: Dict[str, int] = {}
@@ -32,7 +32,7 @@ class FakeFlightsAdapter(FlightsAdapter):
         *,
         origin: str,
         destination: str,
-        departure_date: str,
+        depart_date: str,
         return_date: Optional[str] = None,
         adults: int = 1,
         cabin: str = "ECONOMY",
@@ -42,15 +42,10 @@ class FakeFlightsAdapter(FlightsAdapter):
         Always include at least one Nairobi (NBO) flight.
         """
         offers = []
-        airports = list(set(self.AIRPORTS + [
-            "NBO", "LOS", "CPT", "DXB", "DOH", "JNB", "ADD",
-            "LAX", "SFO", "ORD", "ATL", "SEA",
-            "CDG", "LHR", "FRA", "MAD", "BCN", "IST",
-            "HND", "NRT", "ICN", "SYD", "MEL", "AKL"
-        ]))
+        airports = get_airport_index().codes()
 
         try:
-            base_date = datetime.strptime(departure_date, "%Y-%m-%d")
+            base_date = datetime.strptime(depart_date, "%Y-%m-%d")
         except Exception:
             base_date = datetime.utcnow()
 
@@ -0,0 +1,225 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, as_completed, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..base import FlightsAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEADLINE_SECONDS = 8.0
+DEFAULT_MAX_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _search_settings() -> Dict[str, Any]:
+    return getattr(settings, "FLIGHT_SEARCH", {})
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Shared, bounded pool for provider calls. Threads that outlive a
+    request's deadline keep running here instead of blocking the response.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(_search_settings().get("max_workers", DEFAULT_MAX_WORKERS))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="flight-search")
+    return _executor
+
+
+def configured_providers() -> List[str]:
+    return list(_search_settings().get("providers", []))
+
+
+def build_adapter(name: str) -> FlightsAdapter:
+    from .. import get_flights_adapter
+
+    return get_flights_adapter(name)
+
+
+def first_last_segments(offer: Dict[str, Any]) -> Tuple[Optional[Dict], Optional[Dict]]:
+    itineraries = offer.get("itineraries") or (offer.get("raw") or {}).get("itineraries") or []
+    if not itineraries or not itineraries[0].get("segments"):
+        return None, None
+    segments = itineraries[0]["segments"]
+    return segments[0], segments[-1]
+
+
+def offer_key(offer: Dict[str, Any]) -> Tuple:
+    """
+    Identity of the physical flight behind an offer, so the same flight
+    sold by two providers collapses into one entry.
+    """
+    if offer.get("flight_number") and offer.get("departure_time"):
+        return (
+            offer["flight_number"],
+            offer["departure_time"],
+            offer.get("origin_code"),
+            offer.get("destination_code"),
+        )
+
+    first, last = first_last_segments(offer)
+    if first:
+        return (
+            f"{first.get('carrierCode', '')}{first.get('number', '')}",
+            first.get("departure", {}).get("at"),
+            first.get("departure", {}).get("iataCode"),
+            last.get("arrival", {}).get("iataCode"),
+        )
+
+    return (offer.get("provider"), offer.get("offer_id") or offer.get("id"))
+
+
+def offer_price(offer: Dict[str, Any]) -> float:
+    price = offer.get("price")
+    if isinstance(price, dict):
+        price = price.get("total")
+    try:
+        return float(price)
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+def merge_offers(offers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """De-duplicate offers by flight identity, keeping the cheapest; sorted by price."""
+    best: Dict[Tuple, Dict[str, Any]] = {}
+    for offer in offers:
+        key = offer_key(offer)
+        current = best.get(key)
+        if current is None or offer_price(offer) < offer_price(current):
+            best[key] = offer
+    return sorted(best.values(), key=offer_price)
+
+
+def _tag(offers: List[Dict[str, Any]], provider: str) -> List[Dict[str, Any]]:
+    for offer in offers:
+        offer.setdefault("provider", provider)
+    return offers
+
+
+def search_all(
+    *,
+    origin: str,
+    destination: str,
+    depart_date: str,
+    return_date: Optional[str] = None,
+    adults: int = 1,
+    cabin: str = "ECONOMY",
+    providers: Optional[List[str]] = None,
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Query every configured flights adapter concurrently and merge what
+    arrives before `deadline` seconds. Providers that fail or miss the
+    deadline are reported in "providers" and simply contribute nothing.
+    """
+    providers = providers or configured_providers()
+    if deadline is None:
+        deadline = float(_search_settings().get("deadline_seconds", DEFAULT_DEADLINE_SECONDS))
+
+    status: Dict[str, str] = {}
+    futures = {}
+    executor = get_executor()
+    for name in providers:
+        try:
+            adapter = build_adapter(name)
+        except Exception as exc:
+            logger.warning("Skipping flights provider %s: %s", name, exc)
+            status[name] = "unavailable"
+            continue
+        future = executor.submit(
+            adapter.search,
+            origin=origin,
+            destination=destination,
+            depart_date=depart_date,
+            return_date=return_date,
+            adults=adults,
+            cabin=cabin,
+        )
+        futures[future] = name
+
+    done, pending = wait(futures, timeout=deadline)
+
+    offers: List[Dict[str, Any]] = []
+    for future in done:
+        name = futures[future]
+        try:
+            result = future.result()
+        except Exception as exc:
+            logger.warning("Flights provider %s failed: %s", name, exc)
+            status[name] = "error"
+            continue
+        offers.extend(_tag(result.get("offers", []), name))
+        status[name] = "ok"
+
+    for future in pending:
+        future.cancel()
+        status[futures[future]] = "timeout"
+
+    logger.debug("Fan-out search %s->%s on %s: %s", origin, destination, depart_date, status)
+    return {"offers": merge_offers(offers), "providers": status}
+
+
+def iter_grid(
+    adapter: FlightsAdapter,
+    origins: List[str],
+    destinations: List[str],
+    *,
+    depart_date: str,
+    adults: int = 1,
+    cabin: str = "ECONOMY",
+    accept: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Search every origin x destination pair concurrently with one adapter,
+    yielding {"origin", "destination", "offers", "status"} per pair in
+    completion order. `accept` filters offers as each pair arrives.
+    Pairs still running when the deadline passes are reported as
+    "timeout" and abandoned.
+    """
+    if deadline is None:
+        deadline = float(_search_settings().get("deadline_seconds", DEFAULT_DEADLINE_SECONDS))
+
+    executor = get_executor()
+    futures = {}
+    for origin in origins:
+        for destination in destinations:
+            if not origin or not destination or origin == destination:
+                continue
+            future = executor.submit(
+                adapter.search,
+                origin=origin,
+                destination=destination,
+                depart_date=depart_date,
+                adults=adults,
+                cabin=cabin,
+            )
+            futures[future] = (origin, destination)
+
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            pending.discard(future)
+            origin, destination = futures[future]
+            try:
+                offers = future.result().get("offers", [])
+            except Exception as exc:
+                logger.warning("Grid search %s->%s failed: %s", origin, destination, exc)
+                yield {"origin": origin, "destination": destination, "offers": [], "status": "error"}
+                continue
+            if accept is not None:
+                offers = [offer for offer in offers if accept(offer)]
+            yield {"origin": origin, "destination": destination, "offers": offers, "status": "ok"}
+    except FuturesTimeout:
+        for future in pending:
+            future.cancel()
+            origin, destination = futures[future]
+            yield {"origin": origin, "destination": destination, "offers": [], "status": "timeout"}
@@ -1,11 +1,13 @@
-from ..registry import get
+from ..registry import get_instance
 from typing import Dict, Any, List
 
 def get_adapter(name: str):
-    AdapterClass = get(name)
-    if AdapterClass is None:
+    from .. import _cfg
+
+    try:
+        return get_instance(name, _cfg(name))
+    except KeyError:
         raise ValueError(f"Flight adapter '{name}' not found")
-    return AdapterClass()
 
 def search_flights(adapter_name: str, **kwargs) -> Dict[str, Any]:
     adapter = get_adapter(adapter_name)
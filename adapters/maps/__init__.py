@@ -1,7 +1,6 @@
 from importlib import import_module
 import logging
 from typing import List
-from ..registry import get as get_adapter_registry
 from typing import Any
 logger = logging.getLogger(__name__)
 
@@ -27,7 +26,11 @@ def available_maps_adapters() -> List[str]:
 
 
 def get_maps_adapter(name: str) -> Any:
-    adapter_cls = get_adapter_registry(f"maps.{name}")
-    if not adapter_cls:
+    from .. import _cfg
+    from ..registry import get_instance
+    from .cache import cached
+
+    try:
+        return cached(get_instance(f"maps.{name}", _cfg(f"maps.{name}")))
+    except KeyError:
         raise ImportError(f"Maps adapter '{name}' not found")
-    return adapter_cls()
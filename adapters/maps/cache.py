@@ -0,0 +1,214 @@
+"""
+In-process result cache in front of any MapsAdapter.
+
+get_maps_adapter() returns adapters wrapped in CachedMapsAdapter, so
+callers keep the same interface while repeated lookups skip the network:
+
+- geocode/places keys are the case- and whitespace-normalized query;
+- reverse geocoding quantizes coordinates (4 decimals is ~11 m), so
+  nearby points share an entry;
+- distance matrices are cached per (origin, destination, mode) cell and
+  only the missing rows/columns are requested from the provider.
+
+Entries live in a bounded LRU with a TTL. Settings come from MAPS_CACHE.
+Empty answers (Google's ZERO_RESULTS, an empty Mapbox feature list) are
+kept for the shorter negative TTL; provider errors that arrive as HTTP 200
+(OVER_QUERY_LIMIT, REQUEST_DENIED, ...) are never cached.
+"""
+import copy
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..base import MapsAdapter
+
+DEFAULTS = {
+    "enabled": True,
+    "ttl_seconds": 30 * 24 * 3600,
+    "negative_ttl_seconds": 3600,
+    "places_ttl_seconds": 24 * 3600,
+    "max_entries": 10000,
+    "reverse_precision": 4,
+}
+
+_MISSING = object()
+
+# Google statuses that are real answers; anything else is a provider error.
+ANSWER_STATUSES = (None, "OK", "ZERO_RESULTS")
+
+
+def _setting(name: str) -> Any:
+    return getattr(settings, "MAPS_CACHE", {}).get(name, DEFAULTS[name])
+
+
+def provider_error(result: Any) -> bool:
+    """True for a provider error reported in the body (Google's "status") rather than by HTTP status."""
+    if not isinstance(result, dict):
+        return False
+    if "raw" in result:
+        result = result["raw"]
+    return isinstance(result, dict) and result.get("status") not in ANSWER_STATUSES
+
+
+def normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").casefold().split())
+
+
+class LRUCache:
+    """Thread-safe LRU of at most `max_entries` items, each with its own expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return _MISSING
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CachedMapsAdapter(MapsAdapter):
+    def __init__(self, inner: MapsAdapter, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config or inner.config)
+        self.inner = inner
+        self.cache = LRUCache(int(_setting("max_entries")))
+        # Google returns rows of {"elements": [...]}, Mapbox plain lists of durations.
+        self._matrix_shape: Optional[str] = None
+
+    def __getattr__(self, name: str) -> Any:
+        # Provider-specific helpers (e.g. get_airports_by_country) pass through.
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def _cached(self, key: Hashable, fetch, ttl: float, empty=lambda result: False) -> Any:
+        value = self.cache.get(key)
+        if value is _MISSING:
+            value = fetch()
+            if provider_error(value):
+                return value
+            self.cache.set(key, value, _setting("negative_ttl_seconds") if empty(value) else ttl)
+        return copy.deepcopy(value)
+
+    def geocode(self, *, query: str) -> Dict[str, Any]:
+        return self._cached(
+            ("geocode", normalize(query)),
+            lambda: self.inner.geocode(query=query),
+            _setting("ttl_seconds"),
+            empty=lambda result: not result.get("results"),
+        )
+
+    def reverse_geocode(self, *, lat: float, lng: float) -> Dict[str, Any]:
+        precision = int(_setting("reverse_precision"))
+        qlat, qlng = round(float(lat), precision), round(float(lng), precision)
+        result = self._cached(
+            ("reverse", qlat, qlng),
+            lambda: self.inner.reverse_geocode(lat=qlat, lng=qlng),
+            _setting("ttl_seconds"),
+        )
+        result.update(lat=lat, lng=lng)
+        return result
+
+    def places(self, *, query: str, lat: Optional[float] = None, lng: Optional[float] = None) -> Dict[str, Any]:
+        precision = int(_setting("reverse_precision"))
+        qlat = round(float(lat), precision) if lat is not None else None
+        qlng = round(float(lng), precision) if lng is not None else None
+        return self._cached(
+            ("places", normalize(query), qlat, qlng),
+            lambda: self.inner.places(query=query, lat=qlat, lng=qlng),
+            _setting("places_ttl_seconds"),
+            empty=lambda result: not result.get("places"),
+        )
+
+    # ---------- Distance matrix ----------
+    def _cell(self, rows: List[Any], i: int, j: int) -> Any:
+        try:
+            row = rows[i]
+            if isinstance(row, dict):
+                self._matrix_shape = "elements"
+                return row["elements"][j]
+            self._matrix_shape = "list"
+            return row[j]
+        except (IndexError, KeyError, TypeError):
+            return _MISSING
+
+    def _rows(self, matrix: List[List[Any]]) -> List[Any]:
+        if self._matrix_shape == "list":
+            return matrix
+        return [{"elements": row} for row in matrix]
+
+    def distance_matrix(self, *, origins: List[str], destinations: List[str], mode: str = "driving") -> Dict[str, Any]:
+        ttl = _setting("ttl_seconds")
+
+        def key(origin: str, destination: str) -> Tuple:
+            return ("matrix", normalize(mode), normalize(origin), normalize(destination))
+
+        matrix = [[self.cache.get(key(o, d)) for d in destinations] for o in origins]
+        missing_o = [i for i, row in enumerate(matrix) if any(cell is _MISSING for cell in row)]
+        missing_d = sorted({j for i in missing_o for j, cell in enumerate(matrix[i]) if cell is _MISSING})
+
+        raw: Dict[str, Any] = {}
+        if missing_o:
+            # One provider call for the sub-matrix that covers every missing cell.
+            response = self.inner.distance_matrix(
+                origins=[origins[i] for i in missing_o],
+                destinations=[destinations[j] for j in missing_d],
+                mode=mode,
+            )
+            raw = response.get("raw", {})
+            rows = response.get("rows") or []
+            for sub_i, i in enumerate(missing_o):
+                for sub_j, j in enumerate(missing_d):
+                    cell = self._cell(rows, sub_i, sub_j)
+                    if cell is _MISSING:
+                        matrix[i][j] = None
+                        continue
+                    matrix[i][j] = cell
+                    if not provider_error(cell):
+                        self.cache.set(key(origins[i], destinations[j]), cell, ttl)
+
+        return {"rows": self._rows(copy.deepcopy(matrix)), "raw": raw}
+
+    def static_map_url(self, *, lat: float, lng: float, zoom: int = 12, width: int = 600, height: int = 400) -> str:
+        return self.inner.static_map_url(lat=lat, lng=lng, zoom=zoom, width=width, height=height)
+
+
+_WRAPPERS: "weakref.WeakKeyDictionary[MapsAdapter, CachedMapsAdapter]" = weakref.WeakKeyDictionary()
+_WRAPPERS_LOCK = threading.Lock()
+
+
+def cached(adapter: MapsAdapter) -> MapsAdapter:
+    """The shared caching wrapper for `adapter` (which is itself shared by the registry)."""
+    if not _setting("enabled") or isinstance(adapter, CachedMapsAdapter):
+        return adapter
+    with _WRAPPERS_LOCK:
+        wrapper = _WRAPPERS.get(adapter)
+        if wrapper is None:
+            wrapper = _WRAPPERS[adapter] = CachedMapsAdapter(adapter)
+        return wrapper
@@ -1,80 +1,21 @@
 from typing import Any, Dict, List, Optional
 from ..registry import register
 from ..base import MapsAdapter
+from ..airports import get_airport_index
 
 @register("maps.fake")
 class FakeMapsAdapter(MapsAdapter):
-    AIRPORTS = {
-        # Africa
-        "NBO": ("Nairobi", "Kenya"),
-        "LOS": ("Lagos", "Nigeria"),
-        "CPT": ("Cape Town", "South Africa"),
-        "JNB": ("Johannesburg", "South Africa"),
-        "ADD": ("Addis Ababa", "Ethiopia"),
-        "DXB": ("Dubai", "United Arab Emirates"),
-        "DOH": ("Doha", "Qatar"),
-
-        # USA
-        "LAX": ("Los Angeles", "United States"),
-        "SFO": ("San Francisco", "United States"),
-        "ORD": ("Chicago", "United States"),
-        "ATL": ("Atlanta", "United States"),
-        "SEA": ("Seattle", "United States"),
-
-        # Europe
-        "CDG": ("Paris", "France"),
-        "LHR": ("London", "United Kingdom"),
-        "FRA": ("Frankfurt", "Germany"),
-        "MAD": ("Madrid", "Spain"),
-        "BCN": ("Barcelona", "Spain"),
-        "IST": ("Istanbul", "Turkey"),
-
-        # Asia-Pacific
-        "HND": ("Tokyo", "Japan"),
-        "NRT": ("Tokyo", "Japan"),
-        "ICN": ("Seoul", "South Korea"),
-        "SYD": ("Sydney", "Australia"),
-        "MEL": ("Melbourne", "Australia"),
-        "AKL": ("Auckland", "New Zealand"),
-    }
-
-    # City - Country
-    CITIES = {
-        "NAIROBI": "Kenya",
-        "LAGOS": "Nigeria",
-        "CAPE TOWN": "South Africa",
-        "JOHANNESBURG": "South Africa",
-        "ADDIS ABABA": "Ethiopia",
-        "DUBAI": "United Arab Emirates",
-        "DOHA": "Qatar",
-
-        "LOS ANGELES": "United States",
-        "SAN FRANCISCO": "United States",
-        "CHICAGO": "United States",
-        "ATLANTA": "United States",
-        "SEATTLE": "United States",
-
-        "PARIS": "France",
-        "LONDON": "United Kingdom",
-        "FRANKFURT": "Germany",
-        "MADRID": "Spain",
-        "BARCELONA": "Spain",
-        "ISTANBUL": "Turkey",
-
-        "TOKYO": "Japan",
-        "SEOUL": "South Korea",
-        "SYDNEY": "Australia",
-        "MELBOURNE": "Australia",
-        "AUCKLAND": "New Zealand",
-    }
-
     def geocode(self, *, query: str) -> Dict[str, Any]:
         code = query.upper().strip()
-        if code in self.AIRPORTS:
-            city, country = self.AIRPORTS[code]
+        index = get_airport_index()
+        airport = index.get(code) or next(iter(index.by_city(query)), None)
+        if airport:
+            city, country = airport.city, airport.country
+            lat, lng = airport.lat, airport.lng
         else:
             city = query.title()
-            country = self.CITIES.get(code, "Unknown Country")
+            country = "Unknown Country"
+            lat, lng = -1.2921, 36.8219
 
         formatted = f"{city}, {country}"
 
@@ -83,8 +24,8 @@ class FakeMapsAdapter(MapsAdapter):
                 "formatted_address": formatted,
                 "city": city,
                 "country": country,
-                "lat": -1.2921,  
-                "lng": 36.8219,
+                "lat": lat,
+                "lng": lng,
                 "place_id": f"fake-{code}",
             }],
             "raw": {}
@@ -94,9 +35,7 @@ class FakeMapsAdapter(MapsAdapter):
         """
         Return a list of airport codes for a given country.
         """
-        country_upper = country_name.upper()
-        airports = [code for code, (_, country) in self.AIRPORTS.items() if country.upper() == country_upper]
-        return airports or []
+        return [airport.iata for airport in get_airport_index().by_country(country_name)]
 
     def reverse_geocode(self, *, lat: float, lng: float) -> Dict[str, Any]:
         return {
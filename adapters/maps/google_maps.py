@@ -1,6 +1,5 @@
 import logging
 from typing import Any, Dict, List, Optional, Tuple
-import requests
 
 from ..registry import register
 from ..base import MapsAdapter
@@ -22,7 +21,7 @@ class GoogleMapsAdapter(MapsAdapter):
         self._require_key()
         url = f"{self.base}/geocode/json"
         params = {"address": query, "key": self.api_key}
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         results = []
@@ -41,7 +40,7 @@ class GoogleMapsAdapter(MapsAdapter):
         self._require_key()
         url = f"{self.base}/geocode/json"
         params = {"latlng": f"{lat},{lng}", "key": self.api_key}
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         address = data.get("results", [{}])[0] if data.get("results") else {}
@@ -54,7 +53,7 @@ class GoogleMapsAdapter(MapsAdapter):
         if lat is not None and lng is not None:
             params["location"] = f"{lat},{lng}"
             params["radius"] = 50000 
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         places = []
@@ -78,7 +77,7 @@ class GoogleMapsAdapter(MapsAdapter):
             "mode": mode,
             "key": self.api_key,
         }
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         
@@ -1,6 +1,5 @@
 import logging
 from typing import Any, Dict, List, Optional, Tuple
-import requests
 import urllib.parse
 
 from ..registry import register
@@ -25,7 +24,7 @@ class MapboxAdapter(MapsAdapter):
         self._require_token()
         url = f"{self.base_geocode}/{urllib.parse.quote(query)}.json"
         params = {"access_token": self.token, "limit": 5}
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         results = []
@@ -45,7 +44,7 @@ class MapboxAdapter(MapsAdapter):
         coord = f"{lng},{lat}"
         url = f"{self.base_geocode}/{coord}.json"
         params = {"access_token": self.token, "limit": 1}
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         place = data.get("features", [{}])[0] if data.get("features") else {}
@@ -57,7 +56,7 @@ class MapboxAdapter(MapsAdapter):
         params = {"access_token": self.token, "limit": 10}
         if lat is not None and lng is not None:
             params["proximity"] = f"{lng},{lat}"
-        r = requests.get(url, params=params, timeout=10)
+        r = self.http_get(url, params=params, timeout=10)
         r.raise_for_status()
         data = r.json()
         places = []
@@ -77,7 +76,7 @@ class MapboxAdapter(MapsAdapter):
         coords = ";".join(origins + destinations)
         url = f"https://api.mapbox.com/directions-matrix/v1/mapbox/{mode}/{coords}"
         params = {"access_token": self.token, "annotations": "duration,distance"}
-        r = requests.get(url, params=params, timeout=15)
+        r = self.http_get(url, params=params, timeout=15)
         r.raise_for_status()
         data = r.json()
         return {"rows": data.get("durations"), "raw": data}
@@ -44,3 +44,38 @@ class SendgridEmailAdapter(EmailAdapter):
         except Exception as exc:
             logger.exception("SendGrid send_email failed")
             return {"status": "FAILED", "error": str(exc)}
+
+    # SendGrid accepts up to 1000 personalizations per request.
+    MAX_PERSONALIZATIONS = 1000
+
+    def send_email_batch(self, *, to: List[str], subject: str, html: str, text: Optional[str] = None,
+                         from_email: Optional[str] = None, headers: Optional[Dict[str,str]] = None) -> List[Dict[str, Any]]:
+        """One API call per 1000 recipients; each recipient gets a private copy via personalizations."""
+        if not self._client:
+            raise RuntimeError("SendGrid not configured. Install sendgrid and set api_key.")
+        from_address = from_email or self.from_email
+        if not from_address:
+            raise RuntimeError("SendGrid 'from' email not configured.")
+
+        from sendgrid.helpers.mail import Mail, Content
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(to), self.MAX_PERSONALIZATIONS):
+            chunk = to[start:start + self.MAX_PERSONALIZATIONS]
+            try:
+                message = Mail(
+                    from_email=from_address,
+                    to_emails=chunk,
+                    subject=subject,
+                    html_content=html,
+                    is_multiple=True,
+                )
+                if text:
+                    message.add_content(Content("text/plain", text))
+                resp = self._client.send(message)
+                status = "QUEUED" if resp.status_code in (200, 202) else "FAILED"
+                message_id = (getattr(resp, "headers", None) or {}).get("X-Message-Id")
+                results.extend({"status": status, "provider_id": message_id} for _ in chunk)
+            except Exception as exc:
+                logger.exception("SendGrid send_email_batch failed")
+                results.extend({"status": "FAILED", "error": str(exc)} for _ in chunk)
+        return results
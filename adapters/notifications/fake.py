@@ -7,13 +7,26 @@ class FakeSmsAdapter(SmsAdapter):
     def send_sms(self, *, to: str, message: str, sender_id: Optional[str] = None) -> Dict[str, Any]:
         return {"status": "SENT", "provider_id": "fake_sms_1", "raw": {"to": to, "message": message}}
 
+    def send_sms_batch(self, *, to: List[str], message: str, sender_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [{"status": "SENT", "provider_id": f"fake_sms_{i + 1}", "raw": {"to": number, "message": message}}
+                for i, number in enumerate(to)]
+
 @register("notifications.fake_email")
 class FakeEmailAdapter(EmailAdapter):
     def send_email(self, *, to: List[str], subject: str, html: str, text: Optional[str] = None,
                    from_email: Optional[str] = None, headers: Optional[Dict[str,str]] = None) -> Dict[str, Any]:
         return {"status": "QUEUED", "provider_id": "fake_email_1", "raw": {"to": to, "subject": subject}}
 
+    def send_email_batch(self, *, to: List[str], subject: str, html: str, text: Optional[str] = None,
+                         from_email: Optional[str] = None, headers: Optional[Dict[str,str]] = None) -> List[Dict[str, Any]]:
+        return [{"status": "QUEUED", "provider_id": "fake_email_batch_1", "raw": {"to": [address], "subject": subject}}
+                for address in to]
+
 @register("notifications.fake_push")
 class FakePushAdapter(PushAdapter):
     def send_push(self, *, token: str, title: str, body: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         return {"status": "SENT", "provider_id": "fake_push_1", "raw": {"token": token, "title": title, "body": body}}
+
+    def send_push_batch(self, *, tokens: List[str], title: str, body: str, data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        return [{"status": "SENT", "provider_id": f"fake_push_{i + 1}", "raw": {"token": token, "title": title, "body": body}}
+                for i, token in enumerate(tokens)]
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
 from ..registry import register
@@ -39,3 +39,31 @@ class FcmPushAdapter(PushAdapter):
         except Exception as exc:
             logger.exception("FCM send_push failed")
             return {"status": "FAILED", "error": str(exc)}
+
+    # FCM multicast accepts up to 500 tokens per call.
+    MAX_MULTICAST_TOKENS = 500
+
+    def send_push_batch(self, *, tokens: List[str], title: str, body: str, data: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        if not self._initialized:
+            raise RuntimeError("FCM not configured (service_account_json missing or firebase_admin not installed)")
+
+        from firebase_admin import messaging
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(tokens), self.MAX_MULTICAST_TOKENS):
+            chunk = tokens[start:start + self.MAX_MULTICAST_TOKENS]
+            try:
+                message = messaging.MulticastMessage(
+                    notification=messaging.Notification(title=title, body=body),
+                    tokens=chunk,
+                    data={k: str(v) for k, v in (data or {}).items()},
+                )
+                batch = messaging.send_each_for_multicast(message)
+                for resp in batch.responses:
+                    if resp.success:
+                        results.append({"status": "SENT", "provider_id": resp.message_id})
+                    else:
+                        results.append({"status": "FAILED", "error": str(resp.exception)})
+            except Exception as exc:
+                logger.exception("FCM send_push_batch failed")
+                results.extend({"status": "FAILED", "error": str(exc)} for _ in chunk)
+        return results
@@ -1,5 +1,4 @@
 from typing import Any, Dict, Optional
-import requests
 import json
 import hmac
 import hashlib
@@ -47,7 +46,7 @@ class FlutterwaveAdapter(PaymentAdapter):
             },
         }
 
-        r = requests.post(url, json=payload, headers=headers, timeout=15)
+        r = self.http_post(url, json=payload, headers=headers, timeout=15)
         r.raise_for_status()
         return r.json()
 
@@ -102,7 +101,7 @@ class FlutterwaveAdapter(PaymentAdapter):
             "reason": reason or "Customer requested refund",
         }
 
-        r = requests.post(url, json=payload, headers=headers, timeout=15)
+        r = self.http_post(url, json=payload, headers=headers, timeout=15)
         r.raise_for_status()
         return r.json()
 
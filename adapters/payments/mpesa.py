@@ -1,6 +1,5 @@
 from typing import Any, Dict, Optional
 from datetime import datetime
-import requests
 import base64
 import json
 import hmac
@@ -8,6 +7,7 @@ import hashlib
 
 from ..registry import register
 from ..base import PaymentAdapter
+from ..tokens import get_token
 
 
 @register("payments.mpesa") 
@@ -24,11 +24,15 @@ class MpesaAdapter(PaymentAdapter):
         self.webhook_secret = self.config.get("webhook_secret", "mpesa_secret")  
 
 
-    def _get_token(self) -> str:
+    def _fetch_token(self):
         url = f"{self.base_url}/oauth/v1/generate?grant_type=client_credentials"
-        r = requests.get(url, auth=(self.consumer_key, self.consumer_secret), timeout=10)
+        r = self.http_get(url, auth=(self.consumer_key, self.consumer_secret), timeout=10)
         r.raise_for_status()
-        return r.json()["access_token"]
+        data = r.json()
+        return data["access_token"], int(data.get("expires_in", 3599))
+
+    def _get_token(self) -> str:
+        return get_token(f"mpesa:{self.base_url}:{self.consumer_key}", self._fetch_token)
 
 
     def create_checkout(
@@ -62,7 +66,7 @@ class MpesaAdapter(PaymentAdapter):
             "TransactionDesc": metadata.get("description", "Travel booking"),
         }
 
-        r = requests.post(url, json=payload, headers=headers, timeout=15)
+        r = self.http_post(url, json=payload, headers=headers, timeout=15)
         r.raise_for_status()
         return r.json()
 
@@ -125,7 +129,7 @@ class MpesaAdapter(PaymentAdapter):
             "Occasion": "Reversal",
         }
 
-        r = requests.post(url, json=payload, headers=headers, timeout=15)
+        r = self.http_post(url, json=payload, headers=headers, timeout=15)
         r.raise_for_status()
         resp = r.json()
 
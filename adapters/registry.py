@@ -1,8 +1,15 @@
-from typing import Dict, Type
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
 from .base import AdapterBase
 
 _REGISTRY: Dict[str, Type[AdapterBase]] = {}
 
+# Built adapters keyed by (name, config fingerprint); see get_instance().
+_INSTANCES: Dict[Tuple[str, str], AdapterBase] = {}
+_INSTANCES_LOCK = threading.Lock()
+
 def register(name: str):
     name = name.lower()
     if "." not in name:
@@ -20,3 +27,32 @@ def get(name: str):
 
 def all_names():
     return sorted(_REGISTRY.keys())
+
+
+def _fingerprint(config: Optional[Dict[str, Any]]) -> str:
+    payload = json.dumps(config or {}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def get_instance(name: str, config: Optional[Dict[str, Any]] = None) -> AdapterBase:
+    """
+    Shared adapter instance for `name` built with `config`. Instances are
+    created lazily, once per distinct config, so SDK setup in __init__
+    (API keys, firebase apps, HTTP clients) doesn't run on every request.
+    Constructor errors propagate and nothing is cached.
+    """
+    key = (name.lower(), _fingerprint(config))
+    instance = _INSTANCES.get(key)
+    if instance is None:
+        with _INSTANCES_LOCK:
+            instance = _INSTANCES.get(key)
+            if instance is None:
+                instance = get(name)(config or {})
+                _INSTANCES[key] = instance
+    return instance
+
+
+def reset_instances() -> None:
+    """Drop cached adapter instances (tests, settings overrides)."""
+    with _INSTANCES_LOCK:
+        _INSTANCES.clear()
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Refresh this many seconds before the provider's stated expiry.
+DEFAULT_REFRESH_MARGIN = 60
+# How long a worker waits for another process that is already refreshing.
+SHARED_WAIT_SECONDS = 5.0
+SHARED_POLL_SECONDS = 0.1
+
+Fetcher = Callable[[], Tuple[str, int]]
+
+# key -> (token, refresh_at epoch seconds)
+_tokens: Dict[str, Tuple[str, float]] = {}
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _shared_cache():
+    """Cache alias from ADAPTER_TOKEN_CACHE ("default" unless set to None)."""
+    alias = getattr(settings, "ADAPTER_TOKEN_CACHE", "default")
+    return caches[alias] if alias else None
+
+
+def _fresh(entry: Optional[Tuple[str, float]]) -> bool:
+    return bool(entry) and entry[1] > time.time()
+
+
+def _cache_key(key: str) -> str:
+    return f"adapter-token:{key}"
+
+
+def _fetch_and_store(key: str, fetch: Fetcher, margin: int, shared) -> Tuple[str, float]:
+    token, expires_in = fetch()
+    expires_in = int(expires_in)
+    lifetime = max(1, expires_in - min(margin, expires_in // 2))
+    entry = (token, time.time() + lifetime)
+    _tokens[key] = entry
+    if shared is not None:
+        shared.set(_cache_key(key), entry, timeout=lifetime)
+    return entry
+
+
+def _from_shared(key: str, fetch: Fetcher, margin: int, shared) -> Tuple[str, float]:
+    entry = shared.get(_cache_key(key))
+    if _fresh(entry):
+        return entry
+
+    lock_key = f"{_cache_key(key)}:refreshing"
+    if shared.add(lock_key, 1, timeout=int(SHARED_WAIT_SECONDS) * 2):
+        try:
+            return _fetch_and_store(key, fetch, margin, shared)
+        finally:
+            shared.delete(lock_key)
+
+    # Another worker holds the refresh lock; wait briefly for its token.
+    deadline = time.monotonic() + SHARED_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(SHARED_POLL_SECONDS)
+        entry = shared.get(_cache_key(key))
+        if _fresh(entry):
+            return entry
+    logger.warning("Timed out waiting for shared token refresh of %s; fetching directly", key)
+    return _fetch_and_store(key, fetch, margin, shared)
+
+
+def get_token(key: str, fetch: Fetcher, *, margin: int = DEFAULT_REFRESH_MARGIN) -> str:
+    """
+    Return a valid access token for `key`, calling `fetch` only when needed.
+
+    `fetch` returns (token, expires_in_seconds). Tokens are renewed `margin`
+    seconds before they expire. Only one thread per process refreshes a
+    given key at a time. When a shared cache is configured, other workers
+    reuse the token and wait for an in-flight refresh instead of starting
+    their own.
+    """
+    entry = _tokens.get(key)
+    if _fresh(entry):
+        return entry[0]
+
+    with _lock_for(key):
+        entry = _tokens.get(key)
+        if _fresh(entry):
+            return entry[0]
+
+        shared = _shared_cache()
+        if shared is None:
+            return _fetch_and_store(key, fetch, margin, None)[0]
+
+        entry = _from_shared(key, fetch, margin, shared)
+        _tokens[key] = entry
+        return entry[0]
+
+
+def invalidate(key: str) -> None:
+    """Forget a token, e.g. after the provider answered 401."""
+    _tokens.pop(key, None)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.delete(_cache_key(key))
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Booking, BookingItem
+from .models import Booking, BookingItem, IdempotencyKey, OutboxMessage
 # Register your models here.
 class BookingItemInline(admin.TabularInline):
     model = BookingItem
@@ -13,4 +13,18 @@ class BookingAdmin(admin.ModelAdmin):
     list_filter = ("status", "created_at")
     search_fields = ("user__username", "user__email", "id")
     inlines = (BookingItemInline,)
-    readonly_fields = ("total", "created_at")
\ No newline at end of file
+    readonly_fields = ("total", "created_at")
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "channel", "recipient", "status", "attempts", "next_attempt_at", "booking")
+    list_filter = ("channel", "status")
+    search_fields = ("recipient", "booking__id")
+    readonly_fields = ("created_at", "sent_at", "claimed_at", "last_error")
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "scope", "key", "response_status", "created_at")
+    list_filter = ("scope", "response_status")
+    search_fields = ("key", "user__username")
+    readonly_fields = ("request_hash", "response_body", "created_at", "completed_at")
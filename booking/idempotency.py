@@ -0,0 +1,152 @@
+"""
+Idempotency-Key support for the booking endpoints.
+
+A client sends `Idempotency-Key: <uuid>` with a booking request. The first
+request claims the key (unique per user, scope and key) and its response is
+stored on the claim; a retry with the same key and body gets that response
+back, with an Idempotent-Replayed header, without booking again or calling
+the flight provider again. A retry is one lookup on the unique index.
+
+- the same key with a different body is rejected with 422;
+- a retry while the first request is still running gets 409; a claim
+  left unfinished for IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS (a worker
+  killed mid-request) is dropped and the retry runs;
+- only 2xx and deterministic 4xx responses are stored; 5xx responses,
+  raised exceptions (validation errors re-validate the same on retry) and
+  responses marked with `transient()` release the key so the client can
+  retry. A view marks only failures that left nothing behind (its service
+  transaction rolled back, or the provider was never reached); once a
+  side effect has committed, the response is stored whatever it is;
+- keys are honoured for IDEMPOTENCY_KEY_TTL_HOURS, then purged by
+  cleanup_idempotency_keys.
+"""
+import functools
+import hashlib
+import json
+from datetime import timedelta
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def key_ttl() -> timedelta:
+    return timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+
+def in_progress_timeout() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS", 300))
+
+
+def request_hash(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def transient(response: Response) -> Response:
+    """Mark an error response as not worth replaying: the key is released instead of stored."""
+    response.idempotency_transient = True
+    return response
+
+
+def _replay(record: Optional[IdempotencyKey], fingerprint: str) -> Response:
+    if record is not None and record.request_hash != fingerprint:
+        return Response(
+            {"detail": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record is None or record.response_status is None:
+        return Response(
+            {"detail": f"A request with this {HEADER} is still being processed."},
+            status=status.HTTP_409_CONFLICT,
+        )
+    return Response(record.response_body, status=record.response_status, headers={REPLAYED_HEADER: "true"})
+
+
+def _claim(request, scope: str, key: str, fingerprint: str) -> Tuple[Optional[IdempotencyKey], Optional[Response]]:
+    """(claim, None) when this request goes ahead, (None, response) when it is a retry."""
+    lookup = {"user": request.user, "scope": scope, "key": key}
+    record = IdempotencyKey.objects.filter(**lookup).first()
+    now = timezone.now()
+    if record is not None and record.created_at < now - key_ttl():
+        record.delete()
+        record = None
+    elif (
+        record is not None
+        and record.response_status is None
+        and record.request_hash == fingerprint
+        and record.created_at < now - in_progress_timeout()
+    ):
+        # The request that claimed it never finished. Only the retry that
+        # deletes the row may claim again; the others race on the insert.
+        IdempotencyKey.objects.filter(pk=record.pk, response_status__isnull=True).delete()
+        record = None
+    if record is not None:
+        return None, _replay(record, fingerprint)
+
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(request_hash=fingerprint, **lookup), None
+    except IntegrityError:
+        # A concurrent request with the same key claimed it first.
+        return None, _replay(IdempotencyKey.objects.filter(**lookup).first(), fingerprint)
+
+
+def idempotent(scope: str):
+    """
+    Make a view method replay its first response for a repeated
+    Idempotency-Key. Requests without the header run as before.
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key or not request.user.is_authenticated:
+                return view_method(self, request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {"detail": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            record, replay = _claim(request, scope, key, request_hash(request))
+            if replay is not None:
+                return replay
+
+            try:
+                response = view_method(self, request, *args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+
+            if (
+                response.status_code >= 500
+                or not hasattr(response, "data")
+                or getattr(response, "idempotency_transient", False)
+            ):
+                record.delete()
+            else:
+                # An update, not save(): a claim dropped as stale must stay dropped.
+                IdempotencyKey.objects.filter(pk=record.pk).update(
+                    response_status=response.status_code,
+                    response_body=response.data,
+                    completed_at=timezone.now(),
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - key_ttl()).delete()
+    return deleted
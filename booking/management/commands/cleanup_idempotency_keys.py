@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from booking.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS"
+
+    def handle(self, *args, **options):
+        count = purge_expired()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {count} expired idempotency key(s).")
+        )
+
+
+"""to clean up expired idempotency keys (e.g. daily from cron), run:
+
+python manage.py cleanup_idempotency_keys
+
+"""
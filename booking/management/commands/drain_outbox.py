@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from booking.notifications import drain
+
+
+class Command(BaseCommand):
+    help = "Deliver queued booking notifications from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Messages claimed per batch")
+        parser.add_argument("--loop", action="store_true", help="Keep running as a worker")
+        parser.add_argument("--interval", type=int, default=5, help="Seconds to sleep when the outbox is empty")
+
+    def handle(self, *args, **options):
+        while True:
+            counts = drain(batch_size=options["batch_size"])
+            processed = sum(counts.values())
+            if processed or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Sent {counts['sent']}, retrying {counts['retried']}, failed {counts['failed']}."
+                    )
+                )
+            if not options["loop"]:
+                break
+            # Full batches mean there is a backlog; keep going without sleeping.
+            if processed < options["batch_size"]:
+                time.sleep(options["interval"])
+
+
+"""to deliver queued notifications once (e.g. from cron), run:
+
+python manage.py drain_outbox
+
+or keep a worker running:
+
+python manage.py drain_outbox --loop --interval 5
+
+"""
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0007_outboxmessage'),
+        ('catalog', '0010_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='booking_boo_user_id_c955b3_idx'),
+        ),
+    ]
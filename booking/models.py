@@ -1,20 +1,40 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from django.db import models
 from decimal import Decimal
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from cloudinary.models import CloudinaryField
+from django.db.models import Sum
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from django.utils import timezone
+import item_types
 
 User = settings.AUTH_USER_MODEL
 
+# While set, BookingItem saves and deletes leave Booking.total alone; whoever
+# set it is responsible for writing the total (see BookingItem.bulk_add).
+_defer_total_recalc: ContextVar[bool] = ContextVar("defer_booking_total_recalc", default=False)
+
+
+@contextmanager
+def deferred_total_recalc():
+    token = _defer_total_recalc.set(True)
+    try:
+        yield
+    finally:
+        _defer_total_recalc.reset(token)
+
 
 class Booking(models.Model):
     class Status(models.TextChoices):
         PENDING = "PENDING", "Pending"
         CONFIRMED = "CONFIRMED", "Confirmed"
         CANCELLED = "CANCELLED", "Cancelled"
+        EXPIRED = "EXPIRED", "Expired"
 
     user = models.ForeignKey(
         User,
@@ -60,6 +80,10 @@ class Booking(models.Model):
         help_text="External provider name (Amadeus, Duffel, etc.)"
     )
     cancellation_reason = models.TextField(blank=True, null=True)
+    expires_at = models.DateTimeField(
+        null=True, blank=True,
+        help_text="When an unpaid PENDING booking releases its held inventory"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -68,6 +92,13 @@ class Booking(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "status", "created_at"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
+            # Only live holds are indexed, so the sweeper never scans settled bookings
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(status="PENDING"),
+                name="booking_pending_expiry_idx",
+            ),
         ]
 
     def __str__(self):
@@ -77,9 +108,7 @@ class Booking(models.Model):
         """
         Recalculate the booking total from all items.
         """
-        total = Decimal("0.00")
-        for item in self.items.all():
-            total += item.line_total or Decimal("0.00")
+        total = self.items.aggregate(total=Sum("line_total"))["total"] or Decimal("0.00")
         self.total = total
         if save:
             self.save(update_fields=["total"])
@@ -117,25 +146,123 @@ class BookingItem(models.Model):
     class Meta:
         indexes = [models.Index(fields=["booking"])]
 
-    def save(self, *args, **kwargs):
-  
-        if self.content_object and hasattr(self.content_object, "commission"):
-            base_price = getattr(self.content_object, "base_price", Decimal("0.00"))
-            commission_rate = getattr(self.content_object, "commission", 0)
-            commission_amount = (base_price * commission_rate) / 100
-          
-            self.unit_price = base_price + commission_amount
+    def apply_pricing(self):
+        """
+        Set unit_price and line_total in memory, using the item type's
+        pricing (packages are base_price plus commission, cars daily_rate
+        times days). Assign content_object rather than content_type/object_id
+        when the object is already loaded, so this does not fetch it again.
+        """
+        item_type = item_types.for_model(self.content_object) if self.content_object else None
+        if item_type:
+            unit_price = item_type.price(self.content_object, self.start_date, self.end_date, self.unit_price)
+            if unit_price is not None:
+                self.unit_price = unit_price
 
         self.line_total = (self.unit_price or Decimal("0.00")) * self.quantity
+
+    def save(self, *args, **kwargs):
+        self.apply_pricing()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_add(cls, booking, items):
+        """
+        Insert all `items` of a booking that has no other items with one
+        bulk_create, pricing them in memory as save() would, and write
+        booking.total once (not at all if it already matches). Use this
+        instead of a create() per item, which recalculates the total after
+        every row.
+        """
+        for item in items:
+            item.booking = booking
+            item.apply_pricing()
+        with deferred_total_recalc():
+            items = cls.objects.bulk_create(items)
+        total = sum((item.line_total for item in items), Decimal("0.00"))
+        if booking.total != total:
+            booking.total = total
+            booking.save(update_fields=["total"])
+        return items
+
     def __str__(self):
         return f"Item {self.pk} of Booking {self.booking_id}"
 
 
 
+class OutboxMessage(models.Model):
+    """
+    Notification written in the same transaction as the booking change that
+    caused it, then delivered by the drain_outbox worker.
+    """
+    class Channel(models.TextChoices):
+        SMS = "SMS", "SMS"
+        EMAIL = "EMAIL", "Email"
+        PUSH = "PUSH", "Push"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        FAILED = "FAILED", "Failed"
+
+    booking = models.ForeignKey(
+        Booking,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="outbox_messages"
+    )
+    channel = models.CharField(max_length=8, choices=Channel.choices)
+    recipient = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=8, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.channel} to {self.recipient} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client Idempotency-Key and the response first returned for it, so a
+    retried booking request is answered from here instead of booking again
+    (see booking/idempotency.py). response_status is null while the first
+    request is still running.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="idempotency_keys")
+    scope = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "scope", "key"], name="uniq_idempotency_key"),
+        ]
+        indexes = [models.Index(fields=["created_at"])]
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} ({self.response_status or 'in progress'})"
+
+
 @receiver(post_save, sender=BookingItem)
 @receiver(post_delete, sender=BookingItem)
 def update_booking_total(sender, instance, **kwargs):
-    if instance.booking_id:
+    if instance.booking_id and not _defer_total_recalc.get():
         instance.booking.recalc_total()
@@ -0,0 +1,229 @@
+import json
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from adapters import get_email_adapter, get_push_adapter, get_sms_adapter
+from .models import Booking, OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_SECONDS = 30
+MAX_RETRY_DELAY = timedelta(hours=1)
+# A SENDING claim older than this is assumed to belong to a dead worker.
+STALE_CLAIM = timedelta(minutes=10)
+
+
+def _config() -> Dict:
+    return getattr(settings, "NOTIFICATIONS", {})
+
+
+def _adapter_name(channel: str) -> str:
+    return _config().get("adapters", {}).get(channel, f"fake_{channel.lower()}")
+
+
+# ---------- Enqueue ----------
+def enqueue_many(channel: str, recipients: List[str], payload: Dict) -> List[OutboxMessage]:
+    """
+    Queue one payload for many recipients (e.g. a rescheduled departure).
+    The worker sends them with the channel's batch API.
+    """
+    messages = OutboxMessage.objects.bulk_create(
+        [OutboxMessage(channel=channel, recipient=recipient, payload=payload) for recipient in recipients]
+    )
+    if messages and _config().get("drain_on_commit"):
+        transaction.on_commit(_drain_in_background)
+    return messages
+
+
+def enqueue_booking_confirmation(booking: Booking) -> List[OutboxMessage]:
+    """
+    Queue SMS/email confirmations. Must run inside the transaction that
+    confirms the booking, so the messages commit or roll back with it.
+    """
+    user = booking.user
+    messages = []
+    if getattr(user, "phone", None):
+        messages.append(OutboxMessage(
+            booking=booking,
+            channel=OutboxMessage.Channel.SMS,
+            recipient=user.phone,
+            payload={
+                "message": f"Your booking #{booking.id} has been confirmed. Total: {booking.currency} {booking.total}",
+            },
+        ))
+    if getattr(user, "email", None):
+        messages.append(OutboxMessage(
+            booking=booking,
+            channel=OutboxMessage.Channel.EMAIL,
+            recipient=user.email,
+            payload={
+                "subject": "Booking Confirmation",
+                "html": f"""
+                    <h2>Booking Confirmed</h2>
+                    <p>Your booking #{booking.id} has been confirmed.</p>
+                    <p><strong>Total Amount:</strong> {booking.currency} {booking.total}</p>
+                    <p>Thank you for choosing our service!</p>
+                    """,
+            },
+        ))
+    messages = OutboxMessage.objects.bulk_create(messages)
+    if messages and _config().get("drain_on_commit"):
+        transaction.on_commit(_drain_in_background)
+    return messages
+
+
+def _drain_in_background() -> None:
+    """Optional low-latency path: drain right after commit without blocking the caller."""
+    def run():
+        try:
+            drain()
+        except Exception:
+            logger.exception("On-commit outbox drain failed")
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, name="outbox-drain", daemon=True).start()
+
+
+# ---------- Delivery ----------
+def _error_of(result: Any) -> Optional[str]:
+    # Adapters report provider failures as {"status": "FAILED"} rather than raising.
+    if isinstance(result, dict) and result.get("status") == "FAILED":
+        return result.get("error") or "FAILED"
+    return None
+
+
+def deliver_group(channel: str, payload: Dict, recipients: List[str]) -> List[Optional[str]]:
+    """
+    Send one payload to many recipients with the channel adapter's batch
+    API. Returns an error string (or None) per recipient, in order.
+    """
+    name = _adapter_name(channel)
+    if channel == OutboxMessage.Channel.SMS:
+        results = get_sms_adapter(name).send_sms_batch(to=recipients, message=payload["message"])
+    elif channel == OutboxMessage.Channel.EMAIL:
+        results = get_email_adapter(name).send_email_batch(
+            to=recipients,
+            subject=payload.get("subject", ""),
+            html=payload.get("html", ""),
+            text=payload.get("text"),
+        )
+    elif channel == OutboxMessage.Channel.PUSH:
+        results = get_push_adapter(name).send_push_batch(
+            tokens=recipients,
+            title=payload.get("title", ""),
+            body=payload.get("body", ""),
+            data=payload.get("data"),
+        )
+    else:
+        raise ValueError(f"Unknown channel {channel}")
+    return [_error_of(result) for result in results]
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    base = int(_config().get("retry_base_seconds", DEFAULT_RETRY_BASE_SECONDS))
+    return min(timedelta(seconds=base * 2 ** (attempts - 1)), MAX_RETRY_DELAY)
+
+
+@transaction.atomic
+def claim_batch(batch_size: int, now=None) -> List[OutboxMessage]:
+    """
+    Lock due messages with SKIP LOCKED and mark them SENDING, so several
+    workers can drain the table side by side. Stale claims are picked up
+    again.
+    """
+    now = now or timezone.now()
+    due = (
+        Q(status=OutboxMessage.Status.PENDING, next_attempt_at__lte=now)
+        | Q(status=OutboxMessage.Status.SENDING, claimed_at__lt=now - STALE_CLAIM)
+    )
+    batch = list(
+        OutboxMessage.objects.select_for_update(skip_locked=True)
+        .filter(due)
+        .order_by("next_attempt_at", "id")[:batch_size]
+    )
+    if batch:
+        OutboxMessage.objects.filter(pk__in=[m.pk for m in batch]).update(
+            status=OutboxMessage.Status.SENDING, claimed_at=now
+        )
+    return batch
+
+
+def _send_group(channel: str, messages: List[OutboxMessage]) -> Dict[int, Optional[str]]:
+    try:
+        errors = deliver_group(channel, messages[0].payload or {}, [m.recipient for m in messages])
+    except Exception as exc:
+        logger.warning("Outbox %s batch of %s failed: %s", channel, len(messages), exc)
+        errors = [str(exc) or exc.__class__.__name__] * len(messages)
+    if len(errors) != len(messages):
+        errors = list(errors) + ["No result from adapter"] * (len(messages) - len(errors))
+    return {message.pk: error for message, error in zip(messages, errors)}
+
+
+def drain(*, batch_size: int = 100) -> Dict[str, int]:
+    """
+    Deliver one batch. Each channel gets its own bounded pool so a slow SMS
+    provider cannot starve email, and messages sharing a payload go out
+    through the adapter's batch send. Failures are retried with exponential
+    backoff until max_attempts, then marked FAILED.
+    """
+    batch = claim_batch(batch_size)
+    if not batch:
+        return {"sent": 0, "retried": 0, "failed": 0}
+
+    # Messages with identical content on a channel go out as one batch call.
+    groups: Dict[tuple, List[OutboxMessage]] = defaultdict(list)
+    for message in batch:
+        groups[(message.channel, json.dumps(message.payload or {}, sort_keys=True))].append(message)
+
+    concurrency = _config().get("concurrency", {})
+    pools = {
+        channel: ThreadPoolExecutor(max_workers=int(concurrency.get(channel, DEFAULT_CONCURRENCY)))
+        for channel, _ in groups
+    }
+    errors: Dict[int, Optional[str]] = {}
+    try:
+        futures = [pools[channel].submit(_send_group, channel, messages) for (channel, _), messages in groups.items()]
+        for future in futures:
+            errors.update(future.result())
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+
+    now = timezone.now()
+    max_attempts = int(_config().get("max_attempts", DEFAULT_MAX_ATTEMPTS))
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    for message in batch:
+        error = errors.get(message.pk)
+        message.attempts += 1
+        message.claimed_at = None
+        if error is None:
+            message.status = OutboxMessage.Status.SENT
+            message.sent_at = now
+            message.last_error = None
+            counts["sent"] += 1
+        elif message.attempts >= max_attempts:
+            message.status = OutboxMessage.Status.FAILED
+            message.last_error = error
+            counts["failed"] += 1
+        else:
+            message.status = OutboxMessage.Status.PENDING
+            message.next_attempt_at = now + _retry_delay(message.attempts)
+            message.last_error = error
+            counts["retried"] += 1
+
+    OutboxMessage.objects.bulk_update(
+        batch, ["status", "attempts", "claimed_at", "sent_at", "next_attempt_at", "last_error"]
+    )
+    return counts
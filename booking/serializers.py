@@ -5,9 +5,9 @@ from users.serializers import UserLiteSerializer
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
-from catalog.models import TourPackage  
 from django.contrib.auth import get_user_model
 from adapters.flights import ADAPTERS
+import item_types
 from . import services
 User = get_user_model()
 
@@ -15,7 +15,7 @@ User = get_user_model()
 class BookingItemReadSerializer(serializers.ModelSerializer):
     object_repr = serializers.SerializerMethodField()
     object_id = serializers.IntegerField(read_only=True)
-    content_type = serializers.CharField(source="content_type.model", read_only=True)
+    content_type = serializers.SerializerMethodField()
     item_type = serializers.SerializerMethodField()
 
     class Meta:
@@ -39,17 +39,13 @@ class BookingItemReadSerializer(serializers.ModelSerializer):
         except Exception:
             return None
 
-    def get_item_type(self, obj):
-        content_type = obj.content_type
-        if content_type:
-            type_map = {
-                'tourpackage': 'package',
-                'hotel': 'hotel',
-                'roomtype': 'room',
-                'car': 'car',
-            }
-            return type_map.get(content_type.model, content_type.model)
+    def get_content_type(self, obj):
+        if obj.content_type_id:
+            return ContentType.objects.get_for_id(obj.content_type_id).model
         return None
+
+    def get_item_type(self, obj):
+        return item_types.name_for(obj.content_type_id)
 class PaymentSerializer(serializers.Serializer):
     payment_method = serializers.CharField(required=True)
     amount = serializers.DecimalField(max_digits=12, decimal_places=2, required=True)
@@ -100,6 +96,7 @@ class BookingReadSerializer(serializers.ModelSerializer):
             "external_service",
             "external_reference",
             "cancellation_reason",
+            "expires_at",
             "refund_requests", 
         )
     def get_payment_status(self, obj):
@@ -115,17 +112,18 @@ class BookingReadSerializer(serializers.ModelSerializer):
             return "flight"
 
         if obj.items.exists():
-            item_types = set(
-                item.content_type.model for item in obj.items.all() if item.content_type
+            models = set(
+                ContentType.objects.get_for_id(item.content_type_id).model
+                for item in obj.items.all() if item.content_type_id
             )
-            if len(item_types) == 1:
-                return list(item_types)[0]
+            if len(models) == 1:
+                return list(models)[0]
             return "mixed"
 
         return "unknown"
 
 class BookingItemCreateSerializer(serializers.Serializer):
-    type = serializers.ChoiceField(choices=("package", "hotel", "room", "car"))
+    type = serializers.ChoiceField(choices=item_types.NAMES)
     id = serializers.IntegerField()
     start_date = serializers.DateField(required=False, allow_null=True)
     end_date = serializers.DateField(required=False, allow_null=True)
@@ -137,7 +135,7 @@ class BookingItemCreateSerializer(serializers.Serializer):
         ed = data.get("end_date")
         item_type = data.get("type")
 
-        if item_type in ["hotel", "room", "car"]:
+        if item_type in item_types.ITEM_TYPES and item_types.ITEM_TYPES[item_type].dated:
             if not sd or not ed:
                 raise ValidationError(_(f"start_date and end_date are required for {item_type} bookings."))
             if sd > ed:
@@ -162,52 +160,6 @@ class BookingCreateSerializer(serializers.Serializer):
 
         return attrs
 
-    def _resolve_item_object(self, item):
-        t = item.get("type")
-        obj_id = item.get("id")
-        start_date = item.get("start_date")
-        end_date = item.get("end_date")
-        quantity = item.get("quantity", 1)
-        unit_price = item.get("unit_price")
-
-        TYPE_TO_MODEL = {
-            "package": ("catalog", "tourpackage"),
-            "hotel": ("inventory", "hotel"),
-            "room": ("inventory", "roomtype"),
-            "car": ("inventory", "car"),
-        }
-
-        if t not in TYPE_TO_MODEL:
-            raise ValidationError(_(f"Unknown item type '{t}'"))
-
-        app_label, model_name = TYPE_TO_MODEL[t]
-        try:
-            ct = ContentType.objects.get(app_label=app_label, model=model_name)
-        except ContentType.DoesNotExist:
-            raise ValidationError(_(f"Content type for {app_label}.{model_name} not found."))
-
-        model_cls = ct.model_class()
-        if model_cls is None:
-            raise ValidationError(_(f"Model class for {app_label}.{model_name} could not be loaded."))
-
-        try:
-            obj = model_cls.objects.get(pk=obj_id)
-        except model_cls.DoesNotExist:
-            raise ValidationError(_(f"{model_name} with id {obj_id} not found."))
-
-        if t != "package":
-            if hasattr(obj, 'available') and not obj.available:
-                raise ValidationError(_(f"{model_name} with id {obj_id} is not available."))
-            if hasattr(obj, 'is_active') and not obj.is_active:
-                raise ValidationError(_(f"{model_name} with id {obj_id} is not active."))
-
-        return {
-            "content_object": obj,
-            "start_date": start_date,
-            "end_date": end_date,
-            "quantity": quantity,
-            "unit_price": unit_price,
-        }
     def create(self, validated_data):
         request = self.context.get("request")
         user = getattr(request, "user", None)
@@ -219,53 +171,40 @@ class BookingCreateSerializer(serializers.Serializer):
         currency = validated_data.get("currency", "USD")
         note = validated_data.get("note", "")
 
-        parsed_items = []
-        detected_package = None
-
-        for it in items_data:
-            parsed = self._resolve_item_object(it)
-            parsed_items.append(parsed)
-            if isinstance(parsed["content_object"], TourPackage) and detected_package is None:
-                detected_package = parsed["content_object"]
+        # validate() allows a package only on its own
+        detected_package = next((it for it in items_data if it["type"] == "package"), None)
 
         from . import services
-        from inventory.models import Car
-
-        if detected_package:
-            booking = services.create_tour_package_booking(
-                user=user,
-                tour_package_id=detected_package.id,
-                start_date=validated_data.get("start_date"),
-                guests=validated_data.get("guests", 1),
-                currency=currency,
-                note=note,
-            )
-        else:
-            generic_items = []
-
-            for item in parsed_items:
-                obj = item["content_object"]
-                unit_price = item["unit_price"]
-
-                # ✅ Special handling for cars
-                if isinstance(obj, Car):
-                    start = item["start_date"]
-                    end = item["end_date"]
-                    duration = (end - start).days
-                    unit_price = obj.daily_rate * duration
-
-                generic_items.append({
-                    "type": self._get_item_type(obj),
-                    "id": obj.id,
-                    "start_date": item["start_date"],
-                    "end_date": item["end_date"],
-                    "quantity": item["quantity"],
-                    "unit_price": str(unit_price),
-                })
-
-            booking = services.create_generic_booking(
-                user=user, items=generic_items, currency=currency, note=note
-            )
+
+        # Objects are loaded (in bulk, one query per type) and checked for
+        # availability by the service, inside its transaction.
+        try:
+            if detected_package:
+                booking = services.create_tour_package_booking(
+                    user=user,
+                    tour_package_id=detected_package["id"],
+                    start_date=validated_data.get("start_date"),
+                    guests=validated_data.get("guests", 1),
+                    currency=currency,
+                    note=note,
+                )
+            else:
+                generic_items = [
+                    {
+                        "type": item["type"],
+                        "id": item["id"],
+                        "start_date": item.get("start_date"),
+                        "end_date": item.get("end_date"),
+                        "quantity": item["quantity"],
+                        "unit_price": item.get("unit_price"),
+                    }
+                    for item in items_data
+                ]
+                booking = services.create_generic_booking(
+                    user=user, items=generic_items, currency=currency, note=note
+                )
+        except services.BookingError as e:
+            raise ValidationError(str(e))
 
         if payment_data:
             from payments.services import initiate_payment_for_booking
@@ -285,15 +224,6 @@ class BookingCreateSerializer(serializers.Serializer):
 
         return booking
 
-    def _get_item_type(self, content_object):
-        type_map = {
-            'TourPackage': 'package',
-            'Hotel': 'hotel',
-            'RoomType': 'room',
-            'Car': 'car',
-        }
-        return type_map.get(content_object.__class__.__name__, 'unknown')
-
     def to_representation(self, instance):
         return BookingReadSerializer(instance, context=self.context).data
 
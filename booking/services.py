@@ -2,41 +2,31 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import List, Dict, Any, Optional
 import logging
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
+from django.conf import settings
 from django.db import transaction
 from django.db.models import Sum
-from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+import item_types
 from .models import Booking, BookingItem
 from catalog.models import TourPackage
 from payments.models import Payment
-from adapters import get_sms_adapter, get_email_adapter, get_flights_adapter
+from inventory.reservations import (
+    ReservationError, is_reservable, reserve_many, release_booking, release_bookings
+)
+from adapters import get_flights_adapter
+from .notifications import enqueue_booking_confirmation
 
 logger = logging.getLogger(__name__)
 
 class BookingError(Exception):
     pass
 
-CONTENT_TYPE_MAP = {
-    'package': ('catalog', 'tourpackage'),
-    'hotel': ('inventory', 'hotel'),
-    'room': ('inventory', 'roomtype'),
-    'car': ('inventory', 'car'),
-}
-
-def get_content_type(item_type: str) -> ContentType:
-  
-    if item_type not in CONTENT_TYPE_MAP:
-        raise BookingError(f"Unknown item type: {item_type}")
-    
-    app_label, model = CONTENT_TYPE_MAP[item_type]
-    try:
-        return ContentType.objects.get(app_label=app_label, model=model)
-    except ContentType.DoesNotExist:
-        raise BookingError(f"Content type for {app_label}.{model} not found")
-
-def _calculate_line_total(unit_price: Decimal, quantity: int) -> Decimal:
-    return (unit_price or Decimal("0.00")) * Decimal(quantity)
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
 
 def _calculate_duration_days(start_date: str, end_date: str) -> int:
 
@@ -47,6 +37,41 @@ def _calculate_duration_days(start_date: str, end_date: str) -> int:
         raise BookingError("End date must be after start date")
     return duration
 
+def _hold_expiry():
+    return timezone.now() + timedelta(minutes=getattr(settings, "BOOKING_HOLD_MINUTES", 15))
+
+def _package_seats(booking_ids) -> Dict[int, int]:
+    """{package_id: seats} booked by the given bookings."""
+    return dict(
+        BookingItem.objects.filter(
+            booking_id__in=list(booking_ids),
+            content_type=item_types.ITEM_TYPES["package"].content_type,
+        )
+        .values("object_id")
+        .annotate(seats=Sum("quantity"))
+        .values_list("object_id", "seats")
+    )
+
+def _claim_package_seats(items) -> None:
+    for item in items:
+        if isinstance(item.content_object, TourPackage) and not TourPackage.claim_seats(item.content_object, item.quantity):
+            raise BookingError("Requested seats exceed package remaining capacity")
+
+def _reserve_items(booking, items) -> None:
+    """Take inventory for the dated, reservable ones among `items` (BookingItems)."""
+    requests = []
+    for item in items:
+        start_date = _as_date(item.start_date)
+        end_date = _as_date(item.end_date)
+        if is_reservable(item.content_object) and start_date and end_date:
+            requests.append((item.content_object, start_date, end_date, item.quantity))
+    if not requests:
+        return
+    try:
+        reserve_many(booking, requests)
+    except ReservationError as exc:
+        raise BookingError(str(exc))
+
 
 
 @transaction.atomic
@@ -60,60 +85,55 @@ def create_generic_booking(
     if not items:
         raise BookingError("At least one booking item is required")
 
-    # Parse and validate items
-    parsed_items = []
-    total_amount = Decimal("0.00")
+    for item in items:
+        if item.get("type") not in item_types.ITEM_TYPES:
+            raise BookingError(f"Unknown item type: {item.get('type')}")
+
+    # One query per item type; room and car rows stay locked until commit
+    objects = item_types.load(((item["type"], item["id"]) for item in items), for_update=True)
+
+    # Validate against the loaded objects; prices are worked out in memory
+    line_items = []
     
     for item in items:
-        item_type = item.get("type")
-        content_type = get_content_type(item_type)
-        
-        # Get the content object
-        model_class = content_type.model_class()
-        try:
-            content_object = model_class.objects.get(pk=item["id"])
-        except model_class.DoesNotExist:
+        item_type = item["type"]
+        content_object = objects.get((item_type, int(item["id"])))
+        if content_object is None:
             raise BookingError(f"{item_type} with id {item['id']} not found")
+        if item_type != "package":
+            if getattr(content_object, "available", True) is False:
+                raise BookingError(f"{item_type} with id {item['id']} is not available")
+            if getattr(content_object, "is_active", True) is False:
+                raise BookingError(f"{item_type} with id {item['id']} is not active")
         
-        # Calculate line total
-        quantity = int(item.get("quantity", 1))
-        unit_price = Decimal(str(item.get("unit_price", "0.00")))
-        line_total = _calculate_line_total(unit_price, quantity)
-        total_amount += line_total
-        
-        parsed_items.append({
-            "content_type": content_type,
-            "object_id": item["id"],
-            "content_object": content_object,
-            "start_date": item.get("start_date"),
-            "end_date": item.get("end_date"),
-            "quantity": quantity,
-            "unit_price": unit_price,
-            "line_total": line_total,
-        })
+        line_item = BookingItem(
+            content_object=content_object,
+            start_date=item.get("start_date"),
+            end_date=item.get("end_date"),
+            quantity=int(item.get("quantity", 1)),
+            unit_price=Decimal(str(item.get("unit_price") or "0.00")),
+        )
+        line_item.apply_pricing()
+        line_items.append(line_item)
 
-    # Create Booking
+    _claim_package_seats(line_items)
+
+    # Create Booking with its final total, so bulk_add has nothing to rewrite
     booking = Booking.objects.create(
         user=user,
-        total=total_amount,
+        total=sum((line_item.line_total for line_item in line_items), Decimal("0.00")),
         currency=currency,
         status=Booking.Status.PENDING,
         note=note or "",
         package=None,
+        expires_at=_hold_expiry(),
     )
 
-    # Create BookingItem rows
-    for item in parsed_items:
-        BookingItem.objects.create(
-            booking=booking,
-            content_type=item["content_type"],
-            object_id=item["object_id"],
-            start_date=item["start_date"],
-            end_date=item["end_date"],
-            quantity=item["quantity"],
-            unit_price=item["unit_price"],
-            line_total=item["line_total"],
-        )
+    # Create BookingItem rows in one insert
+    BookingItem.bulk_add(booking, line_items)
+
+    # Take inventory; any failure aborts the whole booking transaction
+    _reserve_items(booking, line_items)
 
     return booking
 
@@ -135,40 +155,32 @@ def create_tour_package_booking(
     if not package.is_active:
         raise BookingError("Package is not active")
 
-    # Capacity check
-    if package.max_capacity:
-        existing_qty = BookingItem.objects.filter(
-            content_type=ContentType.objects.get_for_model(TourPackage),
-            object_id=package.id,
-            booking__status__in=[Booking.Status.CONFIRMED, Booking.Status.PENDING],
-        ).aggregate(total=Sum('quantity'))['total'] or 0
-        
-        if (existing_qty + guests) > package.max_capacity:
-            raise BookingError("Requested seats exceed package remaining capacity")
+    # Capacity check: one conditional UPDATE on the package's seat counter
+    if not TourPackage.claim_seats(package, guests):
+        raise BookingError("Requested seats exceed package remaining capacity")
 
-    # Calculate total
-    total_price = package.base_price * guests
+    line_item = BookingItem(
+        content_object=package,
+        start_date=start_date,
+        end_date=None,  
+        quantity=guests,
+        unit_price=package.base_price,
+    )
+    line_item.apply_pricing()
 
     # Create Booking
     booking = Booking.objects.create(
         user=user,
         package=package,
-        total=total_price,
+        total=line_item.line_total,
         currency=currency or package.currency or "USD",
         status=Booking.Status.PENDING,
         note=note or "",
+        expires_at=_hold_expiry(),
     )
 
     # Create BookingItem
-    BookingItem.objects.create(
-        booking=booking,
-        content_object=package,
-        start_date=start_date,
-        end_date=None,  
-        quantity=guests,
-        unit_price=package.base_price,
-        line_total=total_price,
-    )
+    BookingItem.bulk_add(booking, [line_item])
 
     return booking
 
@@ -318,51 +330,20 @@ def confirm_booking_on_payment(booking: Booking, payment: Optional[Payment] = No
         logger.debug("Booking %s already confirmed", booking.pk)
         return booking
 
+    if booking.status == Booking.Status.EXPIRED:
+        # Paid after the hold lapsed: take the inventory again if it is still free
+        logger.info("Re-reserving inventory for expired booking %s", booking.pk)
+        items = list(booking.items.prefetch_related("content_object"))
+        _claim_package_seats(items)
+        _reserve_items(booking, items)
+
+    # Package seats were claimed when the booking was created
     booking.status = Booking.Status.CONFIRMED
-    booking.save(update_fields=["status"])
+    booking.expires_at = None
+    booking.save(update_fields=["status", "expires_at"])
 
-    # Reduce inventory for tour packages
-    try:
-        for bi in booking.items.all():
-            obj = bi.content_object
-            if isinstance(obj, TourPackage) and getattr(obj, "max_capacity", None):
-                obj.max_capacity = max(0, obj.max_capacity - bi.quantity)
-                obj.save(update_fields=["max_capacity"])
-    except Exception:
-        logger.exception("Failed to decrement package capacity for booking %s", booking.pk)
-
-    # Send confirmation notifications
-    try:
-        # Send SMS
-        if hasattr(booking.user, 'phone') and booking.user.phone:
-            try:
-                sms_adapter = get_sms_adapter()
-                sms_adapter.send_sms(
-                    to=booking.user.phone,
-                    message=f"Your booking #{booking.id} has been confirmed. Total: {booking.currency} {booking.total}"
-                )
-            except Exception as e:
-                logger.warning("SMS notification failed: %s", str(e))
-
-        # Send email
-        if hasattr(booking.user, 'email') and booking.user.email:
-            try:
-                email_adapter = get_email_adapter()
-                email_adapter.send_email(
-                    to=[booking.user.email],
-                    subject="Booking Confirmation",
-                    html=f"""
-                    <h2>Booking Confirmed</h2>
-                    <p>Your booking #{booking.id} has been confirmed.</p>
-                    <p><strong>Total Amount:</strong> {booking.currency} {booking.total}</p>
-                    <p>Thank you for choosing our service!</p>
-                    """
-                )
-            except Exception as e:
-                logger.warning("Email notification failed: %s", str(e))
-                
-    except Exception as e:
-        logger.error("Notification system error: %s", str(e))
+    # Delivered by the drain_outbox worker after this transaction commits
+    enqueue_booking_confirmation(booking)
 
     return booking
 
@@ -384,20 +365,48 @@ def cancel_booking(booking: Booking, *, reason: Optional[str] = None, by_user: b
             logger.error("External booking cancellation failed: %s", str(e))
             raise BookingError(f"Failed to cancel external booking: {str(e)}")
 
+    # Expired bookings gave their seats back already
+    holds_seats = booking.status in (Booking.Status.PENDING, Booking.Status.CONFIRMED)
     booking.status = Booking.Status.CANCELLED
     booking.cancellation_reason = reason or ("Cancelled by user" if by_user else "Cancelled by staff")
     booking.save(update_fields=["status", "cancellation_reason"])
-    try:
-        for bi in booking.items.all():
-            obj = bi.content_object
-            if isinstance(obj, TourPackage) and getattr(obj, "max_capacity", None) is not None:
-                obj.max_capacity = obj.max_capacity + bi.quantity
-                obj.save(update_fields=["max_capacity"])
-    except Exception:
-        logger.exception("Failed to restore capacity for booking %s", booking.pk)
+    release_booking(booking)
+    if holds_seats:
+        TourPackage.release_seats(_package_seats([booking.pk]))
 
     return booking
 
+def expire_pending_bookings(*, batch_size: int = 500, now=None) -> int:
+    """
+    Expire PENDING bookings whose hold has lapsed and release their inventory.
+
+    Works in batches through the partial expires_at index; rows locked by a
+    concurrent confirm/cancel are skipped and picked up on the next run.
+    """
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Booking.objects.select_for_update(skip_locked=True)
+                .filter(status=Booking.Status.PENDING, expires_at__lte=now)
+                .order_by("expires_at")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            release_bookings(ids)
+            TourPackage.release_seats(_package_seats(ids))
+            Booking.objects.filter(pk__in=ids).update(
+                status=Booking.Status.EXPIRED,
+                cancellation_reason="Hold expired before payment",
+                updated_at=now,
+            )
+        expired += len(ids)
+        if len(ids) < batch_size:
+            break
+    return expired
+
 def list_user_bookings(user, status: Optional[List[str]] = None):
     qs = Booking.objects.filter(user=user).order_by("-created_at")
     if status:
@@ -1,3 +1,170 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from adapters.flights.fake import FakeFlightsAdapter
+from catalog.models import Destination, TourPackage
+from inventory.models import Car
+
+from . import services
+from .idempotency import HEADER, REPLAYED_HEADER
+from .models import Booking, IdempotencyKey
+
+
+class WorkerKilled(BaseException):
+    """Stands in for a worker killed mid-request: escapes every `except Exception`."""
+
+
+class IdempotencyKeyTests(TestCase):
+    """Idempotency-Key handling on the booking endpoints (booking/idempotency.py)."""
+
+    car_url = "/api/v1/booking/bookings/car/"
+    create_url = "/api/v1/booking/bookings/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="traveller", email="traveller@example.com")
+        destination = Destination.objects.create(name="Nairobi", city="Nairobi", country="Kenya")
+        cls.car = Car.objects.create(
+            destination=destination, make="Toyota", model="Corolla", category="sedan", daily_rate=Decimal("40")
+        )
+        cls.package = TourPackage.objects.create(
+            destination=destination, title="Safari", duration_days=3, base_price=Decimal("200")
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.body = {"car_id": self.car.pk, "start_date": "2030-01-01", "end_date": "2030-01-03"}
+
+    def post(self, url, body, key="key-1"):
+        return self.client.post(url, body, format="json", **{f"HTTP_{HEADER.upper().replace('-', '_')}": key})
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.post(self.car_url, self.body)
+        retry = self.post(self.car_url, self.body)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry.headers[REPLAYED_HEADER], "true")
+        self.assertNotIn(REPLAYED_HEADER, first.headers)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_same_key_with_a_different_body_is_rejected(self):
+        self.post(self.car_url, self.body)
+        response = self.post(self.car_url, {**self.body, "end_date": "2030-01-04"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_retry_while_the_first_request_runs_gets_409(self):
+        retries = []
+        create_car_booking = services.create_car_booking
+
+        def book_and_retry(**kwargs):
+            retries.append(self.post(self.car_url, self.body))
+            return create_car_booking(**kwargs)
+
+        with mock.patch("booking.views.create_car_booking", side_effect=book_and_retry):
+            first = self.post(self.car_url, self.body)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retries[0].status_code, 409)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_claim_left_by_a_dead_worker_is_taken_over(self):
+        with mock.patch("booking.views.create_car_booking", side_effect=WorkerKilled):
+            with self.assertRaises(WorkerKilled):
+                self.post(self.car_url, self.body)
+        self.assertEqual(self.post(self.car_url, self.body).status_code, 409)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        response = self.post(self.car_url, self.body)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(REPLAYED_HEADER, response.headers)
+        self.assertEqual(IdempotencyKey.objects.get().response_status, 201)
+
+    def test_5xx_releases_the_key(self):
+        body = {"tour_package_id": self.package.pk, "guests": 1}
+        with mock.patch("booking.views.create_tour_package_booking", side_effect=RuntimeError("database went away")):
+            failed = self.post(self.create_url, body)
+
+        self.assertEqual(failed.status_code, 500)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post(self.create_url, body).status_code, 201)
+
+    def test_transient_response_releases_the_key(self):
+        with mock.patch("booking.views.create_car_booking", side_effect=RuntimeError("lock timeout")):
+            failed = self.post(self.car_url, self.body)
+
+        self.assertEqual(failed.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        retry = self.post(self.car_url, self.body)
+        self.assertEqual(retry.status_code, 201)
+        self.assertNotIn(REPLAYED_HEADER, retry.headers)
+
+
+class FlightIdempotencyTests(TestCase):
+    """A flight retry must never reach the provider a second time."""
+
+    url = "/api/v1/booking/bookings/flight/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="flyer", email="flyer@example.com")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.offers = mock.patch.dict(
+            FakeFlightsAdapter._offers, {"FAKE1234": {"price": {"total": "320.00", "currency": "USD"}}}
+        )
+        self.offers.start()
+        self.addCleanup(self.offers.stop)
+        self.body = {
+            "provider": "fake",
+            "offer_id": "FAKE1234",
+            "passengers": [{"first_name": "Ada", "last_name": "Lovelace"}],
+        }
+
+    def post(self):
+        return self.client.post(self.url, self.body, format="json", **{f"HTTP_{HEADER.upper().replace('-', '_')}": "flight-1"})
+
+    def test_retry_does_not_book_again(self):
+        with mock.patch.object(FakeFlightsAdapter, "book", autospec=True, side_effect=FakeFlightsAdapter.book) as book:
+            first = self.post()
+            retry = self.post()
+
+        self.assertEqual(book.call_count, 1)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry.headers[REPLAYED_HEADER], "true")
+        self.assertEqual(Booking.objects.get().external_reference, first.data["external_booking_id"])
+
+    def test_local_save_failure_after_booking_is_still_replayed(self):
+        with mock.patch.object(FakeFlightsAdapter, "book", autospec=True, side_effect=FakeFlightsAdapter.book) as book:
+            with mock.patch("booking.views.Booking.objects.create", side_effect=RuntimeError("database went away")):
+                first = self.post()
+            retry = self.post()
+
+        self.assertEqual(book.call_count, 1)
+        self.assertEqual(first.status_code, 201)
+        self.assertIsNone(first.data["id"])
+        self.assertTrue(first.data["external_booking_id"])
+        self.assertEqual(retry.data, first.data)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_provider_failure_releases_the_key(self):
+        with mock.patch.object(FakeFlightsAdapter, "book", side_effect=ConnectionError("provider timeout")):
+            failed = self.post()
 
-# Create your tests here.
+        self.assertEqual(failed.status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post().status_code, 201)
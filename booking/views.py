@@ -3,15 +3,23 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from django.shortcuts import get_object_or_404
-from django.core.paginator import Paginator
+import json
 import logging
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from adapters.maps import get_maps_adapter
 from adapters.flights import get_flight_adapter
+from adapters.flights.fanout import iter_grid, first_last_segments
+from adapters.airports import get_airport_index
 from adapters.maps import get_maps_adapter
 from datetime import datetime
 from decimal import Decimal
 from .models import Booking
+from .idempotency import idempotent, transient
 from .services import create_car_booking
 from .serializers import (
     BookingReadSerializer, 
@@ -62,6 +70,7 @@ class BookingViewSet(
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @idempotent("booking.create")
     def create(self, request, *args, **kwargs):
         if 'tour_package_id' in request.data:
             return self._create_tour_package_booking(request)
@@ -74,10 +83,10 @@ class BookingViewSet(
             raise e
         except Exception as e:
             logger.error(f"Failed to create booking: {str(e)}")
-            return Response(
+            return transient(Response(
                 {"detail": "Failed to create booking", "error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
-            )
+            ))
 
         read_serializer = BookingReadSerializer(booking, context={"request": request})
         return Response(read_serializer.data, status=status.HTTP_201_CREATED)
@@ -142,21 +151,13 @@ class BookingViewSet(
 
     logger = logging.getLogger(__name__)
     
+    @staticmethod
     def resolve_airports_from_country(country_name: str) -> list:
-        maps_adapter = get_maps_adapter("fake") 
-
-        results = maps_adapter.geocode(query=country_name).get("results", [])
-        
-        airports = []
-        for res in results:
-            country = res.get("country")
-            country_airports = maps_adapter.get_airports_by_country(country)
-            airports.extend(country_airports)
-        
-        return airports
+        return [airport.iata for airport in get_airport_index().by_country(country_name)]
 
 
     @action(detail=False, methods=['post'])
+    @idempotent("booking.flight")
     def flight(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -180,44 +181,50 @@ class BookingViewSet(
                     ],
                 },
             )
-            from decimal import Decimal
-            booking_obj = Booking.objects.create(
-                user=request.user,
-                total=Decimal(booking_result["total_amount"]),
-                currency=booking_result.get("currency", currency),
-                note="Flight booking",
-                external_reference=booking_result.get("external_booking_id") or booking_result.get("locator"),
-                external_service=provider,
-                status=Booking.Status.CONFIRMED
-            )
-
-            return Response(
-                {   
-                    "id": booking_obj.id,
-                    "provider": provider,
-                    "external_booking_id": booking_result.get("locator"),
-                    "status": booking_result.get("status"),
-                    "currency": booking_result.get("currency", currency),
-                    "total_amount": booking_result.get("total_amount"),
-                    "passengers": booking_result.get("passengers", []),
-                    "raw": booking_result.get("raw", {}),
-                },
-                status=status.HTTP_201_CREATED,
-            )
-
         except ImportError:
             logger.error(f"Flight provider '{provider}' not supported")
             return Response(
                 {"detail": f"Flight provider '{provider}' is not supported"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-
         except Exception as e:
             logger.exception(f"Flight booking failed with {provider}")
-            return Response(
+            return transient(Response(
                 {"detail": f"Failed to create flight booking: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST,
-            )
+            ))
+
+        # The provider has issued the ticket. From here on the response must
+        # be stored under the Idempotency-Key (never released), or a retry
+        # would book a second ticket.
+        locator = booking_result.get("external_booking_id") or booking_result.get("locator")
+        payload = {
+            "id": None,
+            "provider": provider,
+            "external_booking_id": locator,
+            "status": booking_result.get("status"),
+            "currency": booking_result.get("currency", currency),
+            "total_amount": booking_result.get("total_amount"),
+            "passengers": booking_result.get("passengers", []),
+            "raw": booking_result.get("raw", {}),
+        }
+        try:
+            with transaction.atomic():
+                booking_obj = Booking.objects.create(
+                    user=request.user,
+                    total=Decimal(str(booking_result.get("total_amount") or "0")),
+                    currency=booking_result.get("currency", currency),
+                    note="Flight booking",
+                    external_reference=locator,
+                    external_service=provider,
+                    status=Booking.Status.CONFIRMED
+                )
+        except Exception:
+            logger.exception("Flight %s was booked with %s but the local booking could not be saved", locator, provider)
+            payload["detail"] = "The flight was booked with the provider but could not be recorded locally; contact support with the locator."
+        else:
+            payload["id"] = booking_obj.id
+        return Response(payload, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['get'])
     def flight_status(self, request, pk=None):
@@ -254,6 +261,7 @@ class BookingViewSet(
                 status=status.HTTP_400_BAD_REQUEST,
             )
     @action(detail=False, methods=['post'])
+    @idempotent("booking.hotel")
     def hotel(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -280,15 +288,16 @@ class BookingViewSet(
             raise ValidationError({"detail": str(e)})
         except Exception as e:
             logger.error(f"Failed to create hotel booking: {str(e)}")
-            return Response(
+            return transient(Response(
                 {"detail": "Failed to create hotel booking", "error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
-            )
+            ))
 
         serializer = BookingReadSerializer(booking, context={"request": request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['post'])
+    @idempotent("booking.car")
     def car(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -313,10 +322,10 @@ class BookingViewSet(
             raise ValidationError({"detail": str(e)})
         except Exception as e:
             logger.error(f"Failed to create car booking: {str(e)}")
-            return Response(
+            return transient(Response(
                 {"detail": "Failed to create car booking", "error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
-            )
+            ))
 
         serializer = BookingReadSerializer(booking, context={"request": request})
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -324,9 +333,7 @@ class BookingViewSet(
     @action(detail=False, methods=['get'])
     def mine(self, request):
         status_filter = request.query_params.get('status')
-        page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 10))
-        
+
         bookings = Booking.objects.filter(user=request.user)
         
         if status_filter:
@@ -337,25 +344,11 @@ class BookingViewSet(
             if filtered_statuses:
                 bookings = bookings.filter(status__in=filtered_statuses)
         
-        bookings = bookings.order_by('-created_at').select_related('package').prefetch_related('items')
-        paginator = Paginator(bookings, page_size)
-        try:
-            page_obj = paginator.page(page)
-        except Exception:
-            page_obj = paginator.page(1)
-        
-        serializer = BookingReadSerializer(page_obj, many=True, context={"request": request})
-        
-        return Response({
-            'results': serializer.data,
-            'pagination': {
-                'count': paginator.count,
-                'pages': paginator.num_pages,
-                'current_page': page_obj.number,
-                'has_next': page_obj.has_next(),
-                'has_previous': page_obj.has_previous(),
-            }
-        })
+        # Cursor pages on -created_at; ?page_size= and ?count=true are honoured.
+        bookings = bookings.select_related('package').prefetch_related('items')
+        page = self.paginate_queryset(bookings)
+        serializer = BookingReadSerializer(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['get'])
     def flight_status(self, request, pk=None):
@@ -388,8 +381,10 @@ class BookingViewSet(
     @action(detail=False, methods=['post'])
     def flight_search(self, request):
         data = request.data
-        origin_airports = data.get("origin_airports", [])
-        destination_airports = data.get("destination_airports", [])
+        # Explicit IATA lists win; otherwise "origin"/"destination" may be a code, city or country.
+        airport_index = get_airport_index()
+        origin_airports = data.get("origin_airports") or airport_index.resolve(data.get("origin"))
+        destination_airports = data.get("destination_airports") or airport_index.resolve(data.get("destination"))
         departure_date = data.get("departure_date")
         passengers = data.get("passengers", 1)
         package_start_date = data.get("package_start_date")
@@ -406,30 +401,33 @@ class BookingViewSet(
             if package_start_date:
                 package_start_dt = datetime.strptime(package_start_date, "%Y-%m-%d")
 
-            offers = []
-
-            for origin_code in origin_airports:
-                for dest_code in destination_airports:
-                    if not origin_code or not dest_code:
-                        continue
-
-                    search_result = flight_adapter.search(
-                        origin=origin_code,
-                        destination=dest_code,
-                        departure_date=departure_date,
-                        adults=passengers
-                    )
-
-                    for offer in search_result.get("offers", []):
-                        if package_start_dt:
-                            first_segment = offer["itineraries"][0]["segments"][0]
-                            departure_str = first_segment["departure"]["at"]
-                            departure_dt = datetime.strptime(departure_str, "%Y-%m-%dT%H:%M:%SZ")
+            def departs_before_package(offer):
+                first_segment, _ = first_last_segments(offer)
+                if not first_segment:
+                    return False
+                departure_dt = parse_datetime(first_segment["departure"]["at"])
+                if departure_dt is None:
+                    return False
+                if timezone.is_aware(departure_dt):
+                    departure_dt = timezone.make_naive(departure_dt, dt_timezone.utc)
+                return departure_dt <= package_start_dt
+
+            results = iter_grid(
+                flight_adapter,
+                origin_airports,
+                destination_airports,
+                depart_date=departure_date,
+                adults=passengers,
+                accept=departs_before_package if package_start_dt else None,
+            )
 
-                            if departure_dt > package_start_dt:
-                                continue
+            if data.get("stream"):
+                lines = (json.dumps(result, cls=DjangoJSONEncoder) + "\n" for result in results)
+                return StreamingHttpResponse(lines, content_type="application/x-ndjson")
 
-                        offers.append(offer)
+            offers = []
+            for result in results:
+                offers.extend(result["offers"])
 
             if not offers:
                 return Response({"detail": "No flight options found."}, status=status.HTTP_404_NOT_FOUND)
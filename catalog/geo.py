@@ -0,0 +1,97 @@
+"""
+"Near me" search over Destination coordinates, answered from our own
+tables instead of a maps provider.
+
+A bounding box around the point narrows candidates with a range scan on
+the (latitude, longitude) index, then the great-circle (haversine)
+distance drops the box corners and sorts what is left. Large candidate
+sets are measured with NumPy when it is installed; without it the same
+formula runs in plain Python.
+"""
+import math
+from typing import List, Optional, Sequence, Tuple
+
+from django.db.models import Q, QuerySet
+
+from .models import Destination
+
+try:
+    import numpy as np
+except ImportError:  # optional; only used to vectorize big candidate sets
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+# Below this many candidates building arrays costs more than it saves.
+VECTORIZE_MIN_POINTS = 256
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Q:
+    """
+    Filter for rows inside the lat/lng box enclosing the circle. The box
+    covers all longitudes near a pole and splits in two across the 180th
+    meridian.
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = lat - dlat, lat + dlat
+    box = Q(latitude__gte=max(min_lat, -90.0), latitude__lte=min(max_lat, 90.0))
+    if min_lat <= -90 or max_lat >= 90:
+        return box & Q(longitude__isnull=False)
+
+    # Widest longitude span of the circle, at its furthest-from-equator latitude.
+    dlng = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(max(abs(min_lat), abs(max_lat))))))
+    if dlng >= 180:
+        return box & Q(longitude__isnull=False)
+    min_lng, max_lng = lng - dlng, lng + dlng
+    if min_lng < -180:
+        lng_range = Q(longitude__gte=min_lng + 360) | Q(longitude__lte=max_lng)
+    elif max_lng > 180:
+        lng_range = Q(longitude__gte=min_lng) | Q(longitude__lte=max_lng - 360)
+    else:
+        lng_range = Q(longitude__gte=min_lng, longitude__lte=max_lng)
+    return box & lng_range
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def distances_km(lat: float, lng: float, points: Sequence[Tuple[float, float]]) -> List[float]:
+    """Haversine distance from (lat, lng) to every (lat, lng) in `points`."""
+    if np is None or len(points) < VECTORIZE_MIN_POINTS:
+        return [haversine_km(lat, lng, plat, plng) for plat, plng in points]
+    coords = np.radians(np.asarray(points, dtype=float))
+    phi1, lambda1 = math.radians(lat), math.radians(lng)
+    dphi = coords[:, 0] - phi1
+    dlambda = coords[:, 1] - lambda1
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(coords[:, 0]) * np.sin(dlambda / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))).tolist()
+
+
+def nearby_destinations(
+    lat: float,
+    lng: float,
+    radius_km: float,
+    *,
+    queryset: Optional[QuerySet] = None,
+    limit: Optional[int] = None,
+) -> List[Destination]:
+    """
+    Destinations within `radius_km` of (lat, lng), nearest first, each with
+    a `distance_km` attribute.
+    """
+    queryset = Destination.objects.all() if queryset is None else queryset
+    candidates = list(queryset.filter(bounding_box(lat, lng, radius_km)))
+    distances = distances_km(lat, lng, [(d.latitude, d.longitude) for d in candidates])
+
+    found = []
+    for destination, distance in zip(candidates, distances):
+        if distance <= radius_km:
+            destination.distance_km = round(distance, 3)
+            found.append(destination)
+    found.sort(key=lambda d: (d.distance_km, d.pk))
+    return found[:limit] if limit else found
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from catalog.models import TourPackage
+
+
+class Command(BaseCommand):
+    help = "Recompute tour package seats_remaining from pending and confirmed bookings"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--package", type=int, action="append", dest="packages", help="Only this package id (repeatable)")
+        parser.add_argument("--batch-size", type=int, default=500, help="Packages locked and checked per transaction")
+
+    def handle(self, *args, **options):
+        packages = TourPackage.objects.order_by("pk")
+        if options["packages"]:
+            packages = packages.filter(pk__in=options["packages"])
+
+        checked = fixed = 0
+        last_pk = 0
+        while True:
+            ids = list(packages.filter(pk__gt=last_pk).values_list("pk", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            fixed += TourPackage.reconcile_seats(TourPackage.objects.filter(pk__in=ids))
+            checked += len(ids)
+            last_pk = ids[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} package(s), corrected {fixed} seat counter(s).")
+        )
+
+
+"""to recompute package seat counters (e.g. nightly from cron, or after a
+bulk data fix), run:
+
+python manage.py reconcile_package_seats
+
+or for specific packages:
+
+python manage.py reconcile_package_seats --package 12 --package 15
+
+"""
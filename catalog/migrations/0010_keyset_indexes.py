@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0009_alter_destination_cover_image'),
+        ('inventory', '0014_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['name', 'id'], name='catalog_des_name_480e08_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tourpackage',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='catalog_tou_is_acti_9ea33d_idx'),
+        ),
+    ]
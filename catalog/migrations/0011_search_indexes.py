@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:52
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# The indexes catalog.search.search_indexes() built when this migration was
+# written, frozen here so later edits to SEARCH_FIELDS / TRIGRAM_FIELDS do
+# not change what this migration creates or drops.
+SEARCH_INDEXES = {
+    "Destination": [
+        GinIndex(
+            SearchVector("name", weight="A", config="simple")
+            + SearchVector("city", "country", weight="B", config="simple"),
+            name="catalog_destination_search_gin",
+        ),
+        GinIndex(OpClass("city", name="gin_trgm_ops"), name="catalog_destination_city_trgm"),
+    ],
+    "TourPackage": [
+        GinIndex(
+            SearchVector("title", weight="A", config="simple")
+            + SearchVector("summary", weight="B", config="simple"),
+            name="catalog_tourpackage_search_gin",
+        ),
+    ],
+}
+
+
+def add_search_indexes(apps, schema_editor):
+    """GIN expression indexes are PostgreSQL-only; other backends search in Python."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, indexes in SEARCH_INDEXES.items():
+        model = apps.get_model("catalog", name)
+        for index in indexes:
+            schema_editor.add_index(model, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, indexes in SEARCH_INDEXES.items():
+        model = apps.get_model("catalog", name)
+        for index in indexes:
+            schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
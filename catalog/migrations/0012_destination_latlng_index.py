@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0011_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='destination',
+            index=models.Index(fields=['latitude', 'longitude'], name='catalog_des_latitud_1d74fa_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:57
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_seats_remaining(apps, schema_editor):
+    TourPackage = apps.get_model("catalog", "TourPackage")
+    BookingItem = apps.get_model("booking", "BookingItem")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    content_type = ContentType.objects.filter(app_label="catalog", model="tourpackage").first()
+    if content_type is None:
+        TourPackage.objects.filter(max_capacity__isnull=False).update(seats_remaining=models.F("max_capacity"))
+        return
+
+    def seats_by_package(statuses):
+        return dict(
+            BookingItem.objects.filter(content_type=content_type, booking__status__in=statuses)
+            .values("object_id")
+            .annotate(seats=Sum("quantity"))
+            .values_list("object_id", "seats")
+        )
+
+    confirmed = seats_by_package(["CONFIRMED"])
+    held = seats_by_package(["PENDING", "CONFIRMED"])
+    for pk, capacity in TourPackage.objects.filter(max_capacity__isnull=False).values_list("pk", "max_capacity"):
+        # Confirming used to lower max_capacity by the booked quantity (and
+        # cancelling raised it again). Give those seats back first so they
+        # are not subtracted twice; max_capacity is the package size again.
+        capacity += confirmed.get(pk, 0)
+        TourPackage.objects.filter(pk=pk).update(
+            max_capacity=capacity,
+            seats_remaining=max(0, capacity - held.get(pk, 0)),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0012_destination_latlng_index'),
+        ('booking', '0009_idempotencykey'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tourpackage',
+            name='seats_remaining',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='max_capacity less the seats held by pending and confirmed bookings', null=True),
+        ),
+        migrations.RunPython(backfill_seats_remaining, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,19 @@
 # catalog/models.py
-from django.db import models
+from typing import Dict, Iterable, Optional
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Greatest, Least
 from django.utils.text import slugify
 from cloudinary.models import CloudinaryField
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from adapters.maps import get_maps_adapter
+from . import pricing
 
 class Destination(models.Model):
     name = models.CharField(max_length=255)
@@ -24,6 +34,14 @@ class Destination(models.Model):
     null=True,
 )
 
+    class Meta:
+        indexes = [
+            # Keyset pagination walks (name, id)
+            models.Index(fields=["name", "id"]),
+            # Bounding-box prefilter for catalog.geo
+            models.Index(fields=["latitude", "longitude"]),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(f"{self.city}-{self.country}")
@@ -69,6 +87,11 @@ class TourPackage(models.Model):
     max_capacity = models.PositiveIntegerField(
         null=True, blank=True, help_text="Max pax per departure (optional)"
     )
+    # Only changed through claim_seats/release_seats, never by save().
+    seats_remaining = models.PositiveIntegerField(
+        null=True, blank=True, editable=False,
+        help_text="max_capacity less the seats held by pending and confirmed bookings"
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -94,12 +117,14 @@ class TourPackage(models.Model):
     )
     nights = models.PositiveSmallIntegerField(default=1)
     car_days = models.PositiveSmallIntegerField(default=1)
+    reviews = GenericRelation("reviews.Review", related_query_name="tour_package")
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["destination", "is_active"]),
             models.Index(fields=["slug"]),
+            models.Index(fields=["is_active", "-created_at", "-id"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -111,14 +136,112 @@ class TourPackage(models.Model):
                 slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = slug
+
+        if self._state.adding:
+            self.seats_remaining = self.max_capacity
+            super().save(*args, **kwargs)
+            self._loaded_max_capacity = self.max_capacity
+            return
+
+        # Never write back the seats_remaining loaded with this instance; a
+        # booking may have claimed seats since.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            update_fields = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "seats_remaining"
+            ]
+        kwargs["update_fields"] = [f for f in update_fields if f != "seats_remaining"]
         super().save(*args, **kwargs)
 
+        loaded = getattr(self, "_loaded_max_capacity", models.DEFERRED)
+        if "max_capacity" in kwargs["update_fields"] and self.max_capacity != loaded:
+            self._resize_seats(loaded)
+            self._loaded_max_capacity = self.max_capacity
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_max_capacity = instance.__dict__.get("max_capacity", models.DEFERRED)
+        return instance
+
+    # ---------- Seat counter ----------
+    def _resize_seats(self, old_capacity):
+        packages = TourPackage.objects.filter(pk=self.pk)
+        if self.max_capacity is None:
+            packages.update(seats_remaining=None)
+        elif old_capacity is None or old_capacity is models.DEFERRED:
+            TourPackage.reconcile_seats(packages)
+        else:
+            packages.update(
+                seats_remaining=Greatest(F("seats_remaining") + (self.max_capacity - old_capacity), 0)
+            )
+
+    @classmethod
+    def claim_seats(cls, package: "TourPackage", seats: int) -> bool:
+        """
+        Take `seats` with a single conditional UPDATE; False if fewer are
+        left. Packages without a max_capacity are not counted.
+        """
+        if package.max_capacity is None:
+            return True
+        return bool(
+            cls.objects.filter(pk=package.pk, seats_remaining__gte=seats)
+            .update(seats_remaining=F("seats_remaining") - seats)
+        )
+
+    @classmethod
+    def release_seats(cls, seats_by_package: Dict[int, int]) -> None:
+        """Give back {package_id: seats}, never above max_capacity."""
+        for package_id, seats in seats_by_package.items():
+            if seats:
+                cls.objects.filter(pk=package_id, seats_remaining__isnull=False).update(
+                    seats_remaining=Least(F("seats_remaining") + seats, F("max_capacity"))
+                )
+
+    @classmethod
+    def seats_held(cls, package_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """{package_id: seats} held by PENDING and CONFIRMED bookings."""
+        Booking = apps.get_model("booking", "Booking")
+        items = apps.get_model("booking", "BookingItem").objects.filter(
+            content_type=ContentType.objects.get_for_model(cls),
+            booking__status__in=[Booking.Status.PENDING, Booking.Status.CONFIRMED],
+        )
+        if package_ids is not None:
+            items = items.filter(object_id__in=list(package_ids))
+        return dict(items.values("object_id").annotate(seats=Sum("quantity")).values_list("object_id", "seats"))
+
+    @classmethod
+    def reconcile_seats(cls, queryset=None) -> int:
+        """
+        Recompute seats_remaining from the bookings for `queryset` (default
+        all packages) and return how many counters were wrong. The rows are
+        locked first, so seats claimed meanwhile wait and are not lost.
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        fixed = 0
+        with transaction.atomic():
+            packages = list(queryset.select_for_update().values_list("pk", "max_capacity", "seats_remaining"))
+            held = cls.seats_held([pk for pk, _, _ in packages])
+            for pk, capacity, remaining in packages:
+                expected = None if capacity is None else max(0, capacity - held.get(pk, 0))
+                if remaining != expected:
+                    cls.objects.filter(pk=pk).update(seats_remaining=expected)
+                    fixed += 1
+        return fixed
+
     @property
     def total_price(self):
-        hotel_price = (self.hotel.price if self.hotel else 0) * self.nights
-        car_price = (self.car.price if self.car else 0) * self.car_days
-        commission_amount = ((hotel_price + car_price) * self.commission) / 100
-        return hotel_price + car_price + commission_amount
+        """Price with the package's own hotel (first room type), car, nights and car days."""
+        room = self.hotel.room_types.order_by("pk").first() if self.hotel else None
+        return pricing.price_breakdown(
+            self.base_price,
+            self.commission,
+            room_rate=room.base_price if room else None,
+            nights=self.nights,
+            car_rate=self.car.daily_rate if self.car else None,
+            car_days=self.car_days,
+        )["total_price"]
 
     def __str__(self):
         return f"{self.title} — {self.destination.name}"
@@ -133,3 +256,22 @@ class PackageImage(models.Model):
 
     def __str__(self):
         return f"{self.package.title} — {self.caption or 'image'}"
+
+
+# Quote component caches (catalog/pricing.py) follow the rows they price.
+@receiver(post_save, sender=TourPackage)
+@receiver(post_delete, sender=TourPackage)
+def invalidate_package_price(sender, instance, **kwargs):
+    pricing.invalidate(pricing.package_key(instance.pk))
+
+
+@receiver(post_save, sender="inventory.RoomType")
+@receiver(post_delete, sender="inventory.RoomType")
+def invalidate_room_rates(sender, instance, **kwargs):
+    pricing.invalidate(pricing.hotel_rooms_key(instance.hotel_id))
+
+
+@receiver(post_save, sender="inventory.Car")
+@receiver(post_delete, sender="inventory.Car")
+def invalidate_car_rate(sender, instance, **kwargs):
+    pricing.invalidate(pricing.car_key(instance.pk))
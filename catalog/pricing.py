@@ -0,0 +1,198 @@
+"""
+Package price quotes.
+
+A quote is built from three component prices: the package's own terms
+(base price, commission, default hotel/car/nights), the hotel's room rates
+and the car's daily rate. Each component is cached under its own key and
+dropped by the receivers in catalog/models.py when the row behind it is
+saved or deleted, so after the first call a quote is plain arithmetic.
+
+Components live in the PRICING_CACHE["alias"] cache so every worker sees
+an invalidation. When that alias is process-local (LocMemCache, which is
+what an unconfigured CACHES gives) a delete only reaches the worker that
+made it, so entries are kept for PRICING_CACHE["local_ttl_seconds"]
+instead: other workers can quote a stale price for up to that long.
+
+`price_breakdown` is the single formula; TourPackage.total_price and the
+package serializer use it too.
+"""
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from inventory.models import Car, RoomType
+
+KEY_PREFIX = "pricing"
+# Invalidation is signal-driven; on a shared cache the TTL only bounds what
+# a missed signal (e.g. a queryset .update()) can leave behind.
+CACHE_TTL_SECONDS = 3600
+LOCAL_CACHE_TTL_SECONDS = 60
+TWO_PLACES = Decimal("0.01")
+
+
+class QuoteError(ValueError):
+    """The requested combination cannot be priced (e.g. a room type from another hotel)."""
+
+
+def _cache():
+    alias = getattr(settings, "PRICING_CACHE", {}).get("alias", "default")
+    return caches[alias]
+
+
+def _ttl(cache) -> int:
+    config = getattr(settings, "PRICING_CACHE", {})
+    if isinstance(cache, LocMemCache):
+        return config.get("local_ttl_seconds", LOCAL_CACHE_TTL_SECONDS)
+    return config.get("ttl_seconds", CACHE_TTL_SECONDS)
+
+
+def package_key(package_id: int) -> str:
+    return f"{KEY_PREFIX}:package:{package_id}"
+
+
+def hotel_rooms_key(hotel_id: int) -> str:
+    return f"{KEY_PREFIX}:hotel-rooms:{hotel_id}"
+
+
+def car_key(car_id: int) -> str:
+    return f"{KEY_PREFIX}:car:{car_id}"
+
+
+def invalidate(key: str) -> None:
+    """Drop a component now and again after commit, so a reader inside the
+    writer's transaction window cannot re-cache the old price."""
+    cache = _cache()
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+# ---------- Components ----------
+def package_terms(package_id: int) -> Optional[Dict]:
+    key = package_key(package_id)
+    cache = _cache()
+    terms = cache.get(key)
+    if terms is None:
+        from .models import TourPackage
+
+        terms = (
+            TourPackage.objects.filter(pk=package_id)
+            .values("base_price", "commission", "currency", "hotel_id", "car_id", "nights", "car_days")
+            .first()
+        )
+        if terms is None:
+            return None
+        cache.set(key, terms, _ttl(cache))
+    return terms
+
+
+def hotel_room_rates(hotel_id: int) -> Dict:
+    """{"default": id of the hotel's first room type, "rates": {room_type_id: base_price}}."""
+    key = hotel_rooms_key(hotel_id)
+    cache = _cache()
+    rooms = cache.get(key)
+    if rooms is None:
+        rates = dict(RoomType.objects.filter(hotel_id=hotel_id).order_by("pk").values_list("pk", "base_price"))
+        rooms = {"default": next(iter(rates), None), "rates": rates}
+        cache.set(key, rooms, _ttl(cache))
+    return rooms
+
+
+def car_daily_rate(car_id: int) -> Optional[Decimal]:
+    key = car_key(car_id)
+    cache = _cache()
+    rate = cache.get(key)
+    if rate is None:
+        rate = Car.objects.filter(pk=car_id).values_list("daily_rate", flat=True).first()
+        if rate is None:
+            return None
+        cache.set(key, rate, _ttl(cache))
+    return rate
+
+
+# ---------- Formula ----------
+def price_breakdown(
+    base_price: Decimal,
+    commission_percent: Decimal,
+    *,
+    room_rate: Optional[Decimal] = None,
+    nights: int = 0,
+    car_rate: Optional[Decimal] = None,
+    car_days: int = 0,
+) -> Dict[str, Decimal]:
+    room_cost = (room_rate or Decimal("0")) * nights
+    car_cost = (car_rate or Decimal("0")) * car_days
+    subtotal = base_price + room_cost + car_cost
+    commission = (subtotal * Decimal(commission_percent) / 100).quantize(TWO_PLACES)
+    return {
+        "package_base": base_price,
+        "room_cost": room_cost,
+        "car_cost": car_cost,
+        "subtotal": subtotal,
+        "commission_percent": Decimal(commission_percent),
+        "commission": commission,
+        "total_price": subtotal + commission,
+    }
+
+
+def quote(
+    package_id: int,
+    *,
+    nights: Optional[int] = None,
+    car_days: Optional[int] = None,
+    room_type_id: Optional[int] = None,
+    hotel_id: Optional[int] = None,
+    car_id: Optional[int] = None,
+) -> Optional[Dict]:
+    """
+    Price a package for a stay. Anything not given falls back to the
+    package's own hotel, car, nights and car_days; the room defaults to the
+    hotel's first room type. Returns None for an unknown package and raises
+    QuoteError for a room type, hotel or car that cannot be priced.
+    """
+    terms = package_terms(package_id)
+    if terms is None:
+        return None
+
+    nights = terms["nights"] if nights is None else nights
+    car_days = terms["car_days"] if car_days is None else car_days
+    hotel_id = hotel_id or terms["hotel_id"]
+    car_id = car_id or terms["car_id"]
+
+    room_rate = None
+    if hotel_id:
+        rooms = hotel_room_rates(hotel_id)
+        room_type_id = room_type_id or rooms["default"]
+        if room_type_id is not None:
+            if room_type_id not in rooms["rates"]:
+                raise QuoteError(f"Room type {room_type_id} is not offered by hotel {hotel_id}")
+            room_rate = rooms["rates"][room_type_id]
+    elif room_type_id:
+        raise QuoteError("A room type needs a hotel")
+
+    car_rate = None
+    if car_id:
+        car_rate = car_daily_rate(car_id)
+        if car_rate is None:
+            raise QuoteError(f"Car {car_id} does not exist")
+
+    breakdown = price_breakdown(
+        terms["base_price"],
+        terms["commission"],
+        room_rate=room_rate,
+        nights=nights if room_rate is not None else 0,
+        car_rate=car_rate,
+        car_days=car_days if car_rate is not None else 0,
+    )
+    breakdown.update(
+        currency=terms["currency"],
+        nights=nights,
+        car_days=car_days,
+        hotel_id=hotel_id,
+        room_type_id=room_type_id,
+        car_id=car_id,
+    )
+    return breakdown
@@ -0,0 +1,173 @@
+"""
+Full-text search for hotels, destinations and tour packages.
+
+On PostgreSQL every searchable model has a GIN expression index over a
+weighted tsvector (see `search_indexes`), and
+`search()` filters and ranks on exactly that expression so the match is a
+single index lookup. City names also carry a pg_trgm index, so a
+misspelling like "Nairbi" still finds Nairobi. Other backends (SQLite in
+tests and local dev) score rows in Python with the same weights.
+
+Migrations hold frozen copies of those indexes, so changing SEARCH_FIELDS
+or TRIGRAM_FIELDS changes the expression `search()` uses but not the index:
+add a migration that drops the old index and creates the new one (written
+out literally, not imported from here), or the planner stops using it.
+"""
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, QuerySet, Value, When
+from django.db.models.functions import Cast, Coalesce
+from rest_framework import filters
+
+SEARCH_CONFIG = "simple"
+RANK_ANNOTATION = "search_rank"
+
+# Columns per model, grouped by tsvector weight (A ranks highest).
+SEARCH_FIELDS: Dict[str, Dict[str, tuple]] = {
+    "inventory.hotel": {"A": ("name",), "B": ("city", "country"), "C": ("address",)},
+    "catalog.destination": {"A": ("name",), "B": ("city", "country")},
+    "catalog.tourpackage": {"A": ("title",), "B": ("summary",)},
+}
+
+# Column matched by trigram similarity when the words do not match exactly.
+TRIGRAM_FIELDS = {
+    "inventory.hotel": "city",
+    "catalog.destination": "city",
+}
+
+# Foreign keys whose own search also matches the row, e.g. a package is
+# found by its destination's name. Each side is still one index lookup.
+SEARCH_RELATED = {
+    "catalog.tourpackage": "destination",
+}
+
+# Same defaults as PostgreSQL's ts_rank weights {D, C, B, A}.
+WEIGHTS = {"A": 1.0, "B": 0.4, "C": 0.2, "D": 0.1}
+# SequenceMatcher ratio standing in for pg_trgm similarity off PostgreSQL.
+FUZZY_RATIO = 0.75
+
+
+def _label(model) -> str:
+    return model._meta.label_lower
+
+
+def search_vector(model) -> SearchVector:
+    """The weighted tsvector expression indexed for `model`."""
+    vector = None
+    for weight, fields in SEARCH_FIELDS[_label(model)].items():
+        part = SearchVector(*fields, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def search_indexes(model) -> List[GinIndex]:
+    """GIN indexes backing `search()` for `model`; only valid on PostgreSQL."""
+    table = model._meta.db_table
+    indexes = [GinIndex(search_vector(model), name=f"{table}_search_gin")]
+    trigram_field = TRIGRAM_FIELDS.get(_label(model))
+    if trigram_field:
+        indexes.append(
+            GinIndex(OpClass(trigram_field, name="gin_trgm_ops"), name=f"{table}_{trigram_field}_trgm")
+        )
+    return indexes
+
+
+def search(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter `queryset` to rows matching `query`, annotated with `search_rank`
+    and ordered by it, best match first. A blank query returns the queryset
+    unchanged.
+    """
+    query = (query or "").strip()
+    if not query:
+        return queryset
+    if connections[queryset.db].vendor == "postgresql":
+        queryset = _postgres_search(queryset, query)
+    else:
+        queryset = _python_search(queryset, query)
+    return queryset.order_by(f"-{RANK_ANNOTATION}", "-pk")
+
+
+def _related_matches(model, query: str) -> Dict[str, QuerySet]:
+    fk_name = SEARCH_RELATED.get(_label(model))
+    if not fk_name:
+        return {}
+    related_model = model._meta.get_field(fk_name).related_model
+    return {fk_name: search(related_model._default_manager.all(), query).values("pk")}
+
+
+def _postgres_search(queryset: QuerySet, query: str) -> QuerySet:
+    model = queryset.model
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+    # Cast to double precision so the rank survives the round trip through
+    # a pagination cursor unchanged.
+    rank = Cast(SearchRank(F("search_document"), search_query), FloatField())
+    match = Q(search_document=search_query)
+
+    trigram_field = TRIGRAM_FIELDS.get(_label(model))
+    if trigram_field:
+        match |= Q(**{f"{trigram_field}__trigram_similar": query})
+        rank = rank + Coalesce(
+            Cast(TrigramSimilarity(trigram_field, query), FloatField()), Value(0.0)
+        )
+    for fk_name, related in _related_matches(model, query).items():
+        match |= Q(**{f"{fk_name}__in": related})
+
+    return (
+        queryset.annotate(search_document=search_vector(model))
+        .filter(match)
+        .annotate(**{RANK_ANNOTATION: rank})
+    )
+
+
+def _python_search(queryset: QuerySet, query: str) -> QuerySet:
+    label = _label(queryset.model)
+    weighted = [(field, WEIGHTS[weight]) for weight, fields in SEARCH_FIELDS[label].items() for field in fields]
+    trigram_field = TRIGRAM_FIELDS.get(label)
+    columns = [field for field, _ in weighted]
+    if trigram_field and trigram_field not in columns:
+        columns.append(trigram_field)
+    terms = query.lower().split()
+
+    scores = {}
+    for pk, *values in queryset.values_list("pk", *columns):
+        text = {column: (value or "").lower() for column, value in zip(columns, values)}
+        if all(any(term in text[field] for field, _ in weighted) for term in terms):
+            scores[pk] = sum(weight for field, weight in weighted for term in terms if term in text[field])
+        elif trigram_field:
+            ratio = SequenceMatcher(None, query.lower(), text[trigram_field]).ratio()
+            if ratio >= FUZZY_RATIO:
+                scores[pk] = ratio
+
+    for fk_name, related in _related_matches(queryset.model, query).items():
+        related_ids = set(related.values_list("pk", flat=True))
+        for pk, fk_id in queryset.values_list("pk", f"{fk_name}_id"):
+            if fk_id in related_ids:
+                scores.setdefault(pk, 0.0)
+
+    if not scores:
+        return queryset.none().annotate(**{RANK_ANNOTATION: Value(0.0, output_field=FloatField())})
+    rank = Case(
+        *[When(pk=pk, then=Value(score)) for pk, score in scores.items()],
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    return queryset.filter(pk__in=list(scores)).annotate(**{RANK_ANNOTATION: rank})
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in for SearchFilter: ?search= goes through `search()` instead of
+    OR-ed icontains lookups over `search_fields`. Results are ranked by
+    relevance unless the client also passes ?ordering=.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search(queryset, " ".join(terms))
@@ -1,11 +1,11 @@
 from rest_framework import serializers
 from reviews.models import Review
 from .models import Destination, TourPackage, PackageImage
+from .pricing import price_breakdown
 from inventory.serializers import HotelSerializer, CarSerializer
 from inventory.models import Hotel, Car
 from django.utils import timezone
-from django.db.models import Avg
-from django.contrib.contenttypes.models import ContentType
+from django.db.models import Avg, Sum
 
 class PackageImageSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
@@ -96,6 +96,7 @@ class TourPackageSerializer(serializers.ModelSerializer):
             "inclusions",
             "exclusions",
             "max_capacity",
+            "seats_remaining",
             "is_active",
             "created_at",
             "updated_at",
@@ -122,6 +123,7 @@ class TourPackageSerializer(serializers.ModelSerializer):
         )
         read_only_fields = (
             "slug",
+            "seats_remaining",
             "created_at",
             "updated_at",
             "total_price",
@@ -136,15 +138,19 @@ class TourPackageSerializer(serializers.ModelSerializer):
         return getattr(obj.main_image, "url", None) if obj.main_image else None
 
     def get_total_price(self, obj):
-        if obj.hotel and hasattr(obj.hotel, "room_types") and obj.hotel.room_types.exists():
-            hotel_price = obj.hotel.room_types.first().base_price * obj.nights
+        if hasattr(obj, "first_room_price"):
+            room_price = obj.first_room_price
         else:
-            hotel_price = 0
-
-        car_price = (getattr(obj.car, "daily_rate", 0) or 0) * obj.car_days
-        subtotal = obj.base_price + hotel_price + car_price
-        commission_amount = (subtotal * obj.commission) / 100
-        return subtotal + commission_amount
+            room = obj.hotel.room_types.order_by("pk").first() if obj.hotel else None
+            room_price = room.base_price if room else None
+        return price_breakdown(
+            obj.base_price,
+            obj.commission,
+            room_rate=room_price,
+            nights=obj.nights,
+            car_rate=getattr(obj.car, "daily_rate", None),
+            car_days=obj.car_days,
+        )["total_price"]
 
     def get_is_expired(self, obj):
         if not obj.end_date:
@@ -152,38 +158,42 @@ class TourPackageSerializer(serializers.ModelSerializer):
         end_date = obj.end_date.date() if hasattr(obj.end_date, "date") else obj.end_date
         return end_date < timezone.now().date()
 
+    # Aggregates below come from TourPackageViewSet.get_queryset annotations;
+    # the fallbacks cover instances that were not loaded through it.
+    def _approved_reviews(self, obj):
+        if hasattr(obj, "approved_reviews"):
+            return obj.approved_reviews
+        return obj.reviews.filter(is_approved=True).select_related("user")
+
     def get_total_bookings(self, obj):
-        return obj.bookings.filter(status="CONFIRMED").count() if hasattr(obj, "bookings") else 0
+        if hasattr(obj, "confirmed_booking_count"):
+            return obj.confirmed_booking_count
+        return obj.bookings.filter(status="CONFIRMED").count()
 
     def get_total_commission_earned(self, obj):
-        if hasattr(obj, "bookings"):
-            confirmed_bookings = obj.bookings.filter(status="CONFIRMED")
-            total_sales = sum(b.total for b in confirmed_bookings)
-            return (total_sales * obj.commission) / 100
-        return 0
+        if hasattr(obj, "confirmed_sales"):
+            total_sales = obj.confirmed_sales
+        else:
+            total_sales = obj.bookings.filter(status="CONFIRMED").aggregate(s=Sum("total"))["s"] or 0
+        return (total_sales * obj.commission) / 100
 
     def get_reviews(self, obj):
-        content_type = ContentType.objects.get_for_model(TourPackage)
-        reviews_qs = Review.objects.filter(
-        content_type=content_type, object_id=obj.id, is_approved=True
-    )
         return [
-        {
-            "user": review.user.username,
-            "rating": review.rating,
-            "comment": review.comment,
-            "created_at": review.created_at,
-        }
-        for review in reviews_qs
-    ]
+            {
+                "user": review.user.username,
+                "rating": review.rating,
+                "comment": review.body,
+                "created_at": review.created_at,
+            }
+            for review in self._approved_reviews(obj)
+        ]
+
     def get_average_rating(self, obj):
-        content_type = ContentType.objects.get_for_model(TourPackage)
-        return Review.objects.filter(
-        content_type=content_type, object_id=obj.id, is_approved=True
-    ).aggregate(Avg('rating'))['rating__avg'] or 0
+        if hasattr(obj, "review_avg"):
+            return obj.review_avg or 0
+        return obj.reviews.filter(is_approved=True).aggregate(Avg("rating"))["rating__avg"] or 0
 
     def get_total_reviews(self, obj):
-        content_type = ContentType.objects.get_for_model(TourPackage)
-        return Review.objects.filter(
-        content_type=content_type, object_id=obj.id, is_approved=True
-    ).count()
\ No newline at end of file
+        if hasattr(obj, "review_count"):
+            return obj.review_count
+        return obj.reviews.filter(is_approved=True).count()
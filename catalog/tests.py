@@ -1,3 +1,134 @@
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+
+from booking import services
+from booking.models import Booking
+
+from .models import Destination, TourPackage
+
+backfill_seats_remaining = import_module("catalog.migrations.0013_tourpackage_seats_remaining").backfill_seats_remaining
+
+
+class SeatCounterTests(TestCase):
+    """TourPackage.seats_remaining and the booking flows that move it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="guest", email="guest@example.com")
+        cls.destination = Destination.objects.create(name="Maasai Mara", city="Narok", country="Kenya")
+
+    def setUp(self):
+        self.package = TourPackage.objects.create(
+            destination=self.destination, title="Safari", duration_days=3, base_price=Decimal("200"), max_capacity=5
+        )
+
+    def remaining(self):
+        return TourPackage.objects.values_list("seats_remaining", flat=True).get(pk=self.package.pk)
+
+    def book(self, guests):
+        return services.create_tour_package_booking(self.user, self.package.pk, guests=guests)
+
+    def test_new_package_starts_full(self):
+        self.assertEqual(self.remaining(), 5)
+
+    def test_claims_stop_at_capacity_and_releases_stop_at_max_capacity(self):
+        self.assertTrue(TourPackage.claim_seats(self.package, 3))
+        self.assertFalse(TourPackage.claim_seats(self.package, 3))
+        self.assertEqual(self.remaining(), 2)
+
+        TourPackage.release_seats({self.package.pk: 10})
+        self.assertEqual(self.remaining(), 5)
+
+    def test_booking_over_capacity_is_refused(self):
+        self.book(4)
+        with self.assertRaises(services.BookingError):
+            self.book(2)
+        self.assertEqual(self.remaining(), 1)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_save_never_writes_back_a_stale_counter(self):
+        stale = TourPackage.objects.get(pk=self.package.pk)
+        self.book(2)
+
+        stale.title = "Safari (updated)"
+        stale.save()
+        self.assertEqual(self.remaining(), 3)
+
+        stale.seats_remaining = 5
+        stale.save(update_fields=["title", "seats_remaining"])
+        self.assertEqual(self.remaining(), 3)
+
+    def test_max_capacity_change_shifts_the_counter(self):
+        stale = TourPackage.objects.get(pk=self.package.pk)
+        self.book(2)
+
+        stale.max_capacity = 8
+        stale.save()
+        self.assertEqual(self.remaining(), 6)
+
+        stale.max_capacity = 1
+        stale.save(update_fields=["max_capacity"])
+        self.assertEqual(self.remaining(), 0)
+
+    def test_capacity_added_to_an_uncounted_package_is_reconciled(self):
+        unlimited = TourPackage.objects.create(
+            destination=self.destination, title="Open tour", duration_days=1, base_price=Decimal("50")
+        )
+        services.create_tour_package_booking(self.user, unlimited.pk, guests=3)
+        self.assertIsNone(TourPackage.objects.get(pk=unlimited.pk).seats_remaining)
+
+        unlimited.max_capacity = 10
+        unlimited.save()
+        self.assertEqual(TourPackage.objects.get(pk=unlimited.pk).seats_remaining, 7)
+
+    def test_expiry_releases_seats_and_cancelling_afterwards_does_not_release_again(self):
+        booking = self.book(2)
+        other = self.book(1)
+        self.assertEqual(self.remaining(), 2)
+
+        Booking.objects.filter(pk=booking.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        self.assertEqual(services.expire_pending_bookings(), 1)
+        self.assertEqual(self.remaining(), 4)
+
+        services.cancel_booking(booking)
+        self.assertEqual(self.remaining(), 4)
+
+        services.cancel_booking(other)
+        self.assertEqual(self.remaining(), 5)
+
+    def test_paying_an_expired_booking_claims_its_seats_again(self):
+        booking = self.book(2)
+        Booking.objects.filter(pk=booking.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        services.expire_pending_bookings()
+
+        services.confirm_booking_on_payment(booking)
+        self.assertEqual(self.remaining(), 3)
+
+        services.cancel_booking(booking)
+        self.assertEqual(self.remaining(), 5)
+
+    def test_reconcile_agrees_with_the_migration_backfill(self):
+        confirmed = self.book(2)
+        services.confirm_booking_on_payment(confirmed)
+        self.book(1)
+        expired = self.book(1)
+        Booking.objects.filter(pk=expired.pk).update(status=Booking.Status.EXPIRED)
+        self.assertEqual(TourPackage.reconcile_seats(), 1)
+        reconciled = self.remaining()
+        self.assertEqual(reconciled, 2)
+
+        # Data as the old confirm logic left it: max_capacity lowered by the
+        # confirmed seats, and no counter yet.
+        TourPackage.objects.filter(pk=self.package.pk).update(max_capacity=3, seats_remaining=None)
+        backfill_seats_remaining(apps, None)
 
-# Create your tests here.
+        self.assertEqual(
+            TourPackage.objects.values_list("max_capacity", "seats_remaining").get(pk=self.package.pk), (5, reconciled)
+        )
+        self.assertEqual(TourPackage.reconcile_seats(), 0)
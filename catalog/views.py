@@ -6,23 +6,32 @@ from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied
 from inventory.models import RoomType, Hotel, Car, AvailabilitySlot
 from .models import Destination, TourPackage
+from .geo import nearby_destinations
+from .pricing import QuoteError, quote
+from .search import FullTextSearchFilter
 from .serializers import DestinationSerializer, TourPackageSerializer
-from inventory.serializers import RoomTypeSerializer
+from inventory.serializers import CarSerializer, HotelSerializer, RoomTypeSerializer
 from booking.models import Booking  
-from reviews.models import Review    
-from django.db.models import Sum
+from reviews.models import Review, RatingSummary
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+NEARBY_DEFAULT_RADIUS_KM = 50
+NEARBY_MAX_RADIUS_KM = 500
+NEARBY_MAX_RESULTS = 100
+
 
 class DestinationViewSet(viewsets.ModelViewSet):
     queryset = Destination.objects.all()
     serializer_class = DestinationSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
+    filter_backends = (FullTextSearchFilter, filters.OrderingFilter)
     search_fields = ("name", "country", "city")
     ordering_fields = ("name", "country")
+    ordering = ("name",)
     lookup_field = "slug"
 
     def list(self, request, *args, **kwargs):
@@ -34,15 +43,112 @@ class DestinationViewSet(viewsets.ModelViewSet):
         logger.info("Destination detail requested: slug=%s by user=%s", slug, request.user)
         return super().retrieve(request, *args, **kwargs)
 
+    @action(detail=False, methods=["get"])
+    def nearby(self, request):
+        """
+        Destinations within ?radius_km= (default 50, max 500) of ?lat=&lng=,
+        nearest first, with the active hotels in the same city and the
+        available cars at each. Everything comes from our own tables.
+        """
+        try:
+            lat = float(request.query_params["lat"])
+            lng = float(request.query_params["lng"])
+            radius_km = float(request.query_params.get("radius_km", NEARBY_DEFAULT_RADIUS_KM))
+            limit = int(request.query_params.get("limit", 20))
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "lat and lng are required; lat, lng, radius_km and limit must be numbers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180) or radius_km <= 0:
+            return Response({"detail": "lat/lng out of range or radius_km not positive"}, status=status.HTTP_400_BAD_REQUEST)
+        radius_km = min(radius_km, NEARBY_MAX_RADIUS_KM)
+        limit = max(1, min(limit, NEARBY_MAX_RESULTS))
+
+        destinations = nearby_destinations(lat, lng, radius_km, limit=limit)
+        if not destinations:
+            return Response([])
+
+        # Hotels only carry city/country, so they are matched to destinations on those.
+        # Several destinations can share a city, and each of them lists its hotels.
+        by_place = {}
+        place_filter = Q()
+        for d in destinations:
+            by_place.setdefault((d.city.lower(), d.country.lower()), []).append(d.pk)
+            place_filter |= Q(city__iexact=d.city, country__iexact=d.country)
+        hotels = {}
+        for hotel in Hotel.objects.filter(place_filter, is_active=True).prefetch_related("room_types"):
+            for pk in by_place.get((hotel.city.lower(), hotel.country.lower()), ()):
+                hotels.setdefault(pk, []).append(hotel)
+        cars = {}
+        for car in Car.objects.filter(destination__in=[d.pk for d in destinations], available=True).select_related("destination"):
+            cars.setdefault(car.destination_id, []).append(car)
+
+        context = self.get_serializer_context()
+        data = []
+        for d in destinations:
+            entry = self.get_serializer(d).data
+            entry["distance_km"] = d.distance_km
+            entry["hotels"] = HotelSerializer(hotels.get(d.pk, []), many=True, context=context).data
+            entry["cars"] = CarSerializer(cars.get(d.pk, []), many=True, context=context).data
+            data.append(entry)
+        return Response(data)
+
 
 class TourPackageViewSet(viewsets.ModelViewSet):
     queryset = TourPackage.objects.filter(is_active=True)
     serializer_class = TourPackageSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
-    search_fields = ("title", "destination__name")
-    ordering_fields = ("base_price", "duration_days", "created_at")
+    filter_backends = (FullTextSearchFilter, filters.OrderingFilter)
+    search_fields = ("title", "summary", "destination__name")
+    ordering_fields = ("base_price", "duration_days", "created_at", "review_avg", "review_count")
+    ordering = ("-created_at",)
     lookup_field = "id"
+
+    def get_queryset(self):
+        """
+        Everything TourPackageSerializer reports per package is computed in
+        the list query: review stats read from RatingSummary, booking stats
+        as correlated subqueries, related rows via select_related and
+        prefetch_related. ?ordering=review_avg sorts by rating.
+        """
+        confirmed_bookings = Booking.objects.filter(
+            package=OuterRef("pk"), status=Booking.Status.CONFIRMED
+        ).values("package")
+        money = DecimalField(max_digits=12, decimal_places=2)
+
+        return (
+            super()
+            .get_queryset()
+            .select_related("destination", "organizer", "hotel", "car", "car__destination")
+            .prefetch_related(
+                "images",
+                "hotel__room_types",
+                Prefetch(
+                    "reviews",
+                    queryset=Review.objects.filter(is_approved=True).select_related("user"),
+                    to_attr="approved_reviews",
+                ),
+            )
+            .annotate(
+                review_count=Coalesce(RatingSummary.subquery_for(TourPackage, "count"), Value(0)),
+                review_avg=Coalesce(RatingSummary.subquery_for(TourPackage, "average"), Value(0.0)),
+                confirmed_booking_count=Coalesce(
+                    Subquery(confirmed_bookings.annotate(n=Count("id")).values("n"), output_field=IntegerField()),
+                    Value(0),
+                ),
+                confirmed_sales=Coalesce(
+                    Subquery(confirmed_bookings.annotate(s=Sum("total")).values("s"), output_field=money),
+                    Value(0),
+                    output_field=money,
+                ),
+                first_room_price=Subquery(
+                    RoomType.objects.filter(hotel=OuterRef("hotel")).order_by("pk").values("base_price")[:1],
+                    output_field=money,
+                ),
+            )
+        )
+
     def _user_can_modify(self, user):
         return user.is_staff or user.is_organizer()
     def create(self, request, *args, **kwargs):
@@ -109,40 +215,34 @@ class TourPackageViewSet(viewsets.ModelViewSet):
         return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], permission_classes=[permissions.AllowAny])
-    def calculate_price(self, request, slug=None):
-        logger.info("Price calculation request for package slug=%s | payload=%s", slug, request.data)
-        package = get_object_or_404(TourPackage, slug=slug)
-        hotel_id = request.data.get("hotel_id")
-        car_id = request.data.get("car_id")
-        nights = int(request.data.get("nights", 1))
-        car_days = int(request.data.get("car_days", 1))
-        commission = float(request.data.get("commission", 0))  
-
-        room_cost = 0
-        car_cost = 0
-
-        if hotel_id:
-            hotel = get_object_or_404(Hotel, id=hotel_id)
-            room = hotel.room_types.first()
-            if room:
-                room_cost = room.base_price * nights
-
-        if car_id:
-            car = get_object_or_404(Car, id=car_id)
-            car_cost = car.daily_rate * car_days
-
-        subtotal = package.base_price + room_cost + car_cost
-        total_price = subtotal + (subtotal * commission / 100)
+    def calculate_price(self, request, id=None):
+        """
+        Quote the package for the given nights, car_days and room_type_id
+        (hotel_id/car_id swap the package's own). Served from cached
+        component prices, so it is cheap enough to call on every slider move.
+        """
+        logger.info("Price calculation request for package id=%s | payload=%s", id, request.data)
+        try:
+            params = {
+                name: int(request.data[name])
+                for name in ("nights", "car_days", "room_type_id", "hotel_id", "car_id")
+                if request.data.get(name) not in (None, "")
+            }
+        except (TypeError, ValueError):
+            return Response({"detail": "nights, car_days and ids must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get("nights", 0) < 0 or params.get("car_days", 0) < 0:
+            return Response({"detail": "nights and car_days cannot be negative"}, status=status.HTTP_400_BAD_REQUEST)
 
-        result = {
-            "package_base": float(package.base_price),
-            "room_cost": float(room_cost),
-            "car_cost": float(car_cost),
-            "commission_percent": commission,
-            "total_price": float(total_price),
-        }
+        try:
+            result = quote(int(id), **params) if str(id).isdigit() else None
+        except QuoteError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if result is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        logger.info("Price calculated for package slug=%s | result=%s", slug, result)
+        for key in ("package_base", "room_cost", "car_cost", "subtotal", "commission_percent", "commission", "total_price"):
+            result[key] = float(result[key])
+        logger.info("Price calculated for package id=%s | result=%s", id, result)
         return Response(result)
     @action(detail=True, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def agent_details(self, request, slug=None):
@@ -57,6 +57,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'cloudinary',
     'rest_framework.authtoken',
@@ -97,8 +98,11 @@ CORS_ALLOW_HEADERS = [
     "user-agent",
     "x-csrftoken",
     "x-requested-with",
+    "idempotency-key",
 ]
 
+CORS_EXPOSE_HEADERS = ["idempotent-replayed"]
+
 
 ROOT_URLCONF = 'globetrotter.urls'
 CORS_ALLOWED_ORIGINS = [
@@ -194,6 +198,8 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_PAGINATION_CLASS": "pagination.KeysetPagination",
+    "PAGE_SIZE": int(os.getenv("PAGE_SIZE", 20)),
 }
 
 
@@ -216,8 +222,6 @@ SPECTACULAR_SETTINGS = {
 }
 """
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
-    "PAGE_SIZE": int(os.getenv("PAGE_SIZE", 20)),
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
@@ -226,6 +230,62 @@ REST_FRAMEWORK = {
 }
 """
 
+# Minutes an unpaid PENDING booking keeps its rooms, cars and seats
+BOOKING_HOLD_MINUTES = int(os.getenv("BOOKING_HOLD_MINUTES", 15))
+
+# Hours a booking Idempotency-Key replays its first response (booking/idempotency.py)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", 24))
+# Seconds after which an unfinished claim (its worker died) is dropped instead of answering 409
+IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS = int(os.getenv("IDEMPOTENCY_IN_PROGRESS_TIMEOUT_SECONDS", 300))
+
+# Outbox delivery: adapter per channel, worker threads per channel, retry policy
+NOTIFICATIONS = {
+    "adapters": {
+        "SMS": os.getenv("NOTIFICATIONS_SMS_ADAPTER", "twilio"),
+        "EMAIL": os.getenv("NOTIFICATIONS_EMAIL_ADAPTER", "sendgrid"),
+        "PUSH": os.getenv("NOTIFICATIONS_PUSH_ADAPTER", "fcm"),
+    },
+    "concurrency": {"SMS": 4, "EMAIL": 4, "PUSH": 8},
+    "max_attempts": int(os.getenv("NOTIFICATIONS_MAX_ATTEMPTS", 5)),
+    "retry_base_seconds": 30,
+    # Also drain from a background thread right after the confirming commit
+    "drain_on_commit": os.getenv("NOTIFICATIONS_DRAIN_ON_COMMIT", "False") == "True",
+}
+
+# Providers queried concurrently by provider="all" flight searches
+FLIGHT_SEARCH = {
+    "providers": [p.strip() for p in os.getenv("FLIGHT_SEARCH_PROVIDERS", "amadeus,duffel").split(",") if p.strip()],
+    "deadline_seconds": float(os.getenv("FLIGHT_SEARCH_DEADLINE_SECONDS", 8)),
+    "max_workers": int(os.getenv("FLIGHT_SEARCH_MAX_WORKERS", 8)),
+    # Search-result cache: fresh for cache_ttl_seconds, then served stale while
+    # refreshing for cache_stale_seconds; empty results live negative_ttl_seconds.
+    # The two windows together must not exceed the 30 minute offer lifetime
+    # (checked at startup, inventory.E001)
+    "cache_ttl_seconds": int(os.getenv("FLIGHT_CACHE_TTL_SECONDS", 600)),
+    "cache_stale_seconds": int(os.getenv("FLIGHT_CACHE_STALE_SECONDS", 1200)),
+    "negative_ttl_seconds": int(os.getenv("FLIGHT_CACHE_NEGATIVE_TTL_SECONDS", 120)),
+}
+
+# Package price components (catalog/pricing.py). Point "alias" at a shared
+# cache in CACHES so invalidations reach every worker; on a process-local
+# cache entries only live local_ttl_seconds
+PRICING_CACHE = {
+    "alias": os.getenv("PRICING_CACHE_ALIAS", "default"),
+    "ttl_seconds": int(os.getenv("PRICING_CACHE_TTL_SECONDS", 3600)),
+    "local_ttl_seconds": int(os.getenv("PRICING_CACHE_LOCAL_TTL_SECONDS", 60)),
+}
+
+# In-process cache in front of the maps adapters (adapters/maps/cache.py)
+MAPS_CACHE = {
+    "enabled": os.getenv("MAPS_CACHE_ENABLED", "True") == "True",
+    "ttl_seconds": int(os.getenv("MAPS_CACHE_TTL_SECONDS", 30 * 24 * 3600)),
+    "negative_ttl_seconds": int(os.getenv("MAPS_CACHE_NEGATIVE_TTL_SECONDS", 3600)),
+    "places_ttl_seconds": int(os.getenv("MAPS_CACHE_PLACES_TTL_SECONDS", 24 * 3600)),
+    "max_entries": int(os.getenv("MAPS_CACHE_MAX_ENTRIES", 10000)),
+    # Decimal places kept for reverse-geocode keys; 4 is ~11 m
+    "reverse_precision": 4,
+}
+
 ADAPTERS = {
     # payments
     "payments.stripe": {
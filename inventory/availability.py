@@ -0,0 +1,116 @@
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, Min
+
+from .models import AvailabilitySlot
+
+logger = logging.getLogger(__name__)
+
+
+def range_days(start_date: date, end_date: date) -> int:
+    """Number of nights/days in the half-open range [start_date, end_date)."""
+    return max(0, (end_date - start_date).days)
+
+
+def date_range(start_date: date, end_date: date) -> List[date]:
+    return [start_date + timedelta(days=i) for i in range(range_days(start_date, end_date))]
+
+
+def _slots(content_type: ContentType, object_ids: Iterable[int], start_date: date, end_date: date):
+    return AvailabilitySlot.objects.filter(
+        content_type=content_type,
+        object_id__in=list(object_ids),
+        date__gte=start_date,
+        date__lt=end_date,
+    )
+
+
+def min_available(
+    content_type: ContentType,
+    defaults: Dict[int, int],
+    start_date: date,
+    end_date: date,
+) -> Dict[int, int]:
+    """
+    Minimum available units per object over [start_date, end_date).
+
+    `defaults` maps object id -> units assumed for days that have no
+    AvailabilitySlot row. All objects are answered with a single
+    aggregated query grouped by object_id.
+    """
+    if not defaults:
+        return {}
+
+    days = range_days(start_date, end_date)
+    rows = (
+        _slots(content_type, defaults.keys(), start_date, end_date)
+        .values("object_id")
+        .annotate(min_available=Min("available"), slot_days=Count("id"))
+    )
+
+    result = dict(defaults)
+    for row in rows:
+        object_id = row["object_id"]
+        lowest = row["min_available"]
+        # Days without a slot fall back to the default capacity.
+        if row["slot_days"] < days:
+            lowest = min(lowest, defaults[object_id])
+        result[object_id] = lowest
+    return result
+
+
+def daily_available(
+    content_type: ContentType,
+    defaults: Dict[int, int],
+    start_date: date,
+    end_date: date,
+) -> Dict[int, List[int]]:
+    """
+    Per-object day array of available units, index 0 being start_date.
+    """
+    if not defaults:
+        return {}
+
+    days = range_days(start_date, end_date)
+    result = {object_id: [units] * days for object_id, units in defaults.items()}
+    rows = _slots(content_type, defaults.keys(), start_date, end_date).values_list(
+        "object_id", "date", "available"
+    )
+    for object_id, day, available in rows:
+        result[object_id][(day - start_date).days] = available
+    return result
+
+
+def availability_summary(
+    model,
+    defaults: Dict[int, int],
+    start_date: date,
+    end_date: date,
+    include_dates: bool = False,
+) -> Dict[int, Dict[str, Optional[object]]]:
+    """
+    Availability for many objects of one model over [start_date, end_date).
+
+    Returns {object_id: {"min_available": int, "dates": [...] | None}}.
+    The per-day breakdown is only built when `include_dates` is set; the
+    minimum is then derived from the day array instead of a second query.
+    """
+    content_type = ContentType.objects.get_for_model(model)
+
+    if not include_dates:
+        return {
+            object_id: {"min_available": lowest, "dates": None}
+            for object_id, lowest in min_available(content_type, defaults, start_date, end_date).items()
+        }
+
+    iso_days = [d.isoformat() for d in date_range(start_date, end_date)]
+    summary = {}
+    for object_id, units in daily_available(content_type, defaults, start_date, end_date).items():
+        summary[object_id] = {
+            "min_available": min(units) if units else None,
+            "dates": [{"date": d, "available": a} for d, a in zip(iso_days, units)],
+        }
+    return summary
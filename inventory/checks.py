@@ -0,0 +1,21 @@
+from django.core import checks
+
+from .flight_cache import max_age_seconds
+from .flights import OFFER_TTL
+
+
+@checks.register()
+def flight_cache_within_offer_ttl(app_configs, **kwargs):
+    """A cached search must expire before the offers in it do."""
+    max_age = max_age_seconds()
+    offer_ttl = int(OFFER_TTL.total_seconds())
+    if max_age <= offer_ttl:
+        return []
+    return [
+        checks.Error(
+            f"FLIGHT_SEARCH cache_ttl_seconds + cache_stale_seconds is {max_age}s, longer than "
+            f"the {offer_ttl}s flight offers live; stale hits would serve expired offers.",
+            hint="Lower FLIGHT_CACHE_TTL_SECONDS or FLIGHT_CACHE_STALE_SECONDS.",
+            id="inventory.E001",
+        )
+    ]
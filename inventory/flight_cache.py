@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "flight-search"
+
+DEFAULT_TTL_SECONDS = 600
+# Cached payloads carry each offer's "expired" flag as of fetch time, so an
+# entry must not outlive the offers in it: ttl + stale <= flights.OFFER_TTL
+# (enforced by the inventory system check).
+DEFAULT_STALE_SECONDS = 1200
+DEFAULT_NEGATIVE_TTL_SECONDS = 120
+REFRESH_LOCK_SECONDS = 60
+
+HIT, STALE, MISS = "hit", "stale", "miss"
+
+
+def _setting(name: str, default: int) -> int:
+    return int(getattr(settings, "FLIGHT_SEARCH", {}).get(name, default))
+
+
+def max_age_seconds() -> int:
+    """How long a non-empty entry can be served, fresh or stale."""
+    return _setting("cache_ttl_seconds", DEFAULT_TTL_SECONDS) + _setting("cache_stale_seconds", DEFAULT_STALE_SECONDS)
+
+
+def search_key(
+    provider: str,
+    origin: Optional[str],
+    destination: Optional[str],
+    departure_date: Optional[str],
+    passengers: int = 1,
+    cabin: str = "ECONOMY",
+) -> str:
+    parts = [
+        (provider or "").lower(),
+        (origin or "").upper(),
+        (destination or "").upper(),
+        str(departure_date or ""),
+        str(int(passengers or 1)),
+        (cabin or "ECONOMY").upper(),
+    ]
+    return f"{KEY_PREFIX}:{'|'.join(parts)}"
+
+
+def _ttl(data: List[Any]) -> int:
+    if data:
+        return _setting("cache_ttl_seconds", DEFAULT_TTL_SECONDS)
+    return _setting("negative_ttl_seconds", DEFAULT_NEGATIVE_TTL_SECONDS)
+
+
+def _store(key: str, data: List[Any]) -> None:
+    ttl = _ttl(data)
+    # Empty results are not served stale: the route may have just opened up.
+    timeout = max_age_seconds() if data else ttl
+    cache.set(key, {"data": data, "fetched_at": time.time()}, timeout=timeout)
+
+
+def _refresh_in_background(key: str, fetch: Callable[[], List[Any]]) -> None:
+    lock_key = f"{key}:refreshing"
+    if not cache.add(lock_key, 1, timeout=REFRESH_LOCK_SECONDS):
+        return
+
+    def run():
+        try:
+            _store(key, fetch())
+        except Exception as exc:
+            logger.warning("Background refresh of %s failed: %s", key, exc)
+        finally:
+            cache.delete(lock_key)
+            connections.close_all()
+
+    threading.Thread(target=run, name="flight-cache-refresh", daemon=True).start()
+
+
+def get_or_fetch(
+    key: str,
+    fetch: Callable[[], List[Any]],
+    force_refresh: bool = False,
+) -> Tuple[List[Any], str]:
+    """
+    Serve a search result from cache, calling `fetch` only when needed.
+
+    Fresh entries are returned as-is. Entries past their TTL but inside the
+    stale window are returned immediately while one background thread
+    re-runs `fetch`. Empty results are cached for a shorter negative TTL so
+    repeated searches for a dead route don't reach the provider.
+    Returns (data, "hit" | "stale" | "miss").
+    """
+    entry = None if force_refresh else cache.get(key)
+    if entry is not None:
+        age = time.time() - entry["fetched_at"]
+        if age < _ttl(entry["data"]):
+            return entry["data"], HIT
+        if entry["data"]:
+            _refresh_in_background(key, fetch)
+            return entry["data"], STALE
+
+    data = fetch()
+    _store(key, data)
+    return data, MISS
@@ -0,0 +1,119 @@
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from adapters.flights.fanout import first_last_segments
+from .models import Flight
+
+logger = logging.getLogger(__name__)
+
+OFFER_TTL = timedelta(minutes=30)
+
+# Columns refreshed when a provider returns an offer we already stored.
+UPSERT_FIELDS = [
+    "origin",
+    "destination",
+    "flight_number",
+    "airline",
+    "departure_time",
+    "arrival_time",
+    "seats_available",
+    "departure_date",
+    "price",
+    "currency",
+    "expires_at",
+]
+
+
+def _day_bounds(day: date):
+    start = datetime.combine(day, time.min)
+    if settings.USE_TZ:
+        start = timezone.make_aware(start)
+    return start, start + timedelta(days=1)
+
+
+def cached_flights(origin: Optional[str], destination: Optional[str], departure_date: Optional[str]):
+    """
+    Unexpired stored offers for a route/day. Codes are stored upper-case, so
+    exact matches and a departure_time range keep the composite index usable.
+    """
+    qs = Flight.objects.filter(expires_at__gt=timezone.now())
+    if origin:
+        qs = qs.filter(origin=origin.upper())
+    if destination:
+        qs = qs.filter(destination=destination.upper())
+    day = parse_date(departure_date) if isinstance(departure_date, str) else departure_date
+    if day:
+        start, end = _day_bounds(day)
+        qs = qs.filter(departure_time__gte=start, departure_time__lt=end)
+    return qs.order_by("departure_time", "id")
+
+
+def flight_from_offer(offer: Dict[str, Any], provider: str, expires_at: datetime) -> Optional[Flight]:
+    """Normalize one provider offer into an unsaved Flight, or None if unusable."""
+    first_segment, last_segment = first_last_segments(offer)
+    if not first_segment:
+        return None
+
+    origin_code = first_segment.get("departure", {}).get("iataCode")
+    destination_code = last_segment.get("arrival", {}).get("iataCode")
+    offer_id = offer.get("id") or offer.get("offer_id")
+    if not origin_code or not destination_code or not offer_id:
+        return None
+
+    departure_time_str = first_segment.get("departure", {}).get("at")
+    arrival_time_str = last_segment.get("arrival", {}).get("at")
+    departure_time = parse_datetime(departure_time_str) if departure_time_str else None
+    arrival_time = parse_datetime(arrival_time_str) if arrival_time_str else None
+
+    price_info = offer.get("price")
+    if isinstance(price_info, dict):
+        price = price_info.get("total") or 0
+        currency = price_info.get("currency") or "USD"
+    else:
+        price = price_info or 0
+        currency = offer.get("currency") or "USD"
+
+    return Flight(
+        provider=offer.get("provider") or provider,
+        offer_id=offer_id,
+        flight_number=first_segment.get("number") or offer_id,
+        airline=first_segment.get("carrierCode"),
+        origin=origin_code.upper(),
+        destination=destination_code.upper(),
+        departure_time=departure_time,
+        arrival_time=arrival_time,
+        departure_date=departure_time.date() if departure_time else None,
+        seats_available=offer.get("numberOfBookableSeats", 0),
+        price=price,
+        currency=currency,
+        expires_at=expires_at,
+    )
+
+
+def upsert_offers(offers: Iterable[Dict[str, Any]], provider: str) -> List[Flight]:
+    """
+    Persist provider offers with a single INSERT ... ON CONFLICT DO UPDATE
+    keyed on (provider, offer_id). Offers repeated within one batch keep
+    the last occurrence, since a row can only be updated once per statement.
+    """
+    expires_at = timezone.now() + OFFER_TTL
+    flights: Dict[tuple, Flight] = {}
+    for offer in offers:
+        flight = flight_from_offer(offer, provider, expires_at)
+        if flight is not None:
+            flights[(flight.provider, flight.offer_id)] = flight
+
+    if not flights:
+        return []
+
+    return Flight.objects.bulk_create(
+        list(flights.values()),
+        update_conflicts=True,
+        unique_fields=["provider", "offer_id"],
+        update_fields=UPSERT_FIELDS,
+    )
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from booking.services import expire_pending_bookings
+
+
+class Command(BaseCommand):
+    help = "Expire unpaid PENDING bookings whose hold has lapsed and release their inventory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Bookings expired per transaction")
+        parser.add_argument("--loop", action="store_true", help="Keep running as a sweeper")
+        parser.add_argument("--interval", type=int, default=60, help="Seconds between sweeps with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            count = expire_pending_bookings(batch_size=options["batch_size"])
+            self.stdout.write(
+                self.style.SUCCESS(f"Expired {count} booking hold(s).")
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+
+"""to release expired booking holds once (e.g. from cron), run:
+
+python manage.py release_expired_holds
+
+or keep a sweeper running:
+
+python manage.py release_expired_holds --loop --interval 60
+
+"""
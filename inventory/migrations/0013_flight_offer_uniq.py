@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:25
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def drop_duplicate_offers(apps, schema_editor):
+    """Keep only the newest row per (provider, offer_id) before adding the constraint."""
+    Flight = apps.get_model("inventory", "Flight")
+    duplicates = (
+        Flight.objects.values("provider", "offer_id")
+        .annotate(rows=Count("id"), keep=Max("id"))
+        .filter(rows__gt=1)
+    )
+    for dup in duplicates:
+        Flight.objects.filter(provider=dup["provider"], offer_id=dup["offer_id"]).exclude(id=dup["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0012_reservation'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_offers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['origin', 'destination', 'departure_time'], name='inventory_f_origin_851122_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=models.UniqueConstraint(fields=('provider', 'offer_id'), name='flight_provider_offer_uniq'),
+        ),
+    ]
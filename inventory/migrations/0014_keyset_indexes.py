@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0013_flight_offer_uniq'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['departure_time', 'id'], name='inventory_f_departu_cb5e10_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['name', 'id'], name='inventory_h_name_09856e_idx'),
+        ),
+    ]
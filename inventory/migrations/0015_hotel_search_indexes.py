@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:52
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# The indexes catalog.search.search_indexes() built for Hotel when this
+# migration was written, frozen so later edits to the search settings do
+# not change what this migration creates or drops.
+SEARCH_INDEXES = [
+    GinIndex(
+        SearchVector("name", weight="A", config="simple")
+        + SearchVector("city", "country", weight="B", config="simple")
+        + SearchVector("address", weight="C", config="simple"),
+        name="inventory_hotel_search_gin",
+    ),
+    GinIndex(OpClass("city", name="gin_trgm_ops"), name="inventory_hotel_city_trgm"),
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    """GIN expression indexes are PostgreSQL-only; other backends search in Python."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Hotel = apps.get_model("inventory", "Hotel")
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Hotel, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Hotel = apps.get_model("inventory", "Hotel")
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Hotel, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0014_keyset_indexes'),
+        # pg_trgm is created there
+        ('catalog', '0011_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
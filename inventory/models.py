@@ -32,7 +32,11 @@ class Hotel(models.Model):
 
     class Meta:
         ordering = ["name"]
-        indexes = [models.Index(fields=["country","city","is_active"])]
+        indexes = [
+            models.Index(fields=["country","city","is_active"]),
+            # Keyset pagination walks (name, id)
+            models.Index(fields=["name", "id"]),
+        ]
 
     def __str__(self): 
         return self.name
@@ -104,6 +108,29 @@ class AvailabilitySlot(models.Model):
     class Meta:
         unique_together = ("content_type","object_id","date")
         indexes = [models.Index(fields=["date"])]
+
+
+class Reservation(models.Model):
+    """
+    Ledger entry for units a booking took out of AvailabilitySlot over
+    [start_date, end_date). Released entries keep their row for auditing.
+    """
+    booking = models.ForeignKey("booking.Booking", on_delete=models.CASCADE, related_name="reservations")
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    start_date = models.DateField()
+    end_date = models.DateField()
+    quantity = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    released_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["booking", "released_at"])]
+
+    def __str__(self):
+        return f"Reservation {self.pk}: {self.quantity} x {self.content_type_id}:{self.object_id} ({self.start_date} → {self.end_date})"
 # inventory/models.py
 from django.db import models
 from decimal import Decimal
@@ -131,6 +158,15 @@ class Flight(models.Model):
     expires_at = models.DateTimeField(default=default_expiry)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["provider", "offer_id"], name="flight_provider_offer_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["origin", "destination", "departure_time"]),
+            models.Index(fields=["departure_time", "id"]),
+        ]
+
     def is_expired(self):
         return timezone.now() > self.expires_at
 
@@ -0,0 +1,125 @@
+import logging
+from datetime import date
+from typing import Iterable, List, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .availability import date_range, range_days
+from .models import AvailabilitySlot, Car, Reservation, RoomType
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationError(Exception):
+    pass
+
+
+def default_units(obj) -> int:
+    """Units assumed for a day that has no AvailabilitySlot yet."""
+    if isinstance(obj, RoomType):
+        return obj.quantity
+    if isinstance(obj, Car):
+        return 1 if obj.available else 0
+    return 0
+
+
+def is_reservable(obj) -> bool:
+    return isinstance(obj, (RoomType, Car))
+
+
+def _missing_slots(content_type: ContentType, obj, start_date: date, end_date: date) -> List[AvailabilitySlot]:
+    units = default_units(obj)
+    return [
+        AvailabilitySlot(content_type=content_type, object_id=obj.pk, date=day, available=units)
+        for day in date_range(start_date, end_date)
+    ]
+
+
+@transaction.atomic
+def reserve(booking, obj, start_date: date, end_date: date, quantity: int = 1) -> Reservation:
+    """
+    Take `quantity` units of `obj` for every day in [start_date, end_date).
+
+    The decrement is a single conditional UPDATE over the range; if any
+    day lacks capacity the savepoint is rolled back and nothing is taken.
+    Concurrent bookings only contend on the slot rows they share.
+    """
+    return reserve_many(booking, [(obj, start_date, end_date, quantity)])[0]
+
+
+@transaction.atomic
+def reserve_many(booking, requests: Iterable[Tuple[object, date, date, int]]) -> List[Reservation]:
+    """
+    reserve() for several (obj, start_date, end_date, quantity) at once, all
+    or nothing. Missing slots for every item go in with one insert and the
+    reservations with another, leaving one conditional UPDATE per item.
+    """
+    requests = list(requests)
+    slots = []
+    for obj, start_date, end_date, quantity in requests:
+        if range_days(start_date, end_date) == 0:
+            raise ReservationError("end_date must be after start_date")
+        if quantity < 1:
+            raise ReservationError("quantity must be at least 1")
+        slots.extend(_missing_slots(ContentType.objects.get_for_model(obj), obj, start_date, end_date))
+    AvailabilitySlot.objects.bulk_create(slots, ignore_conflicts=True)
+
+    reservations = []
+    for obj, start_date, end_date, quantity in requests:
+        content_type = ContentType.objects.get_for_model(obj)
+        updated = AvailabilitySlot.objects.filter(
+            content_type=content_type,
+            object_id=obj.pk,
+            date__gte=start_date,
+            date__lt=end_date,
+            available__gte=quantity,
+        ).update(available=F("available") - quantity)
+
+        if updated != range_days(start_date, end_date):
+            raise ReservationError(
+                f"{obj} is not available for {quantity} unit(s) between {start_date} and {end_date}"
+            )
+        reservations.append(Reservation(
+            booking=booking,
+            content_type=content_type,
+            object_id=obj.pk,
+            start_date=start_date,
+            end_date=end_date,
+            quantity=quantity,
+        ))
+
+    return Reservation.objects.bulk_create(reservations)
+
+
+def _restore(reservation: Reservation) -> None:
+    AvailabilitySlot.objects.filter(
+        content_type_id=reservation.content_type_id,
+        object_id=reservation.object_id,
+        date__gte=reservation.start_date,
+        date__lt=reservation.end_date,
+    ).update(available=F("available") + reservation.quantity)
+
+
+@transaction.atomic
+def release_bookings(booking_ids: Iterable[int]) -> int:
+    """Give back every unreleased reservation held by the given bookings."""
+    reservations = list(
+        Reservation.objects.select_for_update()
+        .filter(booking_id__in=list(booking_ids), released_at__isnull=True)
+    )
+    if not reservations:
+        return 0
+
+    for reservation in reservations:
+        _restore(reservation)
+
+    Reservation.objects.filter(pk__in=[r.pk for r in reservations]).update(released_at=timezone.now())
+    logger.debug("Released %s reservation(s)", len(reservations))
+    return len(reservations)
+
+
+def release_booking(booking) -> int:
+    return release_bookings([booking.pk])
@@ -1,3 +1,128 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from booking.models import Booking
+from catalog.models import Destination
+
+from .models import AvailabilitySlot, Car, Hotel, Reservation, RoomType
+from .reservations import ReservationError, release_booking, reserve, reserve_many
+
+
+class NullableOrderingPaginationTests(TestCase):
+    """Cursor pages over a nullable ordering field (Hotel.rating)."""
+
+    url = "/api/v1/inventory/hotels/"
+
+    @classmethod
+    def setUpTestData(cls):
+        ratings = [None, Decimal("4.5"), None, Decimal("3.0"), Decimal("4.5"), None, Decimal("2.0"), None, Decimal("5.0")]
+        cls.hotels = [
+            Hotel.objects.create(name=f"Hotel {i}", city="Nairobi", country="Kenya", rating=rating)
+            for i, rating in enumerate(ratings)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append([hotel["id"] for hotel in response.data["results"]])
+            url = response.data[link]
+        return pages
+
+    def expected(self, descending):
+        rated = sorted((h for h in self.hotels if h.rating is not None), key=lambda h: (h.rating, h.pk))
+        unrated = sorted((h for h in self.hotels if h.rating is None), key=lambda h: h.pk)
+        ids = [h.pk for h in rated + unrated]
+        return list(reversed(ids)) if descending else ids
+
+    def test_walks_every_page_in_both_directions(self):
+        for ordering in ("rating", "-rating"):
+            with self.subTest(ordering=ordering):
+                forward = self.walk(f"{self.url}?ordering={ordering}&page_size=2", "next")
+                self.assertEqual(sum(forward, []), self.expected(ordering.startswith("-")))
+
+                # Back from the last page via the previous links.
+                last = self.client.get(f"{self.url}?ordering={ordering}&page_size=2")
+                url = last.data["next"]
+                while url:
+                    last = self.client.get(url)
+                    url = last.data["next"]
+                backward = self.walk(last.data["previous"], "previous")
+                self.assertEqual(sum(reversed(backward), []), sum(forward[:-1], []))
+
+
+class ReservationTests(TestCase):
+    """reserve_many / release_booking keep AvailabilitySlot from being oversold."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="guest", email="guest@example.com")
+        hotel = Hotel.objects.create(name="Lodge", city="Nairobi", country="Kenya")
+        cls.room = RoomType.objects.create(hotel=hotel, name="Double", base_price=Decimal("100"), quantity=2)
+        destination = Destination.objects.create(name="Nairobi", city="Nairobi", country="Kenya")
+        cls.car = Car.objects.create(
+            destination=destination, make="Toyota", model="Corolla", category="sedan", daily_rate=Decimal("40")
+        )
+
+    def booking(self):
+        return Booking.objects.create(user=self.user, total=Decimal("0"))
+
+    def available(self, obj):
+        return dict(
+            AvailabilitySlot.objects.filter(content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk)
+            .values_list("date", "available")
+        )
+
+    def test_failed_multi_day_reservation_takes_nothing(self):
+        reserve(self.booking(), self.room, date(2030, 1, 2), date(2030, 1, 3), quantity=2)
+        before = self.available(self.room)
+
+        booking = self.booking()
+        with self.assertRaises(ReservationError):
+            reserve_many(booking, [
+                (self.car, date(2030, 1, 1), date(2030, 1, 4), 1),
+                (self.room, date(2030, 1, 1), date(2030, 1, 4), 1),
+            ])
+
+        self.assertEqual(self.available(self.room), before)
+        self.assertEqual(self.available(self.car), {})
+        self.assertFalse(Reservation.objects.filter(booking=booking).exists())
+
+    def test_capacity_is_never_oversold(self):
+        reserve(self.booking(), self.room, date(2030, 1, 1), date(2030, 1, 3))
+        reserve(self.booking(), self.room, date(2030, 1, 2), date(2030, 1, 4))
+        with self.assertRaises(ReservationError):
+            reserve(self.booking(), self.room, date(2030, 1, 2), date(2030, 1, 3))
+        with self.assertRaises(ReservationError):
+            reserve(self.booking(), self.room, date(2030, 1, 3), date(2030, 1, 5), quantity=2)
+
+        self.assertEqual(
+            self.available(self.room),
+            {date(2030, 1, 1): 1, date(2030, 1, 2): 0, date(2030, 1, 3): 1},
+        )
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_release_booking_restores_slots_once(self):
+        booking = self.booking()
+        reserve_many(booking, [
+            (self.room, date(2030, 1, 1), date(2030, 1, 3), 2),
+            (self.car, date(2030, 1, 1), date(2030, 1, 2), 1),
+        ])
+        self.assertEqual(self.available(self.room), {date(2030, 1, 1): 0, date(2030, 1, 2): 0})
+
+        self.assertEqual(release_booking(booking), 2)
+        self.assertEqual(release_booking(booking), 0)
 
-# Create your tests here.
+        self.assertEqual(self.available(self.room), {date(2030, 1, 1): 2, date(2030, 1, 2): 2})
+        self.assertEqual(self.available(self.car), {date(2030, 1, 1): 1})
+        self.assertFalse(Reservation.objects.filter(booking=booking, released_at__isnull=True).exists())
+        reserve(self.booking(), self.room, date(2030, 1, 1), date(2030, 1, 3), quantity=2)
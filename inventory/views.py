@@ -8,25 +8,53 @@ from django.contrib.contenttypes.models import ContentType
 from django_filters.rest_framework import DjangoFilterBackend
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.utils.dateparse import parse_datetime
 from .models import Hotel, RoomType, Car, AvailabilitySlot, Flight
 from .serializers import HotelSerializer, RoomTypeSerializer, CarSerializer, FlightSerializer
-from django.db.models import Q
-from adapters.flights.amadeus import AmadeusAdapter
-from adapters.flights.duffel import DuffelAdapter
+from .availability import availability_summary
+from .flights import cached_flights, upsert_offers
+from .flight_cache import get_or_fetch, search_key
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from reviews.models import RatingSummary
+from catalog.models import Destination
+from catalog.search import FullTextSearchFilter, search
+from adapters import get_flights_adapter
+from adapters.airports import get_airport_index
+import item_types
 from django.conf import settings
-from adapters.flights.fake import FakeFlightsAdapter
+from adapters.flights.fanout import search_all
 from rest_framework.permissions import AllowAny
 from datetime import datetime, timedelta
+
+
+def _include_dates(request) -> bool:
+    """Per-day breakdown is on by default; pass ?dates=false for the summary only."""
+    return request.query_params.get("dates", "true").lower() not in ("0", "false", "no")
+
+
+def _availability_entry(key, obj_data, summary):
+    entry = {key: obj_data, "min_available": summary["min_available"]}
+    if summary["dates"] is not None:
+        entry["dates"] = summary["dates"]
+    return entry
+
+
 class HotelViewSet(viewsets.ModelViewSet):
     queryset = Hotel.objects.prefetch_related("room_types") 
     serializer_class = HotelSerializer
     permission_classes = [AllowAny]
-    filter_backends = (filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend)
+    filter_backends = (FullTextSearchFilter, filters.OrderingFilter, DjangoFilterBackend)
     search_fields = ("name", "city", "country", "address")
-    ordering_fields = ("name", "rating")
+    ordering_fields = ("name", "rating", "review_avg", "review_count")
+    ordering = ("name",)
     filterset_fields = ("is_active", "city", "country")
 
+    def get_queryset(self):
+        return super().get_queryset().annotate(
+            review_avg=Coalesce(RatingSummary.subquery_for(Hotel, "average"), Value(0.0)),
+            review_count=Coalesce(RatingSummary.subquery_for(Hotel, "count"), Value(0)),
+        )
+
     def perform_create(self, serializer):
         user = self.request.user
         if not user.is_authenticated:
@@ -52,19 +80,15 @@ class HotelViewSet(viewsets.ModelViewSet):
         min_rating = filters.get("min_rating")
         max_rating = filters.get("max_rating")
         if location:
-            queryset = queryset.filter(
-                Q(city__icontains=location) |
-                Q(country__icontains=location) |
-                Q(name__icontains=location) |
-                Q(address__icontains=location)
-            )
+            queryset = search(queryset, location)
         if min_rating is not None:
             queryset = queryset.filter(rating__gte=min_rating)
         if max_rating is not None:
             queryset = queryset.filter(rating__lte=max_rating)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 
     @action(detail=True, methods=["get"], url_path="availability")
@@ -86,32 +110,20 @@ class HotelViewSet(viewsets.ModelViewSet):
         if end_date <= start_date:
             return Response({"detail": "end must be after start"}, status=status.HTTP_400_BAD_REQUEST)
 
-        ct = ContentType.objects.get_for_model(RoomType)
-        slots = AvailabilitySlot.objects.filter(
-            content_type=ct,
-            object_id__in=hotel.room_types.values_list("id", flat=True),
-            date__gte=start_date,
-            date__lt=end_date
+        room_types = list(hotel.room_types.all())
+        summary = availability_summary(
+            RoomType,
+            {rt.id: rt.quantity for rt in room_types},
+            start_date,
+            end_date,
+            include_dates=_include_dates(request),
         )
-        slot_map = {(s.object_id, s.date): s.available for s in slots}
-
-        data = []
-        for rt in hotel.room_types.all():
-            current = start_date
-            min_avail = None
-            dates = []
-            while current < end_date:
-                avail = slot_map.get((rt.id, current), rt.quantity)
-                dates.append({"date": current.isoformat(), "available": avail})
-                if min_avail is None or avail < min_avail:
-                    min_avail = avail
-                current += timedelta(days=1)
-            data.append({
-                "room_type": RoomTypeSerializer(rt, context={"request": request}).data,
-                "min_available": min_avail,
-                "dates": dates
-            })
+        room_data = RoomTypeSerializer(room_types, many=True, context={"request": request}).data
 
+        data = [
+            _availability_entry("room_type", rt_data, summary[rt.id])
+            for rt, rt_data in zip(room_types, room_data)
+        ]
         return Response(data)
 
 class RoomTypeViewSet(viewsets.ModelViewSet):
@@ -121,6 +133,7 @@ class RoomTypeViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend)
     search_fields = ("name", "hotel__name", "hotel__city", "hotel__country")
     ordering_fields = ("base_price", "capacity")
+    ordering = ("id",)
     filterset_fields = ("hotel",)
 
     def perform_create(self, serializer):
@@ -139,6 +152,7 @@ class CarViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend)
     search_fields = ("make", "model", "provider")
     ordering_fields = ("daily_rate", "make", "model")
+    ordering = ("id",)
     filterset_fields = ("provider", "category", "available", "destination")
 
     def perform_create(self, serializer):
@@ -169,12 +183,8 @@ class CarViewSet(viewsets.ModelViewSet):
         qs = self.queryset.all() 
 
         if filters.get("location"):
-            loc = filters["location"]
-            qs = qs.filter(
-                Q(destination__name__icontains=loc) |
-                Q(destination__city__icontains=loc) |
-                Q(destination__country__icontains=loc)
-            )
+            destinations = search(Destination.objects.all(), filters["location"])
+            qs = qs.filter(destination__in=destinations.values("pk"))
 
         if filters.get("type"):
             qs = qs.filter(category__iexact=filters["type"].strip())
@@ -182,8 +192,9 @@ class CarViewSet(viewsets.ModelViewSet):
         if filters.get("start_date") and filters.get("end_date"):
             qs = qs.filter(available=True)
 
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
 class AvailabilityView(APIView):
     def get(self, request):
@@ -205,101 +216,77 @@ class AvailabilityView(APIView):
         if end_date <= start_date:
             return Response({"detail": "end must be after start"}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            obj_type = item_types.get(obj_type).name
+        except item_types.UnknownItemType:
+            obj_type = None
+
         ids = [int(i) for i in ids.split(",") if i.isdigit()]
+        include_dates = _include_dates(request)
         data = []
 
         if obj_type == "hotel":
-            queryset = Hotel.objects.filter(id__in=ids, is_active=True).prefetch_related("room_types")
-            if not queryset.exists():
-                return Response([], status=status.HTTP_200_OK)
-
-            for hotel in queryset:
-                hotel_data = {"hotel": HotelSerializer(hotel, context={"request": request}).data, "room_types": []}
-                ct = ContentType.objects.get_for_model(RoomType)
-                slots = AvailabilitySlot.objects.filter(
-                    content_type=ct,
-                    object_id__in=hotel.room_types.values_list("id", flat=True),
-                    date__gte=start_date,
-                    date__lt=end_date
-                )
-                slot_map = {(s.object_id, s.date): s.available for s in slots}
-
-                for rt in hotel.room_types.all():
-                    dates = []
-                    current = start_date
-                    min_avail = None
-                    while current < end_date:
-                        avail = slot_map.get((rt.id, current), rt.quantity)
-                        dates.append({"date": current.isoformat(), "available": avail})
-                        if min_avail is None or avail < min_avail:
-                            min_avail = avail
-                        current += timedelta(days=1)
-                    hotel_data["room_types"].append({
-                        "room_type": RoomTypeSerializer(rt, context={"request": request}).data,
-                        "min_available": min_avail,
-                        "dates": dates
-                    })
-                data.append(hotel_data)
-
-        elif obj_type == "roomtype":
-            queryset = RoomType.objects.filter(id__in=ids)
-            if not queryset.exists():
+            hotels = list(
+                Hotel.objects.filter(id__in=ids, is_active=True).prefetch_related("room_types")
+            )
+            if not hotels:
                 return Response([], status=status.HTTP_200_OK)
 
-            ct = ContentType.objects.get_for_model(RoomType)
-            slots = AvailabilitySlot.objects.filter(
-                content_type=ct,
-                object_id__in=ids,
-                date__gte=start_date,
-                date__lt=end_date
+            room_types = [rt for hotel in hotels for rt in hotel.room_types.all()]
+            summary = availability_summary(
+                RoomType,
+                {rt.id: rt.quantity for rt in room_types},
+                start_date,
+                end_date,
+                include_dates=include_dates,
             )
-            slot_map = {(s.object_id, s.date): s.available for s in slots}
-
-            for rt in queryset:
-                dates = []
-                current = start_date
-                min_avail = None
-                while current < end_date:
-                    avail = slot_map.get((rt.id, current), rt.quantity)
-                    dates.append({"date": current.isoformat(), "available": avail})
-                    if min_avail is None or avail < min_avail:
-                        min_avail = avail
-                    current += timedelta(days=1)
+            hotel_data = HotelSerializer(hotels, many=True, context={"request": request}).data
+
+            for hotel, h_data in zip(hotels, hotel_data):
+                # HotelSerializer already nests the room types, reuse them.
                 data.append({
-                    "room_type": RoomTypeSerializer(rt, context={"request": request}).data,
-                    "min_available": min_avail,
-                    "dates": dates
+                    "hotel": h_data,
+                    "room_types": [
+                        _availability_entry("room_type", rt_data, summary[rt.id])
+                        for rt, rt_data in zip(hotel.room_types.all(), h_data["room_types"])
+                    ],
                 })
 
+        elif obj_type == "room":
+            room_types = list(RoomType.objects.filter(id__in=ids).select_related("hotel"))
+            if not room_types:
+                return Response([], status=status.HTTP_200_OK)
+
+            summary = availability_summary(
+                RoomType,
+                {rt.id: rt.quantity for rt in room_types},
+                start_date,
+                end_date,
+                include_dates=include_dates,
+            )
+            room_data = RoomTypeSerializer(room_types, many=True, context={"request": request}).data
+            data = [
+                _availability_entry("room_type", rt_data, summary[rt.id])
+                for rt, rt_data in zip(room_types, room_data)
+            ]
+
         elif obj_type == "car":
-            queryset = Car.objects.filter(id__in=ids, available=True)
-            if not queryset.exists():
+            cars = list(Car.objects.filter(id__in=ids, available=True).select_related("destination"))
+            if not cars:
                 return Response([], status=status.HTTP_200_OK)
 
-            ct = ContentType.objects.get_for_model(Car)
-            slots = AvailabilitySlot.objects.filter(
-                content_type=ct,
-                object_id__in=ids,
-                date__gte=start_date,
-                date__lt=end_date
+            summary = availability_summary(
+                Car,
+                {car.id: 1 if car.available else 0 for car in cars},
+                start_date,
+                end_date,
+                include_dates=include_dates,
             )
-            slot_map = {(s.object_id, s.date): s.available for s in slots}
-
-            for car in queryset:
-                dates = []
-                current = start_date
-                min_avail = None
-                while current < end_date:
-                    avail = slot_map.get((car.id, current), 1 if car.available else 0)
-                    dates.append({"date": current.isoformat(), "available": avail})
-                    if min_avail is None or avail < min_avail:
-                        min_avail = avail
-                    current += timedelta(days=1)
-                data.append({
-                    "car": CarSerializer(car, context={"request": request}).data,
-                    "min_available": min_avail,
-                    "dates": dates
-                })
+            car_data = CarSerializer(cars, many=True, context={"request": request}).data
+            data = [
+                _availability_entry("car", c_data, summary[car.id])
+                for car, c_data in zip(cars, car_data)
+            ]
 
         else:
             return Response(
@@ -308,22 +295,46 @@ class AvailabilityView(APIView):
             )
 
         return Response(data)
+
+
 class FlightViewSet(viewsets.ModelViewSet):
     serializer_class = FlightSerializer
     permission_classes = [AllowAny]
     filter_backends = (filters.SearchFilter, filters.OrderingFilter, DjangoFilterBackend)
     search_fields = ("origin", "destination", "airline")
     ordering_fields = ("departure_time", "price", "airline", "created_at")
+    ordering = ("departure_time",)
     filterset_fields = ("origin", "destination", "airline", "provider")
 
     def get_queryset(self):
         return Flight.objects.all()
 
+    @action(detail=False, methods=["get"], url_path="airports", pagination_class=None)
+    def airports(self, request):
+        """
+        Airport autocomplete for search forms: ?q= matches IATA codes and
+        words of the city, airport or country name; ?lat=&lng= returns the
+        nearest airports instead. ?limit= caps results (default 10).
+        """
+        index = get_airport_index()
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), 50))
+            lat, lng = request.query_params.get("lat"), request.query_params.get("lng")
+            if lat is not None and lng is not None:
+                return Response([
+                    {**airport.as_dict(), "distance_km": distance}
+                    for airport, distance in index.nearest(float(lat), float(lng), limit=limit)
+                ])
+        except ValueError:
+            return Response({"detail": "limit, lat and lng must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response([airport.as_dict() for airport in index.autocomplete(request.query_params.get("q"), limit=limit)])
+
     @action(detail=False, methods=["get"], url_path="available")
     def available(self, request):
-        qs = Flight.objects.filter(expires_at__gt=timezone.now()).order_by("departure_time")
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        qs = self.filter_queryset(self.get_queryset().filter(expires_at__gt=timezone.now()))
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=["post"], url_path="search")
     def search(self, request):
@@ -332,101 +343,53 @@ class FlightViewSet(viewsets.ModelViewSet):
         departure_date = request.data.get("departure_date")
         passengers = int(request.data.get("passengers", 1))
         force_refresh = request.data.get("force_refresh", False)
-        provider_name = request.data.get("provider", "fake").lower()  
+        provider_name = request.data.get("provider", "fake").lower()
+        cabin = request.data.get("cabin", "ECONOMY").upper()
 
         logger.debug(f"Flight search: {origin}->{destination} on {departure_date} using provider: {provider_name}")
-        if not force_refresh:
-            qs = Flight.objects.filter(expires_at__gt=timezone.now())
-            if origin:
-                qs = qs.filter(origin__iexact=origin.upper())
-            if destination:
-                qs = qs.filter(destination__iexact=destination.upper())
-            if departure_date:
-                qs = qs.filter(departure_time__date=departure_date)
-
-            logger.debug(f"Filtered query found: {qs.count()} flights")
-            if not origin and not destination and not departure_date:
-                if qs.exists():
-                    serializer = self.get_serializer(qs.order_by("departure_time"), many=True)
-                    return Response(serializer.data)
-
-            if qs.exists():
-                serializer = self.get_serializer(qs, many=True)
-                return Response(serializer.data)
-        try:
-            if provider_name == "amadeus":
-                adapter = AmadeusAdapter(settings.ADAPTERS["flights.amadeus"])
-            elif provider_name == "duffel":
-                adapter = DuffelAdapter(settings.ADAPTERS["flights.duffel"])
-            else:
-                adapter = FakeFlightsAdapter() 
 
-            response = adapter.search(
-                origin=origin,
-                destination=destination,
-                departure_date=departure_date,
-                adults=passengers,
-            )
+        def fetch():
+            if provider_name == "all":
+                response = search_all(
+                    origin=origin,
+                    destination=destination,
+                    depart_date=departure_date,
+                    adults=passengers,
+                    cabin=cabin,
+                )
+                logger.debug(f"Fan-out provider status: {response.get('providers')}")
+            else:
+                adapter = get_flights_adapter(provider_name if provider_name in ("amadeus", "duffel") else "fake")
+
+                response = adapter.search(
+                    origin=origin,
+                    destination=destination,
+                    depart_date=departure_date,
+                    adults=passengers,
+                    cabin=cabin,
+                )
 
             offers = response.get("offers", [])
             logger.debug(f"Offers count: {len(offers)}")
             if not offers:
                 logger.warning(f"{provider_name} returned empty offers array")
                 logger.debug(f"Full {provider_name} response: {response}")
-                return Response([], status=status.HTTP_200_OK)
+                return []
 
-            flights = []
-            for offer in offers:
-                itineraries = offer.get("itineraries", [])
-                if not itineraries or not itineraries[0].get("segments"):
-                    continue
-
-                first_segment = itineraries[0]["segments"][0]
-                last_segment = itineraries[0]["segments"][-1]
-
-                flight_number = first_segment.get("number") or offer.get("id")
-                airline = first_segment.get("carrierCode")
-                origin_code = first_segment.get("departure", {}).get("iataCode")
-                destination_code = last_segment.get("arrival", {}).get("iataCode")
-                departure_time_str = first_segment.get("departure", {}).get("at")
-                arrival_time_str = last_segment.get("arrival", {}).get("at")
-                seats_available = offer.get("numberOfBookableSeats", 0)
-
-                departure_time_obj = parse_datetime(departure_time_str) if departure_time_str else None
-                arrival_time_obj = parse_datetime(arrival_time_str) if arrival_time_str else None
-                departure_date_obj = departure_time_obj.date() if departure_time_obj else None
-
-                price_info = offer.get("price", {})
-                price = price_info.get("total") or 0
-                currency = price_info.get("currency") or "USD"
-
-                if not origin_code or not destination_code:
-                    continue
-
-                obj, created = Flight.objects.update_or_create(
-                    provider=provider_name,
-                    offer_id=offer.get("id"),
-                    defaults={
-                        "flight_number": flight_number,
-                        "origin": origin_code,
-                        "destination": destination_code,
-                        "departure_time": departure_time_obj,
-                        "arrival_time": arrival_time_obj,
-                        "airline": airline,
-                        "price": price,
-                        "currency": currency,
-                        "seats_available": seats_available,
-                        "departure_date": departure_date_obj,
-                        "expires_at": timezone.now() + timezone.timedelta(minutes=30),
-                    },
-                )
-                flights.append(obj)
+            flights = upsert_offers(offers, provider_name)
+            return list(self.get_serializer(flights, many=True).data)
 
-            serializer = self.get_serializer(flights, many=True)
-            return Response(serializer.data)
+        key = search_key(provider_name, origin, destination, departure_date, passengers, cabin)
+        try:
+            data, cache_state = get_or_fetch(key, fetch, force_refresh=bool(force_refresh))
+            return Response(data, headers={"X-Cache": cache_state})
 
         except Exception as e:
             logger.error(f"{provider_name} API error: {str(e)}", exc_info=True)
+            stored = list(cached_flights(origin, destination, departure_date))
+            if stored:
+                serializer = self.get_serializer(stored, many=True)
+                return Response(serializer.data, headers={"X-Cache": "fallback"})
             return Response(
                 {"error": f"Failed to fetch flight data from {provider_name} provider"},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,175 @@
+"""
+Registry of the item types that can be booked and reviewed.
+
+The API names items "package", "hotel", "room" and "car"; this maps each
+name to its model, ContentType, serializer and unit-price function, so
+booking, reviews and inventory share one table instead of keeping their
+own type-to-model dicts.
+
+ContentTypes come from ContentType.objects.get_for_model()/get_for_id(),
+which cache per process, so after the first lookup resolving an item
+type, an "app_label.model" string or a content_type_id costs no query.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.utils.module_loading import import_string
+
+
+class UnknownItemType(LookupError):
+    pass
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+
+# ---------- Pricing ----------
+# Each takes (obj, start_date, end_date, unit_price) and returns the unit
+# price to charge; unit_price is what the caller quoted and may be None.
+def _package_price(obj, start_date, end_date, unit_price) -> Decimal:
+    base_price = obj.base_price or Decimal("0.00")
+    return base_price + (base_price * (obj.commission or 0)) / 100
+
+
+def _car_price(obj, start_date, end_date, unit_price) -> Optional[Decimal]:
+    start_date, end_date = _as_date(start_date), _as_date(end_date)
+    if not start_date or not end_date or end_date <= start_date:
+        return unit_price
+    return obj.daily_rate * (end_date - start_date).days
+
+
+def _quoted_price(obj, start_date, end_date, unit_price) -> Optional[Decimal]:
+    return unit_price
+
+
+@dataclass(frozen=True)
+class ItemType:
+    name: str
+    model_label: str
+    serializer_path: str
+    price: Callable = _quoted_price
+    # Whether start_date/end_date are required when booking it.
+    dated: bool = True
+    # Whether booking it takes inventory, so its rows are locked while booking.
+    reservable: bool = False
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def content_type(self) -> ContentType:
+        return ContentType.objects.get_for_model(self.model)
+
+    @property
+    def serializer_class(self):
+        return import_string(self.serializer_path)
+
+
+ITEM_TYPES: Dict[str, ItemType] = {
+    item_type.name: item_type
+    for item_type in (
+        ItemType("package", "catalog.TourPackage", "catalog.serializers.TourPackageSerializer", _package_price, dated=False),
+        ItemType("hotel", "inventory.Hotel", "inventory.serializers.HotelSerializer"),
+        ItemType("room", "inventory.RoomType", "inventory.serializers.RoomTypeSerializer", reservable=True),
+        ItemType("car", "inventory.Car", "inventory.serializers.CarSerializer", _car_price, reservable=True),
+    )
+}
+
+NAMES = tuple(ITEM_TYPES)
+
+
+@lru_cache(maxsize=None)
+def _by_label() -> Dict[str, ItemType]:
+    # "catalog.tourpackage" and bare "tourpackage" -> ItemType
+    labels = {}
+    for item_type in ITEM_TYPES.values():
+        model = item_type.model
+        labels[model._meta.label_lower] = item_type
+        labels[model._meta.model_name] = item_type
+    return labels
+
+
+def get(name: str) -> ItemType:
+    """The item type for an API name ("room"), a model label ("inventory.roomtype") or model name ("roomtype")."""
+    key = (name or "").strip().lower()
+    item_type = ITEM_TYPES.get(key) or _by_label().get(key)
+    if item_type is None:
+        raise UnknownItemType(f"Unknown item type: {name}")
+    return item_type
+
+
+def for_model(model_or_obj) -> Optional[ItemType]:
+    """The item type of a model class or instance, or None if it is not bookable."""
+    return _by_label().get(model_or_obj._meta.label_lower)
+
+
+def for_content_type_id(content_type_id: int) -> Optional[ItemType]:
+    content_type = ContentType.objects.get_for_id(content_type_id)
+    return _by_label().get(f"{content_type.app_label}.{content_type.model}")
+
+
+def name_for(value: Union[ContentType, int, None]) -> Optional[str]:
+    """API name for a ContentType (or its id); the model name for unregistered types."""
+    if value is None:
+        return None
+    content_type = value if isinstance(value, ContentType) else ContentType.objects.get_for_id(value)
+    item_type = _by_label().get(f"{content_type.app_label}.{content_type.model}")
+    return item_type.name if item_type else content_type.model
+
+
+def content_type_for(value: str) -> ContentType:
+    """
+    ContentType for an item type name, "app_label.model" or a bare model
+    name. Models outside the registry resolve too (reviews accept any
+    model); raises UnknownItemType if nothing matches.
+    """
+    try:
+        return get(value).content_type
+    except UnknownItemType:
+        pass
+    key = (value or "").strip().lower()
+    try:
+        if "." in key:
+            model = apps.get_model(key)
+        else:
+            matches = [m for m in apps.get_models() if m._meta.model_name == key]
+            if len(matches) != 1:
+                raise LookupError(key)
+            model = matches[0]
+    except (LookupError, ValueError):
+        raise UnknownItemType(f"Unknown item type: {value}")
+    return ContentType.objects.get_for_model(model)
+
+
+def load(refs: Iterable[Tuple[str, int]], *, for_update: bool = False) -> Dict[Tuple[str, int], object]:
+    """
+    Fetch the objects behind (type name, id) pairs with one in_bulk query
+    per type: {(name, id): obj}, missing ids left out. With for_update,
+    rows of reservable types are locked (in registry then pk order, so
+    concurrent bookings take locks in the same order); call it inside a
+    transaction.
+    """
+    ids_by_type = defaultdict(set)
+    for name, pk in refs:
+        ids_by_type[get(name).name].add(int(pk))
+
+    loaded = {}
+    for name, item_type in ITEM_TYPES.items():
+        if name not in ids_by_type:
+            continue
+        queryset = item_type.model.objects.order_by("pk")
+        if for_update and item_type.reservable:
+            queryset = queryset.select_for_update()
+        for pk, obj in queryset.in_bulk(ids_by_type[name]).items():
+            loaded[(name, pk)] = obj
+    return loaded
@@ -0,0 +1,213 @@
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+from urllib import parse
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Stands for a NULL in a cursor position; encoded by index in the "n" token.
+NULL_POSITION = object()
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination used by default for list endpoints.
+
+    Pages are fetched with `WHERE (<fields>) > (<last row's values>)` instead
+    of OFFSET, so a deep page costs the same as the first, and no COUNT(*)
+    runs unless the client asks for it with ?count=true.
+
+    The ordering is ?ordering= when the view has an OrderingFilter, else the
+    view's `ordering`, else "-created_at". Search results (querysets carrying
+    a `search_rank` annotation) are paged by relevance unless ?ordering= is
+    given. The primary key is appended as a tiebreaker, and the cursor holds
+    the last row's value for every ordering field, so each position is
+    unique and rows sharing a value are never skipped or repeated.
+
+    NULLs sort as the largest value on every database (last ascending,
+    first descending), so nullable fields such as Hotel.rating page like
+    any other.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at",)
+    count_query_param = "count"
+    rank_annotation = "search_rank"
+
+    def get_ordering(self, request, queryset, view):
+        if (
+            self.rank_annotation in queryset.query.annotations
+            and api_settings.ORDERING_PARAM not in request.query_params
+        ):
+            ordering = [f"-{self.rank_annotation}"]
+        else:
+            self.ordering = getattr(view, "ordering", None) or type(self).ordering
+            ordering = list(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip("-") in ("id", "pk") for field in ordering):
+            ordering.append("-id" if ordering[0].startswith("-") else "id")
+        return tuple(ordering)
+
+    def _order_by(self, reverse):
+        expressions = []
+        for field in self.ordering:
+            column = F(field.lstrip("-"))
+            if field.startswith("-") != reverse:
+                expressions.append(column.desc(nulls_first=True))
+            else:
+                expressions.append(column.asc(nulls_last=True))
+        return expressions
+
+    def _beyond(self, position):
+        """Rows strictly past `position` in the cursor's direction, NULL being the largest value."""
+        branches = []
+        equal_so_far = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            if self.cursor.reverse != field.startswith("-"):
+                if value is NULL_POSITION:
+                    past = Q(**{f"{name}__isnull": False})
+                else:
+                    past = Q(**{f"{name}__lt": value})
+            elif value is NULL_POSITION:
+                past = None
+            else:
+                past = Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+            if past is not None:
+                branches.append(equal_so_far & past)
+            if value is NULL_POSITION:
+                equal_so_far &= Q(**{f"{name}__isnull": True})
+            else:
+                equal_so_far &= Q(**{name: value})
+        return reduce(or_, branches) if branches else Q(pk__in=[])
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # CursorPagination.paginate_queryset, filtering on the whole position
+        # (so no offsets are needed) and ordering NULLs consistently.
+        wants_count = request.query_params.get(self.count_query_param, "").lower() in ("1", "true", "yes")
+        self.count = queryset.count() if wants_count else None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if current_position is not None:
+            queryset = queryset.filter(self._beyond(current_position))
+
+        # One extra row tells whether another page follows.
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            name = field.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            position.append(NULL_POSITION if value is None else str(value))
+        return tuple(position)
+
+    def encode_cursor(self, cursor):
+        tokens = {}
+        if cursor.offset != 0:
+            tokens["o"] = str(cursor.offset)
+        if cursor.reverse:
+            tokens["r"] = "1"
+        if cursor.position is not None:
+            tokens["p"] = ["" if value is NULL_POSITION else value for value in cursor.position]
+            nulls = [str(i) for i, value in enumerate(cursor.position) if value is NULL_POSITION]
+            if nulls:
+                tokens["n"] = ",".join(nulls)
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("utf-8"), keep_blank_values=True)
+            offset = int(tokens.get("o", ["0"])[0])
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            position = tokens.get("p")
+            nulls = {int(i) for i in tokens["n"][0].split(",")} if "n" in tokens else set()
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if offset < 0 or (position is not None and len(position) != len(self.ordering)):
+            # Also catches a cursor carried over from a different ?ordering=.
+            raise NotFound(self.invalid_cursor_message)
+        if position is not None:
+            position = tuple(NULL_POSITION if i in nulls else value for i, value in enumerate(position))
+        return Cursor(offset=offset, reverse=reverse, position=position)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["next"] = self.get_next_link()
+        payload["previous"] = self.get_previous_link()
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {"type": "integer", "description": "Only present with ?count=true"},
+            **response_schema["properties"],
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            "name": self.count_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Include the total number of results (runs an extra COUNT query).",
+            "schema": {"type": "boolean"},
+        })
+        return parameters
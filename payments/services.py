@@ -2,6 +2,7 @@ import logging
 from decimal import Decimal
 from typing import Dict, Any, Optional
 from django.db import transaction
+from django.utils import timezone
 
 from adapters.payments import get_payment_adapter
 from .models import Payment, RefundRequest
@@ -120,10 +121,51 @@ def handle_payment_webhook(gateway: str, payload: bytes, headers: Dict[str, Any]
             try:
                 from booking.services import confirm_booking_on_payment
                 confirm_booking_on_payment(payment_obj.booking, payment_obj)
-            except Exception:
+            except Exception as exc:
+                # The charge went through but the booking stays unconfirmed (e.g. an
+                # expired hold whose inventory has gone). A duplicate webhook
+                # short-circuits above, so queue it for an agent now.
                 logger.exception("Failed to confirm booking for payment=%s", payment_obj.id)
+                flag_unconfirmed_payment(payment_obj, exc)
+                return {
+                    "status": "needs_attention",
+                    "payment_id": payment_obj.id,
+                    "new_status": new_status,
+                    "error": str(exc),
+                }
 
     return {"status": "processed", "payment_id": payment_obj.id, "new_status": new_status}
+
+
+def flag_unconfirmed_payment(payment: Payment, error: Exception) -> RefundRequest:
+    """
+    Record that `payment` succeeded but its booking could not be confirmed:
+    payment.metadata["needs_attention"] says why, and a pending RefundRequest
+    puts it in the agents' refund queue (approve to refund, reject once the
+    booking has been sorted out by hand).
+    """
+    booking = payment.booking
+    payment.metadata = {
+        **(payment.metadata or {}),
+        "needs_attention": {
+            "reason": "booking_not_confirmed",
+            "booking_status": booking.status,
+            "error": str(error),
+            "at": timezone.now().isoformat(),
+        },
+    }
+    payment.save(update_fields=["metadata", "updated_at"])
+    refund, _ = RefundRequest.objects.get_or_create(
+        payment=payment,
+        status=RefundRequest.Status.PENDING,
+        defaults={
+            "requested_by": booking.user,
+            "booking": booking,
+            "amount": payment.amount,
+            "reason": f"Paid but booking {booking.pk} could not be confirmed: {error}",
+        },
+    )
+    return refund
 def charge(provider, amount, currency, source, **kwargs):
     adapter = get_payment_adapter(provider)
     if not adapter:
@@ -1,5 +1,8 @@
+from collections import Counter, defaultdict
+
 from django.contrib import admin
-from .models import Review
+from django.db import transaction
+from .models import Review, RatingSummary
 # Register your models here.
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
@@ -9,12 +12,35 @@ class ReviewAdmin(admin.ModelAdmin):
     readonly_fields = ("created_at",)
     actions = ["approve_reviews", "disapprove_reviews"]
 
+    @staticmethod
+    def _set_approval(queryset, approved):
+        """Bulk update bypasses signals, so apply the rating deltas here."""
+        with transaction.atomic():
+            changing = list(
+                queryset.filter(is_approved=not approved)
+                .select_for_update()
+                .values_list("pk", "content_type_id", "object_id", "rating")
+            )
+            Review.objects.filter(pk__in=[pk for pk, *_ in changing]).update(is_approved=approved)
+            deltas = defaultdict(Counter)
+            for _, ct_id, obj_id, rating in changing:
+                deltas[(ct_id, obj_id)][rating] += 1 if approved else -1
+            RatingSummary.apply_deltas(deltas)
+        return len(changing)
+
     def approve_reviews(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        updated = self._set_approval(queryset, True)
         self.message_user(request, f"{updated} review(s) approved.")
     approve_reviews.short_description = "Approve selected reviews"
 
     def disapprove_reviews(self, request, queryset):
-        updated = queryset.update(is_approved=False)
+        updated = self._set_approval(queryset, False)
         self.message_user(request, f"{updated} review(s) disapproved.")
-    disapprove_reviews.short_description = "Disapprove selected reviews"
\ No newline at end of file
+    disapprove_reviews.short_description = "Disapprove selected reviews"
+
+
+@admin.register(RatingSummary)
+class RatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ("content_type", "object_id", "count", "average", "updated_at")
+    list_filter = ("content_type",)
+    readonly_fields = [f.name for f in RatingSummary._meta.fields]
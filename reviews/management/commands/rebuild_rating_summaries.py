@@ -0,0 +1,27 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.models import RatingSummary
+
+
+class Command(BaseCommand):
+    help = "Recompute review rating summaries from approved reviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", help="Only rebuild one reviewed model, as app_label.model (e.g. catalog.tourpackage)"
+        )
+
+    def handle(self, *args, **options):
+        content_type = None
+        if options["model"]:
+            try:
+                app_label, model = options["model"].lower().split(".")
+                content_type = ContentType.objects.get(app_label=app_label, model=model)
+            except (ValueError, ContentType.DoesNotExist):
+                raise CommandError(f"Unknown model: {options['model']}")
+
+        count = RatingSummary.rebuild(content_type)
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {count} rating summar{'y' if count == 1 else 'ies'}.")
+        )
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_summaries(apps, schema_editor):
+    Review = apps.get_model("reviews", "Review")
+    RatingSummary = apps.get_model("reviews", "RatingSummary")
+    rows = Review.objects.filter(is_approved=True).values("content_type_id", "object_id").annotate(
+        n=Count("id"),
+        s=Sum("rating"),
+        **{f"s{star}": Count("id", filter=Q(rating=star)) for star in range(1, 6)},
+    )
+    RatingSummary.objects.bulk_create(
+        [
+            RatingSummary(
+                content_type_id=row["content_type_id"],
+                object_id=row["object_id"],
+                count=row["n"],
+                total=row["s"],
+                average=row["s"] / row["n"],
+                **{f"star_{star}": row[f"s{star}"] for star in range(1, 6)},
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('reviews', '0003_review_user_avatar_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.PositiveIntegerField(default=0, help_text='Sum of ratings')),
+                ('star_1', models.PositiveIntegerField(default=0)),
+                ('star_2', models.PositiveIntegerField(default=0)),
+                ('star_3', models.PositiveIntegerField(default=0)),
+                ('star_4', models.PositiveIntegerField(default=0)),
+                ('star_5', models.PositiveIntegerField(default=0)),
+                ('average', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['content_type', 'average'], name='reviews_rat_content_456a51_idx')],
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.RunPython(build_summaries, migrations.RunPython.noop),
+    ]
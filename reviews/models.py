@@ -1,7 +1,13 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.db import models, transaction
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
 
 # Create your models here.
 User = settings.AUTH_USER_MODEL
@@ -18,4 +24,160 @@ class Review(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     user_avatar_url = models.URLField(max_length=500, blank=True, null=True, help_text="Snapshot of user's avatar at time of review")
     class Meta:
-        indexes = [models.Index(fields=["content_type","object_id"]), models.Index(fields=["user"])]
\ No newline at end of file
+        indexes = [
+            models.Index(fields=["content_type","object_id"]),
+            models.Index(fields=["user"]),
+            # Review listings: approved reviews newest first, overall or per object
+            models.Index(fields=["is_approved", "-created_at", "-id"]),
+            models.Index(fields=["content_type", "object_id", "is_approved", "-created_at"]),
+        ]
+
+class RatingSummary(models.Model):
+    """
+    Running totals of approved reviews for one reviewed object. Kept in step
+    by the Review signals below and the admin bulk actions; rebuild with
+    `manage.py rebuild_rating_summaries`.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    count = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0, help_text="Sum of ratings")
+    star_1 = models.PositiveIntegerField(default=0)
+    star_2 = models.PositiveIntegerField(default=0)
+    star_3 = models.PositiveIntegerField(default=0)
+    star_4 = models.PositiveIntegerField(default=0)
+    star_5 = models.PositiveIntegerField(default=0)
+    average = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("content_type", "object_id")
+        indexes = [models.Index(fields=["content_type", "average"])]
+
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} — {self.average:.2f} ({self.count})"
+
+    @classmethod
+    def subquery_for(cls, model, field):
+        """Correlated subquery reading `field` of the summary for each row of `model`."""
+        return Subquery(
+            cls.objects.filter(
+                content_type=ContentType.objects.get_for_model(model), object_id=OuterRef("pk")
+            ).values(field)[:1]
+        )
+
+    @property
+    def histogram(self):
+        return {star: getattr(self, f"star_{star}") for star in range(1, 6)}
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """
+        Apply {(content_type_id, object_id): {rating: +/-n}} with one
+        UPDATE per object, so concurrent writers never lose increments.
+        """
+        deltas = {key: stars for key, stars in deltas.items() if any(stars.values())}
+        if not deltas:
+            return
+        cls.objects.bulk_create(
+            [cls(content_type_id=ct_id, object_id=obj_id) for ct_id, obj_id in deltas],
+            ignore_conflicts=True,
+        )
+        for (ct_id, obj_id), stars in deltas.items():
+            count_delta = sum(stars.values())
+            total_delta = sum(rating * n for rating, n in stars.items())
+            changes = {
+                "count": F("count") + count_delta,
+                "total": F("total") + total_delta,
+                # Evaluated against the pre-update row, hence the deltas again.
+                "average": Coalesce(
+                    Cast(F("total") + total_delta, models.FloatField()) / NullIf(F("count") + count_delta, 0),
+                    Value(0.0),
+                ),
+            }
+            for rating, n in stars.items():
+                if n and 1 <= rating <= 5:
+                    changes[f"star_{rating}"] = F(f"star_{rating}") + n
+            cls.objects.filter(content_type_id=ct_id, object_id=obj_id).update(**changes)
+
+    @classmethod
+    def rebuild_for(cls, content_type_id, object_id):
+        cls.rebuild(
+            reviews=Review.objects.filter(content_type_id=content_type_id, object_id=object_id),
+            summaries=cls.objects.filter(content_type_id=content_type_id, object_id=object_id),
+        )
+
+    @classmethod
+    def rebuild(cls, content_type=None, *, reviews=None, summaries=None):
+        """Recompute summaries from approved reviews; returns rows written."""
+        reviews = (reviews if reviews is not None else Review.objects.all()).filter(is_approved=True)
+        summaries = summaries if summaries is not None else cls.objects.all()
+        if content_type is not None:
+            reviews = reviews.filter(content_type=content_type)
+            summaries = summaries.filter(content_type=content_type)
+
+        rows = reviews.values("content_type_id", "object_id").annotate(
+            n=Count("id"),
+            s=Sum("rating"),
+            **{f"s{star}": Count("id", filter=Q(rating=star)) for star in range(1, 6)},
+        )
+        fresh = [
+            cls(
+                content_type_id=row["content_type_id"],
+                object_id=row["object_id"],
+                count=row["n"],
+                total=row["s"],
+                average=row["s"] / row["n"],
+                **{f"star_{star}": row[f"s{star}"] for star in range(1, 6)},
+            )
+            for row in rows
+        ]
+        with transaction.atomic():
+            summaries.delete()
+            cls.objects.bulk_create(fresh, batch_size=1000)
+        return len(fresh)
+
+
+def _rating_key(review):
+    return (review.content_type_id, review.object_id)
+
+
+_UNKNOWN = object()
+
+
+@receiver(post_init, sender=Review)
+def snapshot_review_rating(sender, instance, **kwargs):
+    # What this review currently contributes to its summary, if anything.
+    # Read from __dict__ so deferred fields don't trigger a query per row.
+    state = instance.__dict__
+    if not all(f in state for f in ("rating", "is_approved", "content_type_id", "object_id")):
+        instance._counted_rating, instance._counted_key = _UNKNOWN, None
+        return
+    instance._counted_rating = state["rating"] if instance.pk and state["is_approved"] else None
+    instance._counted_key = _rating_key(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_summary_on_save(sender, instance, created, **kwargs):
+    if instance._counted_rating is _UNKNOWN:
+        # Loaded with deferred fields: recount rather than guess the old state.
+        RatingSummary.rebuild_for(*_rating_key(instance))
+        snapshot_review_rating(sender, instance)
+        return
+    deltas = defaultdict(Counter)
+    if not created and instance._counted_rating is not None:
+        deltas[instance._counted_key][instance._counted_rating] -= 1
+    if instance.is_approved:
+        deltas[_rating_key(instance)][instance.rating] += 1
+    RatingSummary.apply_deltas(deltas)
+    snapshot_review_rating(sender, instance)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_summary_on_delete(sender, instance, **kwargs):
+    if instance._counted_rating is _UNKNOWN:
+        RatingSummary.rebuild_for(*_rating_key(instance))
+    elif instance._counted_rating is not None:
+        RatingSummary.apply_deltas({instance._counted_key: Counter({instance._counted_rating: -1})})
@@ -2,7 +2,7 @@ from rest_framework import serializers
 from .models import Review
 from users.serializers import UserLiteSerializer
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
+import item_types
 
 User = get_user_model()
 
@@ -43,10 +43,9 @@ class ReviewSerializer(serializers.ModelSerializer):
                 {"content_type": "Must be in the format 'app_label.model' (e.g. 'inventory.hotel')."}
             )
 
-        app_label, model = content_type_str.lower().split(".")
         try:
-            ct = ContentType.objects.get(app_label=app_label, model=model)
-        except ContentType.DoesNotExist:
+            ct = item_types.content_type_for(content_type_str)
+        except item_types.UnknownItemType:
             raise serializers.ValidationError(
                 {"content_type": f"Invalid content type: {content_type_str}"}
             )
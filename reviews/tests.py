@@ -1,3 +1,124 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 
-# Create your tests here.
+from inventory.models import Hotel
+
+from .admin import ReviewAdmin
+from .models import RatingSummary, Review
+
+
+class RatingSummaryDeltaTests(TestCase):
+    """The Review signals and admin actions keep RatingSummary equal to a full rebuild."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="reviewer", email="reviewer@example.com")
+        cls.content_type = ContentType.objects.get_for_model(Hotel)
+
+    def review(self, rating, object_id=1, approved=True):
+        return Review.objects.create(
+            user=self.user, content_type=self.content_type, object_id=object_id, rating=rating, is_approved=approved
+        )
+
+    def summaries(self):
+        fields = ["content_type_id", "object_id", "count", "total", "average"] + [f"star_{n}" for n in range(1, 6)]
+        # Deltas leave an emptied summary behind; a rebuild does not write one.
+        return {
+            (row[0], row[1]): row[2:]
+            for row in RatingSummary.objects.filter(count__gt=0).values_list(*fields)
+        }
+
+    def assertMatchesRebuild(self):
+        incremental = self.summaries()
+        RatingSummary.rebuild()
+        self.assertEqual(incremental, self.summaries())
+
+    def summary(self, object_id=1):
+        return RatingSummary.objects.get(content_type=self.content_type, object_id=object_id)
+
+    def test_create(self):
+        self.review(5)
+        self.review(3)
+        self.review(1, approved=False)
+        self.review(4, object_id=2)
+
+        self.assertEqual((self.summary().count, self.summary().average), (2, 4.0))
+        self.assertMatchesRebuild()
+
+    def test_approve_and_unapprove(self):
+        review = self.review(4, approved=False)
+        self.review(2)
+
+        review.is_approved = True
+        review.save()
+        self.assertEqual(self.summary().count, 2)
+        self.assertMatchesRebuild()
+
+        review.is_approved = False
+        review.save()
+        self.assertEqual(self.summary().count, 1)
+        self.assertMatchesRebuild()
+
+    def test_rating_edit(self):
+        review = self.review(2)
+        self.review(5)
+
+        review.rating = 4
+        review.save()
+        self.assertEqual((self.summary().star_2, self.summary().star_4, self.summary().total), (0, 1, 9))
+        self.assertMatchesRebuild()
+
+    def test_moving_a_review_to_another_object(self):
+        review = self.review(3)
+
+        review.object_id = 2
+        review.save()
+        self.assertEqual((self.summary(1).count, self.summary(2).count), (0, 1))
+        self.assertMatchesRebuild()
+
+    def test_delete(self):
+        approved = self.review(5)
+        pending = self.review(1, approved=False)
+        self.review(3)
+
+        approved.delete()
+        pending.delete()
+        self.assertEqual((self.summary().count, self.summary().average), (1, 3.0))
+        self.assertMatchesRebuild()
+
+    def test_deferred_fields_recount(self):
+        self.review(5)
+        review = self.review(2)
+
+        deferred = Review.objects.only("id", "content_type_id", "object_id").get(pk=review.pk)
+        deferred.rating = 4
+        deferred.save()
+        self.assertEqual(self.summary().total, 9)
+        self.assertMatchesRebuild()
+
+        Review.objects.only("id", "content_type_id", "object_id").get(pk=review.pk).delete()
+        self.assertEqual(self.summary().total, 5)
+        self.assertMatchesRebuild()
+
+    def test_admin_bulk_actions(self):
+        model_admin = ReviewAdmin(Review, admin.site)
+        pending = [self.review(rating, approved=False) for rating in (1, 4, 5)]
+        self.review(3, object_id=2, approved=False)
+        self.review(2)
+
+        with mock.patch.object(model_admin, "message_user"):
+            model_admin.approve_reviews(None, Review.objects.all())
+            self.assertEqual((self.summary(1).count, self.summary(2).count), (4, 1))
+            self.assertMatchesRebuild()
+
+            # Already-approved rows in the selection are not counted twice.
+            model_admin.approve_reviews(None, Review.objects.all())
+            self.assertMatchesRebuild()
+
+            model_admin.disapprove_reviews(None, Review.objects.filter(pk__in=[r.pk for r in pending]))
+            self.assertEqual((self.summary(1).count, self.summary(1).average), (1, 2.0))
+            self.assertMatchesRebuild()
@@ -1,6 +1,6 @@
 from rest_framework import viewsets, filters
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.contrib.contenttypes.models import ContentType
+import item_types
 from .models import Review
 from .serializers import ReviewSerializer
 from permissions import IsOwnerOrReadOnly
@@ -12,6 +12,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter, filters.OrderingFilter)
     search_fields = ("title", "body", "user__username")
     ordering_fields = ("rating", "created_at")
+    ordering = ("-created_at",)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -33,11 +34,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
         if content_type_str and object_id:
             try:
-                if "." in content_type_str:
-                    app_label, model = content_type_str.lower().split(".")
-                    ct = ContentType.objects.get(app_label=app_label, model=model)
-                else:
-                    ct = ContentType.objects.get(model=content_type_str.lower())
+                ct = item_types.content_type_for(content_type_str)
                 print(">>> Filtering reviews with:", ct.app_label, ct.model, object_id)
                 queryset = queryset.filter(content_type=ct, object_id=int(object_id))
             except Exception as e:
@@ -35,6 +35,7 @@ class UserListView(generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserLiteSerializer
     permission_classes = [permissions.IsAdminUser]
+    ordering = ("-date_joined",)
 class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 